@@ -0,0 +1,48 @@
+"""Cost of repeated Gregorian-backed operations on one instance.
+
+Comparisons, hashing, timestamp() and friends all go through
+togregorian(); this measures the first call against the memoized ones.
+
+    PYTHONPATH=. python benchmarks/bench_gregorian.py
+"""
+import datetime
+import timeit
+
+import jdatetime
+
+NUMBER = 100000
+
+OPERATIONS = {
+    'togregorian()': 'dt.togregorian()',
+    'toordinal()': 'dt.toordinal()',
+    'weekday()': 'dt.weekday()',
+    'timestamp()': 'dt.timestamp()',
+    'utcoffset()': 'dt.utcoffset()',
+    'hash()': 'hash(dt)',
+    '==': 'dt == other',
+    '<': 'dt < other',
+}
+
+SETUP = '''
+dt = jdatetime.datetime(1402, 8, 15, 12, 30, tzinfo=datetime.timezone.utc)
+other = jdatetime.datetime(1402, 8, 16, tzinfo=datetime.timezone.utc)
+'''
+
+
+def main():
+    namespace = {'jdatetime': jdatetime, 'datetime': datetime}
+    # A new instance per call, so every call is a first one
+    fresh = timeit.timeit(
+        'for d in values: d.togregorian()',
+        setup='values = [jdatetime.datetime(1402, 8, 15, 12, 30) for _ in range(%d)]' % NUMBER,
+        globals=namespace,
+        number=1,
+    )
+    print(f"{'first togregorian()':<24}{fresh / NUMBER * 1e6:8.3f} us")
+    for name, statement in OPERATIONS.items():
+        seconds = timeit.timeit(statement, setup=SETUP, globals=namespace, number=NUMBER)
+        print(f"{'repeated ' + name:<24}{seconds / NUMBER * 1e6:8.3f} us")
+
+
+if __name__ == '__main__':
+    main()
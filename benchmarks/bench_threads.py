@@ -0,0 +1,76 @@
+"""Throughput of conversions, strftime() and strptime() as threads are added.
+
+Every thread runs the same workload on its own values; the speedup column
+is the throughput relative to one thread. With the GIL it stays near 1,
+on a free-threaded build (python3.13t and later) it should follow the
+number of cores.
+
+    PYTHONPATH=. python benchmarks/bench_threads.py [max threads]
+"""
+import datetime
+import os
+import sys
+import threading
+import time
+
+import jdatetime
+
+CALLS = 20000
+
+GREGORIAN = [datetime.datetime(2024, 1, 1, 12, 30) + datetime.timedelta(hours=7 * i) for i in range(CALLS)]
+JALALI = [jdatetime.datetime.fromgregorian(datetime=value) for value in GREGORIAN]
+STRINGS = [value.strftime('%Y-%m-%d %H:%M:%S%z') for value in JALALI]
+
+
+def convert():
+    for value in GREGORIAN:
+        jdatetime.datetime.fromgregorian(datetime=value).togregorian()
+
+
+def strftime():
+    for value in JALALI:
+        value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def strptime():
+    for value in STRINGS:
+        jdatetime.datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+
+WORKLOADS = {'conversion': convert, 'strftime()': strftime, 'strptime()': strptime}
+
+
+def throughput(workload, n_threads):
+    """Calls per second of ``n_threads`` threads running ``workload`` together."""
+    barrier = threading.Barrier(n_threads + 1)
+
+    def run():
+        barrier.wait()
+        workload()
+
+    threads = [threading.Thread(target=run) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return n_threads * CALLS / (time.perf_counter() - start)
+
+
+def main():
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    counts = sorted({1 << i for i in range(max_threads.bit_length())} | {max_threads})
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    for name, workload in WORKLOADS.items():
+        workload()  # warm up the caches
+        base = None
+        for n_threads in counts:
+            rate = max(throughput(workload, n_threads) for _ in range(3))
+            base = base or rate
+            print(f"{name:<12}{n_threads:>4} threads{rate:>12.0f} calls/s{rate / base:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,18 +3,20 @@
 # was licensed under the Python license. Same license applies to all files in
 # the jdatetime package project.
 
+import contextlib as _contextlib
+import contextvars as _contextvars
 import datetime as py_datetime
 import locale as _locale
 import platform
 import re
-from functools import partial as _partial
+import time as _time
+from functools import partial as _partial, wraps as _wraps
 
-try:
-    from greenlet import getcurrent as get_ident
-except ImportError:
-    from _thread import get_ident
+from jalali_core import (  # noqa: F401
+    GregorianToJalali, JalaliToGregorian, j_days_in_month,
+)
 
-from jalali_core import GregorianToJalali, JalaliToGregorian, j_days_in_month
+from . import _ordinal
 
 __VERSION__ = "5.1.0"
 MINYEAR = 1
@@ -91,35 +93,121 @@ class time(py_datetime.time):
         return f"jdatetime.time({self.hour}, {self.minute}, {self.second})"
 
 
-_thread_local_locales = dict()
+# Each thread, greenlet (greenlet >= 0.4.17) and asyncio task runs in its own
+# context, so the default locale is isolated between them and is released
+# together with the context.
+_locale_var = _contextvars.ContextVar('jdatetime_locale', default=None)
 
 
 def set_locale(locale):
-    """Set the thread local module locale. This will be the default locale
-    for new date/datetime instances in current thread.
-    Returns the previous value of locale set on current thread.
+    """Set the module locale of the current context. This will be the
+    default locale for new date/datetime instances in current thread,
+    greenlet or asyncio task.
+    Returns the previous value of locale set on current context.
 
-    Note: since Python thread identities maybe recycled and reused,
-    always ensure the desied locale is set for current thread,
-    or the locale maybe affected by previous threads with the same
-    identity.
+    New threads and greenlets start without a locale, while asyncio tasks
+    start with the locale of the code that created them.
 
     :param str|None: locale
     :return: str|None
     """
-    thread_identity = get_ident()
-    prev_locale = _thread_local_locales.get(thread_identity)
-    _thread_local_locales[thread_identity] = locale
+    prev_locale = _locale_var.get()
+    _locale_var.set(locale)
     return prev_locale
 
 
 def get_locale():
-    """Get the thread local module locale. This will be the default locale
-    for newly date/datetime instances in current thread.
+    """Get the module locale of the current context. This will be the
+    default locale for newly date/datetime instances in current thread,
+    greenlet or asyncio task.
 
     :return: str|None
     """
-    return _thread_local_locales.get(get_ident())
+    return _locale_var.get()
+
+
+@_contextlib.contextmanager
+def locale_context(locale):
+    """Context manager setting the default locale of the current context
+    for the duration of the ``with`` block, restoring the previous one on
+    exit.
+
+    >>> with locale_context('fa_IR'):
+    ...     get_locale()
+    'fa_IR'
+    >>> get_locale() is None
+    True
+
+    :param str|None: locale
+    """
+    token = _locale_var.set(locale)
+    try:
+        yield locale
+    finally:
+        _locale_var.reset(token)
+
+
+_coarse_clock = False
+
+try:
+    _CLOCK_REALTIME_COARSE = _time.CLOCK_REALTIME_COARSE
+except AttributeError:  # not Linux
+    _CLOCK_REALTIME_COARSE = None
+
+# (Gregorian ordinal, Jalali (year, month, day)) of the last day seen by
+# now(), utcnow() and today(); the date only changes once a day.
+_current_day = (None, None)
+
+
+def set_coarse_clock(enabled):
+    """Make now(), utcnow() and today() read the coarse system clock
+    (CLOCK_REALTIME_COARSE on Linux, a few milliseconds resolution) which
+    is cheaper to read, for example to stamp log records.
+    Returns the previous setting.
+
+    :param bool enabled:
+    :return: bool
+    """
+    global _coarse_clock
+    prev, _coarse_clock = _coarse_clock, bool(enabled)
+    return prev
+
+
+def _now(tz=None):
+    """Current time as a datetime.datetime in ``tz``, read from the clock
+    selected by set_coarse_clock()."""
+    if not _coarse_clock:
+        return py_datetime.datetime.now(tz)
+    if _CLOCK_REALTIME_COARSE is None:
+        timestamp = _time.time()
+    else:
+        timestamp = _time.clock_gettime(_CLOCK_REALTIME_COARSE)
+    return py_datetime.datetime.fromtimestamp(timestamp, tz)
+
+
+def _current_jalali_fields(gregorian_date):
+    """Jalali (year, month, day) of ``gregorian_date``, converted once per
+    day for now(), utcnow() and today()."""
+    global _current_day
+    ordinal = gregorian_date.toordinal()
+    cached_ordinal, fields = _current_day
+    if ordinal != cached_ordinal:
+        fields = _ordinal.from_ordinal(ordinal - _ordinal.GREGORIAN_OFFSET)
+        # A single tuple is swapped so threads never see a torn pair
+        _current_day = (ordinal, fields)
+    return fields
+
+
+def _gregorian_dates(a, b):
+    """Gregorian dates of two jdatetime.date when either has a memoized
+    one, else (None, None). Comparing them keeps lazy instances lazy."""
+    ga = a._gregorian
+    gb = b._gregorian
+    if ga.__class__ is gb.__class__ is py_datetime.date:
+        return ga, gb
+    if ga is None and gb is None:
+        return None, None
+    return date.togregorian(a), date.togregorian(b)
 
 
 class date:
@@ -220,10 +308,11 @@ class date:
     def locale(self):
         return self.__locale
 
-    __year = 0
-    __month = 0
-    __day = 0
     __locale = None
+    # Gregorian counterpart, memoized by togregorian() since instances are
+    # immutable. When given to _from_gregorian() the Jalali fields are
+    # computed on first access instead, see __getattr__()
+    _gregorian = None
 
     def _check_arg(self, value):
         if isinstance(value, int):
@@ -253,7 +342,39 @@ class date:
             raise ValueError("day is out of range for month")
         self.__day = day
         self.__locale = kwargs['locale'] if ('locale' in kwargs and kwargs['locale']) else get_locale()
+        self._set_locale_names()
 
+    def _init_from_gregorian(self, gregorian, locale):
+        """Initialize the instance from the Gregorian date (or datetime)
+        ``gregorian`` without converting it to Jalali."""
+        n = gregorian.toordinal() - _ordinal.GREGORIAN_OFFSET
+        if not _ordinal.MIN_ORDINAL <= n <= _ordinal.MAX_ORDINAL:
+            raise ValueError("year is out of range")
+        self._gregorian = gregorian
+        self.__locale = locale if locale else get_locale()
+        self._set_locale_names()
+
+    def __getattr__(self, name):
+        if name in ('_date__year', '_date__month', '_date__day'):
+            gregorian = self.__dict__.get('_gregorian')
+            if gregorian is not None:
+                # Threads racing here store the same values, and a field not
+                # yet stored comes back through __getattr__, so no lock
+                self.__year, self.__month, self.__day = _ordinal.from_ordinal(
+                    gregorian.toordinal() - _ordinal.GREGORIAN_OFFSET
+                )
+                return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @staticmethod
+    def _from_gregorian(gregorian, locale=None):
+        """Return the jdatetime.date of a ``datetime.date``; its Jalali
+        fields are only computed when first needed."""
+        result = date.__new__(date)
+        result._init_from_gregorian(gregorian, locale)
+        return result
+
+    def _set_locale_names(self):
         if self._is_fa_locale():
             self.j_months = self.j_months_fa
             self.j_months_short = self.j_months_fa
@@ -289,8 +410,12 @@ class date:
 
     def togregorian(self):
         """Convert current jalali date to gregorian and return datetime.date"""
-        (y, m, d) = JalaliToGregorian(self.year, self.month, self.day).getGregorianList()
-        return py_datetime.date(y, m, d)
+        if isinstance(self, datetime):
+            # Called as date.togregorian(dt): _gregorian holds a datetime
+            return datetime.togregorian(self).date()
+        if self._gregorian is None:
+            self._gregorian = py_datetime.date.fromordinal(date.sort_key(self) + _ordinal.GREGORIAN_OFFSET)
+        return self._gregorian
 
     @staticmethod
     def fromgregorian(**kw):
@@ -304,8 +429,7 @@ class date:
         if 'date' in kw:
             d = kw['date']
             try:
-                (y, m, d) = GregorianToJalali(d.year, d.month, d.day).getJalaliList()
-                return date(y, m, d, locale=locale)
+                return date._from_gregorian(py_datetime.date(d.year, d.month, d.day), locale)
             except AttributeError:
                 raise ValueError(
                     'When calling fromgregorian(date=) the parameter should be a date like object.'
@@ -324,15 +448,11 @@ class date:
     @staticmethod
     def today():
         """Current date or datetime:  same as self.__class__.fromtimestamp(time.time())."""
-        to = py_datetime.date.today()
-        (y, m, d) = GregorianToJalali(to.year, to.month, to.day).getJalaliList()
-        return date(y, m, d)
+        return date(*_current_jalali_fields(_now()))
 
     @staticmethod
     def fromtimestamp(timestamp):
-        d = py_datetime.date.fromtimestamp(timestamp)
-        (y, m, d) = GregorianToJalali(d.year, d.month, d.day).getJalaliList()
-        return date(y, m, d)
+        return date._from_gregorian(py_datetime.date.fromtimestamp(timestamp))
 
     @staticmethod
     def fromisoformat(date_string: str):
@@ -354,6 +474,26 @@ class date:
         d = self.togregorian()
         return d.toordinal() - 226894
 
+    def sort_key(self):
+        """Return an int which orders like the date: its Jalali ordinal,
+        computed without converting to Gregorian."""
+        return _ordinal.to_ordinal(self.year, self.month, self.day)
+
+    def to_bytes(self):
+        """Return the day number as 4 big-endian bytes. Encoded dates sort
+        bytewise in chronological order, see also JDateArray.to_bytes()."""
+        return date.sort_key(self).to_bytes(4, 'big')
+
+    @staticmethod
+    def from_bytes(data):
+        """bytes -> date encoded by date.to_bytes()"""
+        if len(data) != 4:
+            raise ValueError("date.from_bytes() requires 4 bytes")
+        n = int.from_bytes(data, 'big')
+        if not _ordinal.MIN_ORDINAL <= n <= _ordinal.MAX_ORDINAL:
+            raise ValueError("year is out of range")
+        return date(*_ordinal.from_ordinal(n))
+
     @staticmethod
     def fromordinal(ordinal):
         """int -> date corresponding to a proleptic Jalali ordinal.
@@ -422,6 +562,9 @@ class date:
             return self.__eq__(date.fromgregorian(date=other_date))
         if not isinstance(other_date, date):
             return NotImplemented
+        ga, gb = _gregorian_dates(self, other_date)
+        if ga is not None:
+            return ga == gb and self.locale == other_date.locale
         if (
             self.year == other_date.year and
             self.month == other_date.month and
@@ -437,6 +580,9 @@ class date:
             return self.__ge__(date.fromgregorian(date=other_date))
         if not isinstance(other_date, date):
             return NotImplemented
+        ga, gb = _gregorian_dates(self, other_date)
+        if ga is not None:
+            return ga >= gb
 
         if self.year > other_date.year:
             return True
@@ -453,6 +599,9 @@ class date:
             return self.__gt__(date.fromgregorian(date=other_date))
         if not isinstance(other_date, date):
             return NotImplemented
+        ga, gb = _gregorian_dates(self, other_date)
+        if ga is not None:
+            return ga > gb
 
         if self.year > other_date.year:
             return True
@@ -614,6 +763,27 @@ class date:
     def aslocale(self, locale):
         return date(self.year, self.month, self.day, locale=locale)
 
+    def __reduce__(self):
+        # Only the day number and locale are pickled; the locale names are
+        # derived from them again. Pickles of the whole __dict__ written by
+        # older versions still load, as there is no __setstate__.
+        args = (type(self), date.sort_key(self))
+        if self.__locale is not None:
+            args += (self.__locale,)
+        return _unpickle_date, args
+
+    def _set_state(self, n, locale):
+        self.__year, self.__month, self.__day = _ordinal.from_ordinal(n)
+        self.__locale = locale
+        self._set_locale_names()
+
+
+def _unpickle_date(cls, n, locale=None):
+    """Rebuild a date pickled by date.__reduce__()."""
+    result = cls.__new__(cls)
+    result._set_state(n, locale)
+    return result
+
 
 """The earliest representable date, date(MINYEAR, 1, 1)"""
 date.min = date(MINYEAR, 1, 1)
@@ -635,6 +805,59 @@ _DIRECTIVE_PATTERNS = {
     '%z': r'(?P<z>[+-]\d\d:?[0-5\u06F0-\u06F5]\d(:?[0-5\u06F0-\u06F5]\d(\.\d{1,6})?)?)',
 }
 
+
+def _memoize(maxsize):
+    """Decorator caching the results of a function of one hashable argument
+    in a dict of at most ``maxsize`` entries, emptied when full.
+
+    Unlike functools.lru_cache, hits are a plain dict lookup, which does
+    not take a lock on free-threaded builds. Threads missing the same key
+    at once may both call the function, but setdefault() makes them all
+    return the first stored result.
+    """
+    def decorator(function):
+        cache = {}
+
+        @_wraps(function)
+        def wrapper(key):
+            try:
+                return cache[key]
+            except KeyError:
+                pass
+            result = function(key)
+            if len(cache) >= maxsize:
+                cache.clear()
+            return cache.setdefault(key, result)
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+@_memoize(256)
+def _fixed_offset_timezone(offset):
+    """Shared datetime.timezone instance for a UTC offset timedelta."""
+    return py_datetime.timezone(offset)
+
+
+@_memoize(256)
+def _format_utcoffset(diff):
+    """UTC offset timedelta -> '+HHMM' string of %z."""
+    sign = '+'
+    diff_sec = diff.seconds
+    if diff.days > 0 or diff.days < -1:
+        raise ValueError(
+            'tzinfo.utcoffset() returned big time delta! ; must be in -1439 .. 1439'
+        )
+    if diff.days != 0:
+        sign = '-'
+        diff_sec = (1 * 24 * 60 * 60) - diff_sec
+    tmp_min = diff_sec / 60
+    diff_hour = tmp_min / 60
+    diff_min = tmp_min % 60
+    return '%s%02.d%02.d' % (sign, diff_hour, diff_min)
+
+
 # Replace directives with patterns according to _DIRECTIVE_PATTERNS
 _directives_to_pattern = _partial(
     re.compile('|'.join(_DIRECTIVE_PATTERNS)).sub,
@@ -642,6 +865,12 @@ _directives_to_pattern = _partial(
 )
 
 
+@_memoize(256)
+def _strptime_regex(format):
+    """Compiled strptime() pattern of a format string."""
+    return re.compile(_directives_to_pattern(re.escape(format)))
+
+
 class datetime(date):
     """datetime(
         year, month, day, [hour, [minute, [seconds, [microsecond, [tzinfo]]]]]
@@ -698,6 +927,25 @@ class datetime(date):
 
         self.__time = time(tmp_hour, tmp_min, tmp_sec, tmp_micr, tzinfo, fold=fold)
 
+    @staticmethod
+    def _from_gregorian(gregorian, locale=None):
+        """Return the jdatetime.datetime of a ``datetime.datetime``; its
+        Jalali fields are only computed when first needed. The fold is
+        kept, such as the one set by ``tzinfo.fromutc()`` in a repeated
+        hour."""
+        result = datetime.__new__(datetime)
+        result._init_from_gregorian(gregorian, locale)
+        result._fold = gregorian.fold
+        result.__time = time(
+            gregorian.hour,
+            gregorian.minute,
+            gregorian.second,
+            gregorian.microsecond,
+            gregorian.tzinfo,
+            fold=gregorian.fold,
+        )
+        return result
+
     def __repr__(self):
         if self.__time.tzinfo is not None:
             return "jdatetime.datetime({}, {}, {}, {}, {}, {}, {}, tzinfo={})".format(
@@ -743,12 +991,9 @@ class datetime(date):
     @staticmethod
     def now(tz=None):
         """[tz] -> new datetime with tz's local day and time."""
-        now_datetime = py_datetime.datetime.now(tz)
-        now = date.fromgregorian(date=now_datetime.date())
+        now_datetime = _now(tz)
         return datetime(
-            now.year,
-            now.month,
-            now.day,
+            *_current_jalali_fields(now_datetime),
             now_datetime.hour,
             now_datetime.minute,
             now_datetime.second,
@@ -759,12 +1004,12 @@ class datetime(date):
     @staticmethod
     def utcnow():
         """Return a new datetime representing UTC day and time."""
-        now_datetime = py_datetime.datetime.utcnow()
-        now = date.fromgregorian(date=now_datetime.date())
+        if _coarse_clock:
+            now_datetime = _now(py_datetime.timezone.utc).replace(tzinfo=None)
+        else:
+            now_datetime = py_datetime.datetime.utcnow()
         return datetime(
-            now.year,
-            now.month,
-            now.day,
+            *_current_jalali_fields(now_datetime),
             now_datetime.hour,
             now_datetime.minute,
             now_datetime.second,
@@ -789,33 +1034,13 @@ class datetime(date):
     @staticmethod
     def fromtimestamp(timestamp, tz=None):
         """timestamp[, tz] -> tz's local time from POSIX timestamp."""
-        now_datetime = py_datetime.datetime.fromtimestamp(timestamp, tz)
-        now = date.fromgregorian(date=now_datetime.date())
-        return datetime(
-            now.year,
-            now.month,
-            now.day,
-            now_datetime.hour,
-            now_datetime.minute,
-            now_datetime.second,
-            now_datetime.microsecond,
-            tz,
-        )
+        return datetime._from_gregorian(py_datetime.datetime.fromtimestamp(timestamp, tz))
 
     @staticmethod
     def utcfromtimestamp(timestamp):
         """timestamp -> UTC datetime from a POSIX timestamp (like time.time())."""
-        now_datetime = py_datetime.datetime.fromtimestamp(timestamp)
-        now = date.fromgregorian(date=now_datetime.date())
-        return datetime(
-            now.year,
-            now.month,
-            now.day,
-            now_datetime.hour,
-            now_datetime.minute,
-            now_datetime.second,
-            now_datetime.microsecond,
-        )
+        gregorian = py_datetime.datetime.fromtimestamp(timestamp, py_datetime.timezone.utc)
+        return datetime._from_gregorian(gregorian.replace(tzinfo=None))
 
     @staticmethod
     def combine(d=None, t=None, **kw):
@@ -865,6 +1090,53 @@ class datetime(date):
     def timestamp(self):
         return self.togregorian().timestamp()
 
+    def sort_key(self):
+        """Return an int which orders like the datetime: the Jalali ordinal
+        * 86400 * 10**6 + microseconds since midnight, in UTC for aware
+        datetimes. Naive and aware keys are not comparable with each other."""
+        key = _ordinal.to_key(
+            date.sort_key(self), self.hour, self.minute, self.second, self.microsecond
+        )
+        tz = self.tzinfo
+        # Fixed offsets do not depend on the wall time, no need to convert
+        offset = tz.utcoffset(None) if isinstance(tz, py_datetime.timezone) else self.utcoffset()
+        if offset is not None:
+            key -= offset // _ordinal.ONE_US
+        return key
+
+    def to_bytes(self):
+        """Return 8 big-endian bytes of the microsecond key for naive
+        datetimes, and 10 for aware ones: the key in UTC, then the UTC
+        offset in minutes (biased by 2**15). Encoded datetimes sort bytewise
+        in chronological order, naive and aware ones separately.
+        fold is not kept, and aware datetimes decode with a fixed offset
+        timezone."""
+        offset = self.utcoffset()
+        if offset is None:
+            t = self.__time
+            key = _ordinal.to_key(date.sort_key(self), t.hour, t.minute, t.second, t.microsecond)
+            return key.to_bytes(8, 'big')
+        minutes, remainder = divmod(offset, timedelta(minutes=1))
+        if remainder:
+            raise ValueError("utcoffset() must be a whole number of minutes: %r" % offset)
+        return self.sort_key().to_bytes(8, 'big') + (minutes + 0x8000).to_bytes(2, 'big')
+
+    @staticmethod
+    def from_bytes(data):
+        """bytes -> datetime encoded by datetime.to_bytes()"""
+        if len(data) not in (8, 10):
+            raise ValueError("datetime.from_bytes() requires 8 or 10 bytes")
+        key = int.from_bytes(data[:8], 'big')
+        tz = None
+        if len(data) == 10:
+            offset = timedelta(minutes=int.from_bytes(data[8:], 'big') - 0x8000)
+            tz = _fixed_offset_timezone(offset)
+            key += offset // _ordinal.ONE_US
+        n, hour, minute, second, microsecond = _ordinal.from_key(key)
+        if not _ordinal.MIN_ORDINAL <= n <= _ordinal.MAX_ORDINAL:
+            raise ValueError("year is out of range")
+        return datetime(*_ordinal.from_ordinal(n), hour, minute, second, microsecond, tz)
+
     @staticmethod
     def fromordinal(ordinal):
         """int -> date corresponding to a proleptic Jalali ordinal.
@@ -903,9 +1175,7 @@ class datetime(date):
     @staticmethod
     def strptime(date_string, format):
         """string, format -> new datetime parsed from a string (like time.strptime())"""
-        regex = _directives_to_pattern(re.escape(format))
-
-        match = re.fullmatch(regex, date_string)
+        match = _strptime_regex(format).fullmatch(date_string)
         if match is None:
             raise ValueError(
                 "time data '%s' does not match format '%s'" %
@@ -1113,30 +1383,24 @@ class datetime(date):
         date_param = kw.get('date') or kw.get('datetime')
         if date_param:
             try:
-                (y, m, d) = GregorianToJalali(
-                    date_param.year,
-                    date_param.month,
-                    date_param.day
-                ).getJalaliList()
+                gregorian = py_datetime.datetime(date_param.year, date_param.month, date_param.day)
             except AttributeError:
                 raise ValueError(
                     'When calling fromgregorian(date=) or fromgregorian(datetime=) '
                     'the parameter should be date like.'
                 )
             try:
-                return datetime(
-                    y,
-                    m,
-                    d,
-                    date_param.hour,
-                    date_param.minute,
-                    date_param.second,
-                    date_param.microsecond,
-                    date_param.tzinfo,
-                    locale=locale,
+                gregorian = gregorian.replace(
+                    hour=date_param.hour,
+                    minute=date_param.minute,
+                    second=date_param.second,
+                    microsecond=date_param.microsecond,
+                    tzinfo=date_param.tzinfo,
+                    fold=getattr(date_param, 'fold', 0),
                 )
             except AttributeError:
-                return datetime(y, m, d, locale=locale)
+                pass
+            return datetime._from_gregorian(gregorian, locale)
 
         if 'day' in kw and 'month' in kw and 'year' in kw:
             (year, month, day) = (kw['year'], kw['month'], kw['day'])
@@ -1166,14 +1430,16 @@ class datetime(date):
 
     def togregorian(self):
         """Convert current jalali date to gregorian and return datetime.datetime"""
-        gdate = date.togregorian(self)
-        return py_datetime.datetime.combine(gdate, self.__time)
+        if self._gregorian is None:
+            gdate = py_datetime.date.fromordinal(date.sort_key(self) + _ordinal.GREGORIAN_OFFSET)
+            self._gregorian = py_datetime.datetime.combine(gdate, self.__time)
+        return self._gregorian
 
     def astimezone(self, tz):
         """tz -> convert to local time in new timezone tz"""
         gdt = self.togregorian()
         gdt = gdt.astimezone(tz)
-        return datetime.fromgregorian(datetime=gdt)
+        return datetime.fromgregorian(datetime=gdt, locale=self.locale)
 
     def ctime(self):
         """Return ctime() style string."""
@@ -1250,7 +1516,22 @@ class datetime(date):
             locale=locale,
         )
 
+    def __reduce__(self):
+        t = self.__time
+        key = _ordinal.to_key(date.sort_key(self), t.hour, t.minute, t.second, t.microsecond)
+        args = (type(self), key, t.tzinfo, self._fold)
+        if self.locale is not None:
+            args += (self.locale,)
+        return _unpickle_datetime, args
+
+    def _set_state(self, key, tzinfo, fold, locale):
+        n, hour, minute, second, microsecond = _ordinal.from_key(key)
+        date._set_state(self, n, locale)
+        self._fold = fold
+        self.__time = time(hour, minute, second, microsecond, tzinfo, fold=fold)
+
     @staticmethod
+    @_memoize(256)
     def _timezone_from_string(timezone_string):
         if timezone_string is None:
             return None
@@ -1273,8 +1554,7 @@ class datetime(date):
         if z.startswith("-"):
             gmtoff = -gmtoff
             gmtoff_fraction = -gmtoff_fraction
-        timezone = py_datetime.timezone(timedelta(seconds=gmtoff, microseconds=gmtoff_fraction))
-        return timezone
+        return _fixed_offset_timezone(timedelta(seconds=gmtoff, microseconds=gmtoff_fraction))
 
     def _strftime_p(self):
         if self.hour >= 12:
@@ -1285,19 +1565,14 @@ class datetime(date):
         diff = self.utcoffset()
         if diff is None:
             return ''
-        sign = '+'
-        diff_sec = diff.seconds
-        if diff.days > 0 or diff.days < -1:
-            raise ValueError(
-                'tzinfo.utcoffset() returned big time delta! ; must be in -1439 .. 1439'
-            )
-        if diff.days != 0:
-            sign = '-'
-            diff_sec = (1 * 24 * 60 * 60) - diff_sec
-        tmp_min = diff_sec / 60
-        diff_hour = tmp_min / 60
-        diff_min = tmp_min % 60
-        return '%s%02.d%02.d' % (sign, diff_hour, diff_min)
+        return _format_utcoffset(diff)
 
     def _strftime_cap_z(self):
         return self.tzname() or ''
+
+
+def _unpickle_datetime(cls, key, tzinfo=None, fold=0, locale=None):
+    """Rebuild a datetime pickled by datetime.__reduce__()."""
+    result = cls.__new__(cls)
+    result._set_state(key, tzinfo, fold, locale)
+    return result
@@ -0,0 +1,103 @@
+# Coercion of the date-like values accepted by the bulk helpers
+# (jdatetime.date/datetime, datetime.date/datetime, Jalali ISO strings) to
+# day numbers and microsecond keys, see jdatetime._ordinal.
+import datetime as py_datetime
+from array import array
+
+import jdatetime
+
+from . import _ordinal
+
+
+def day_number(value):
+    """Return the day number of a date-like value, ints are returned as is."""
+    if isinstance(value, jdatetime.date):
+        return jdatetime.date.sort_key(value)
+    if isinstance(value, py_datetime.date):
+        return value.toordinal() - _ordinal.GREGORIAN_OFFSET
+    if isinstance(value, str):
+        d = jdatetime.date.fromisoformat(value[:10])
+        return _ordinal.to_ordinal(d.year, d.month, d.day)
+    if isinstance(value, int):
+        return value
+    raise TypeError(f"can not use {type(value)!r} as a date")
+
+
+def microsecond_key(value):
+    """Return the microsecond key of a date-like value, ints are returned as is.
+
+    Dates map to their midnight. Aware datetimes are normalised to UTC, so
+    keys of aware values order like the values themselves.
+    """
+    if isinstance(value, str):
+        if len(value) > 10:
+            value = jdatetime.datetime.fromisoformat(value)
+        else:
+            value = jdatetime.date.fromisoformat(value)
+    if isinstance(value, jdatetime.datetime):
+        return value.sort_key()
+    if isinstance(value, py_datetime.datetime):
+        key = _ordinal.to_key(
+            day_number(value), value.hour, value.minute, value.second, value.microsecond
+        )
+        offset = value.utcoffset()
+        if offset is not None:
+            key -= offset // _ordinal.ONE_US
+        return key
+    if isinstance(value, int):
+        return value
+    return day_number(value) * _ordinal.US_PER_DAY
+
+
+def awareness(value):
+    """Return True for aware datetimes and ISO strings with an offset,
+    False for naive ones and None for values without a time of day."""
+    if isinstance(value, str):
+        if len(value) <= 10:
+            return None
+        time = value[11:]
+        return '+' in time or '-' in time or time.endswith('Z')
+    if isinstance(value, (jdatetime.datetime, py_datetime.datetime)):
+        return value.tzinfo is not None and value.utcoffset() is not None
+    return None
+
+
+def check_awareness(aware, value):
+    """Return the awareness of values so far, ``aware``, updated with
+    ``value``. Mixing naive and aware datetimes raises TypeError as their
+    comparison does: their keys are wall times and UTC times."""
+    value_aware = awareness(value)
+    if value_aware is None:
+        return aware
+    if aware is not None and value_aware != aware:
+        raise TypeError("can't compare offset-naive and offset-aware datetimes")
+    return value_aware
+
+
+def microsecond_keys(values):
+    """Return an array('q') of the microsecond keys of ``values`` and
+    their awareness, see check_awareness()."""
+    keys = array('q')
+    append = keys.append
+    aware = None
+    for value in values:
+        aware = check_awareness(aware, value)
+        append(microsecond_key(value))
+    return keys, aware
+
+
+def wall_key(value):
+    """Like microsecond_key() but on the wall clock fields, ignoring tzinfo."""
+    if isinstance(value, str):
+        return microsecond_key(value[:19])
+    if isinstance(value, (jdatetime.datetime, py_datetime.datetime)):
+        return _ordinal.to_key(
+            day_number(value), value.hour, value.minute, value.second, value.microsecond
+        )
+    return microsecond_key(value)
+
+
+def is_datetime(value):
+    if isinstance(value, str):
+        return len(value) > 10
+    return isinstance(value, (jdatetime.datetime, py_datetime.datetime))
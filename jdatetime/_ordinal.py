@@ -0,0 +1,116 @@
+# Integer day-number arithmetic for the Jalali calendar.
+#
+# A day number is the proleptic Jalali ordinal returned by
+# ``jdatetime.date.toordinal()``: Farvardin 1 of year 1 is day 1. The
+# formulas below are the closed forms of the 33 year cycle used by
+# jalali_core, so they agree with ``GregorianToJalali`` and
+# ``JalaliToGregorian`` over the whole MINYEAR..MAXYEAR range without
+# building any intermediate objects.
+
+import datetime
+import math
+
+MINYEAR = 1
+MAXYEAR = 9377
+
+# Gregorian ordinal of the day before Farvardin 1 of year 1 (0622-03-20)
+GREGORIAN_OFFSET = 226894
+
+DAYS_BEFORE_MONTH = (0, 31, 62, 93, 124, 155, 186, 216, 246, 276, 306, 336)
+
+# Day number of Farvardin 1, 979 (1600-03-20), the anchor of jalali_core.
+_EPOCH = 357208
+
+# For timedelta <-> microseconds: delta // ONE_US, us * ONE_US
+ONE_US = datetime.timedelta(microseconds=1)
+
+MIN_ORDINAL = 1
+# Esfand 30, MAXYEAR
+MAX_ORDINAL = 3424879
+
+
+def isleap(year):
+    return year % 33 in (1, 5, 9, 13, 17, 22, 26, 30)
+
+
+def days_in_year(year):
+    return 366 if isleap(year) else 365
+
+
+def days_in_month(year, month):
+    if month <= 6:
+        return 31
+    if month <= 11:
+        return 30
+    return 30 if isleap(year) else 29
+
+
+def days_before_year(year):
+    """Number of days before Farvardin 1 of ``year``."""
+    jy = year - 979
+    return _EPOCH - 1 + 365 * jy + (jy // 33) * 8 + (jy % 33 + 3) // 4
+
+
+def to_ordinal(year, month, day):
+    """(year, month, day) -> day number"""
+    return days_before_year(year) + DAYS_BEFORE_MONTH[month - 1] + day
+
+
+def from_ordinal(n):
+    """day number -> (year, month, day)"""
+    n -= _EPOCH
+    cycles, n = divmod(n, 12053)
+    year = 979 + 33 * cycles + 4 * (n // 1461)
+    n %= 1461
+    if n >= 366:
+        n -= 1
+        year += n // 365
+        n %= 365
+    if n < 186:
+        return year, n // 31 + 1, n % 31 + 1
+    n -= 186
+    return year, n // 30 + 7, n % 30 + 1
+
+
+def weekday(n):
+    """day number -> weekday, Shanbeh == 0 ... Jomeh == 6"""
+    return (n + 4) % 7
+
+
+def from_gregorian_ordinal(n):
+    return n - GREGORIAN_OFFSET
+
+
+def to_gregorian_ordinal(n):
+    return n + GREGORIAN_OFFSET
+
+
+US_PER_SECOND = 1000000
+US_PER_DAY = 86400 * US_PER_SECOND
+
+# Day number of 1970-01-01 (Dey 11, 1348)
+UNIX_EPOCH = 719163 - GREGORIAN_OFFSET
+
+
+def to_key(n, hour=0, minute=0, second=0, microsecond=0):
+    """day number and time of day -> microsecond key"""
+    return n * US_PER_DAY + ((hour * 60 + minute) * 60 + second) * US_PER_SECOND + microsecond
+
+
+def from_key(key):
+    """microsecond key -> (day number, hour, minute, second, microsecond)"""
+    n, us = divmod(key, US_PER_DAY)
+    seconds, microsecond = divmod(us, US_PER_SECOND)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return n, hour, minute, second, microsecond
+
+
+def timestamp_to_us(timestamp, factor=US_PER_SECOND):
+    """POSIX timestamp -> int microseconds since the epoch, rounded the same
+    way datetime.fromtimestamp() rounds. ``factor`` is the number of
+    microseconds per unit of ``timestamp``, 1000 for milliseconds."""
+    if isinstance(timestamp, int):
+        return timestamp * factor
+    frac, t = math.modf(timestamp)
+    return int(t) * factor + round(frac * factor)
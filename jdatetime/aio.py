@@ -0,0 +1,121 @@
+"""Conversion of asynchronous streams of Gregorian values.
+
+:func:`fromgregorian_stream` reads an async iterator in micro-batches,
+converts each batch with a :class:`jdatetime.batch.StreamConverter` and
+yields the results one by one. The source is only read when the consumer
+asks for more, and batches can run in an executor so the event loop is
+never blocked by a large one.
+
+    >>> import asyncio, datetime
+    >>> from jdatetime.aio import fromgregorian_stream
+    >>> async def rows():
+    ...     for day in (19, 20):
+    ...         yield {'id': day, 'created': datetime.date(2024, 3, day)}
+    >>> async def main():
+    ...     return [row async for row in fromgregorian_stream(rows(), fields=['created'])]
+    >>> asyncio.run(main())
+    [{'id': 19, 'created': jdatetime.date(1402, 12, 29)}, {'id': 20, 'created': jdatetime.date(1403, 1, 1)}]
+"""
+import asyncio
+import datetime as py_datetime
+
+import jdatetime
+
+from .batch import StreamConverter
+
+
+def _convert_value(converter, value, tz, locale):
+    if value is None:
+        return None
+    if isinstance(value, py_datetime.date):
+        return converter.fromgregorian(value, locale)
+    return converter.fromtimestamp(value, tz, locale)
+
+
+def convert_batch(items, fields=None, tz=None, locale=None):
+    """Convert a list of Gregorian values or records at once.
+
+    Without ``fields`` every item is a ``datetime.date``/``datetime`` or a
+    POSIX timestamp (read in ``tz``, local time by default) and the list of
+    Jalali values is returned. With ``fields``, items are mappings and a
+    copy of each is returned with those keys converted. None is kept as is.
+    """
+    converter = StreamConverter()
+    if fields is None:
+        return [_convert_value(converter, item, tz, locale) for item in items]
+    result = []
+    for item in items:
+        record = dict(item)
+        for field in fields:
+            if field in record:
+                record[field] = _convert_value(converter, record[field], tz, locale)
+        result.append(record)
+    return result
+
+
+async def fromgregorian_stream(
+    source,
+    fields=None,
+    batch_size=1000,
+    max_delay=None,
+    executor=None,
+    tz=None,
+    locale=None,
+):
+    """Async generator of the items of the async iterable ``source``
+    converted by :func:`convert_batch`, in order.
+
+    batch_size: maximum number of items converted at once.
+    max_delay: if set, seconds to wait for a batch to fill before
+        converting the items already read, for slow sources.
+    executor: a ``concurrent.futures`` executor running the conversions;
+        with a process pool, items and ``tz`` must be picklable. The
+        default locale is the one of the consuming task. Without
+        one, batches are converted in the event loop thread, which yields
+        to other tasks between batches.
+    """
+    fields = None if fields is None else tuple(fields)
+    loop = asyncio.get_running_loop()
+    iterator = source.__aiter__()
+    pending = None
+    exhausted = False
+    try:
+        while not exhausted:
+            items = []
+            deadline = None if max_delay is None else loop.time() + max_delay
+            while len(items) < batch_size:
+                try:
+                    if deadline is None:
+                        items.append(await iterator.__anext__())
+                        continue
+                    # Reads run as a task so that one still waiting at the
+                    # deadline is not cancelled, it is awaited again for the
+                    # next batch
+                    if pending is None:
+                        pending = asyncio.ensure_future(iterator.__anext__())
+                    done, _ = await asyncio.wait((pending,), timeout=max(deadline - loop.time(), 0))
+                    if not done:
+                        break
+                    read, pending = pending, None
+                    items.append(read.result())
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+            if not items:
+                continue
+            if executor is None:
+                converted = convert_batch(items, fields, tz, locale)
+            else:
+                # Executors don't run in the context of this task, so the
+                # locale set by set_locale()/locale_context() is passed on
+                batch_locale = jdatetime.get_locale() if locale is None else locale
+                converted = await loop.run_in_executor(
+                    executor, convert_batch, items, fields, tz, batch_locale,
+                )
+            for item in converted:
+                yield item
+            if executor is None:
+                await asyncio.sleep(0)
+    finally:
+        if pending is not None:
+            pending.cancel()
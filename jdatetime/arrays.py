@@ -0,0 +1,273 @@
+"""Compact arrays of Jalali dates and datetimes.
+
+:class:`JDateArray` stores day numbers (see ``jdatetime.date.toordinal()``)
+in an ``array('i')`` and :class:`JDatetimeArray` stores microsecond keys
+(day number * 86400 * 10**6 + microseconds since midnight) in an
+``array('q')``. Elements are materialized as ``jdatetime`` objects only
+when accessed, and field extraction, sorting, searching and timedelta
+arithmetic work on the integers directly.
+
+    >>> import datetime, jdatetime
+    >>> from jdatetime.arrays import JDateArray
+    >>> dates = JDateArray(['1402-12-29', '1403-01-01', '1402-12-29'])
+    >>> list(dates.unique())
+    [jdatetime.date(1402, 12, 29), jdatetime.date(1403, 1, 1)]
+    >>> list((dates + datetime.timedelta(days=1)).month)
+    [1, 1, 1]
+
+``to_bytes()`` and ``from_bytes()`` encode arrays as big-endian records
+that sort bytewise, for use as keys of key-value stores.
+
+Both types export their buffer (``ordinals``/``keys``, or the buffer
+protocol itself on Python 3.12+) so NumPy can wrap it without copying:
+``numpy.frombuffer(dates.ordinals, dtype=numpy.int32)``.
+"""
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+import jdatetime
+
+from . import _convert, _ordinal
+
+timedelta = jdatetime.timedelta
+
+
+class _IntegerBackedArray:
+    typecode = None
+    # Whether the datetimes stored are aware, None when unknown, see
+    # _convert.check_awareness()
+    _aware = None
+
+    def __init__(self, values=()):
+        self._data = array(self.typecode, map(self._to_int, values))
+
+    @classmethod
+    def _wrap(cls, data):
+        result = cls.__new__(cls)
+        result._data = data
+        return result
+
+    def _derive(self, data):
+        """_wrap() keeping the awareness of this array."""
+        result = self._wrap(data)
+        result._aware = self._aware
+        return result
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        from_int = self._from_int
+        for value in self._data:
+            yield from_int(value)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self._derive(self._data[item])
+        return self._from_int(self._data[item])
+
+    def __eq__(self, other):
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return self._data == other._data
+
+    def __repr__(self):
+        return f"jdatetime.arrays.{type(self).__name__}({[str(v) for v in self]!r})"
+
+    def to_bytes(self):
+        """Return the values as big-endian fixed-width records, 4 bytes per
+        date or 8 per datetime, like ``to_bytes()`` of the elements (of
+        naive datetimes). Records sort bytewise in chronological order."""
+        data = array(self.typecode, self._data)
+        if sys.byteorder == 'little':
+            data.byteswap()
+        return data.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Build an array from records encoded by ``to_bytes()``, from any
+        bytes-like object (bytes, memoryview, mmap...)."""
+        values = array(cls.typecode)
+        values.frombytes(data)
+        if sys.byteorder == 'little':
+            values.byteswap()
+        return cls._wrap(values)
+
+    def __buffer__(self, flags):
+        return memoryview(self._data)
+
+    def __release_buffer__(self, view):
+        view.release()
+
+    def _field_arrays(self):
+        years, months, days = array('i'), array('b'), array('b')
+        for n in self._day_numbers():
+            year, month, day = _ordinal.from_ordinal(n)
+            years.append(year)
+            months.append(month)
+            days.append(day)
+        return years, months, days
+
+    @property
+    def year(self):
+        """array('i') of the years"""
+        return self._field_arrays()[0]
+
+    @property
+    def month(self):
+        """array('b') of the months"""
+        return self._field_arrays()[1]
+
+    @property
+    def day(self):
+        """array('b') of the days of month"""
+        return self._field_arrays()[2]
+
+    @property
+    def weekday(self):
+        """array('b') of the weekdays, Shanbeh == 0 ... Jomeh == 6"""
+        return array('b', map(_ordinal.weekday, self._day_numbers()))
+
+    def sort(self):
+        """Sort the array in place."""
+        self._data[:] = array(self.typecode, sorted(self._data))
+
+    def argsort(self):
+        """Return an array('q') of the positions that would sort the array."""
+        data = self._data
+        return array('q', sorted(range(len(data)), key=data.__getitem__))
+
+    def unique(self):
+        """Return a new sorted array of the distinct values."""
+        return self._derive(array(self.typecode, sorted(set(self._data))))
+
+    def searchsorted(self, value, side='left'):
+        """Position where ``value`` would be inserted in this sorted array
+        to keep the order."""
+        if side not in ('left', 'right'):
+            raise ValueError("side must be 'left' or 'right'")
+        search = bisect_left if side == 'left' else bisect_right
+        _convert.check_awareness(self._aware, value)
+        return search(self._data, self._to_int(value))
+
+    def _shift(self, other, sign):
+        if not isinstance(other, timedelta):
+            return NotImplemented
+        delta = sign * self._timedelta_to_int(other)
+        return self._derive(array(self.typecode, (value + delta for value in self._data)))
+
+    def __add__(self, other):
+        return self._shift(other, 1)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, type(self)):
+            if len(other) != len(self):
+                raise ValueError("arrays must have the same length")
+            if None not in (self._aware, other._aware) and self._aware != other._aware:
+                raise TypeError("can't subtract offset-naive and offset-aware datetimes")
+            return array('q', (a - b for a, b in zip(self._data, other._data)))
+        return self._shift(other, -1)
+
+
+class JDateArray(_IntegerBackedArray):
+    """JDateArray(values=())
+
+    values: ``jdatetime.date``, ``datetime.date`` or Jalali ISO strings.
+    Subtracting two arrays gives an array('q') of day differences.
+    """
+    typecode = 'i'
+
+    _to_int = staticmethod(_convert.day_number)
+
+    @staticmethod
+    def _from_int(n):
+        return jdatetime.date(*_ordinal.from_ordinal(n))
+
+    @staticmethod
+    def _timedelta_to_int(delta):
+        return delta.days
+
+    @classmethod
+    def from_ordinals(cls, ordinals):
+        """Build an array from day numbers. An ``array('i')`` is used as is,
+        without copying."""
+        if not (isinstance(ordinals, array) and ordinals.typecode == 'i'):
+            ordinals = array('i', ordinals)
+        return cls._wrap(ordinals)
+
+    @property
+    def ordinals(self):
+        """Writable memoryview of the day numbers."""
+        return memoryview(self._data)
+
+    def _day_numbers(self):
+        return self._data
+
+
+class JDatetimeArray(_IntegerBackedArray):
+    """JDatetimeArray(values=())
+
+    values: ``jdatetime.datetime``/``date``, ``datetime.datetime``/``date``
+    or Jalali ISO strings. Aware datetimes are stored as UTC wall time and
+    elements are returned as naive ``jdatetime.datetime``; naive and aware
+    datetimes can't be mixed, like in comparisons (TypeError).
+    Subtracting two arrays gives an array('q') of microsecond differences.
+    """
+    typecode = 'q'
+
+    _to_int = staticmethod(_convert.microsecond_key)
+
+    def __init__(self, values=()):
+        self._data, self._aware = _convert.microsecond_keys(values)
+
+    @staticmethod
+    def _from_int(key):
+        n, hour, minute, second, microsecond = _ordinal.from_key(key)
+        return jdatetime.datetime(*_ordinal.from_ordinal(n), hour, minute, second, microsecond)
+
+    @staticmethod
+    def _timedelta_to_int(delta):
+        return delta // _ordinal.ONE_US
+
+    @classmethod
+    def from_keys(cls, keys):
+        """Build an array from microsecond keys. An ``array('q')`` is used
+        as is, without copying."""
+        if not (isinstance(keys, array) and keys.typecode == 'q'):
+            keys = array('q', keys)
+        return cls._wrap(keys)
+
+    @property
+    def keys(self):
+        """Writable memoryview of the microsecond keys."""
+        return memoryview(self._data)
+
+    def date(self):
+        """Return the JDateArray of the dates."""
+        return JDateArray._wrap(array('i', self._day_numbers()))
+
+    def _day_numbers(self):
+        us_per_day = _ordinal.US_PER_DAY
+        return (key // us_per_day for key in self._data)
+
+    def _time_field(self, divisor, modulo):
+        return array('i', (key // divisor % modulo for key in self._data))
+
+    @property
+    def hour(self):
+        return self._time_field(3600 * _ordinal.US_PER_SECOND, 24)
+
+    @property
+    def minute(self):
+        return self._time_field(60 * _ordinal.US_PER_SECOND, 60)
+
+    @property
+    def second(self):
+        return self._time_field(_ordinal.US_PER_SECOND, 60)
+
+    @property
+    def microsecond(self):
+        return self._time_field(1, _ordinal.US_PER_SECOND)
@@ -0,0 +1,218 @@
+"""Conversion of Apache Arrow date and timestamp arrays to Jalali fields.
+
+Requires pyarrow. :func:`to_jalali` turns a ``date32``, ``date64`` or
+``timestamp`` array (or chunked array, such as a Parquet column) into a
+struct array of Jalali year, month and day, plus the time fields for
+timestamps, and :func:`from_jalali` converts back. The day number
+arithmetic of ``jdatetime._ordinal`` runs as Arrow compute kernels over
+the whole array, so no ``jdatetime`` object is created per row. Nulls are
+kept.
+
+    >>> import datetime
+    >>> import pyarrow as pa
+    >>> from jdatetime import arrow
+    >>> fields = arrow.to_jalali(pa.array([datetime.date(2024, 3, 20), None]))
+    >>> fields.to_pylist()
+    [{'year': 1403, 'month': 1, 'day': 1}, None]
+    >>> arrow.from_jalali(fields).to_pylist()
+    [datetime.date(2024, 3, 20), None]
+
+:func:`to_jdatearray`/:func:`to_jdatetimearray` and
+:func:`from_jdatearray`/:func:`from_jdatetimearray` copy between Arrow
+arrays and ``jdatetime.arrays`` with a single buffer copy.
+"""
+from array import array
+from functools import wraps
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from . import _ordinal
+from .arrays import JDateArray, JDatetimeArray
+
+_DATE_FIELDS = (('year', pa.int16()), ('month', pa.int8()), ('day', pa.int8()))
+_TIME_FIELDS = (
+    ('hour', pa.int8()), ('minute', pa.int8()), ('second', pa.int8()), ('microsecond', pa.int32()),
+)
+
+# Microseconds per unit of Arrow timestamps; 'ns' is divided instead
+_US_PER_UNIT = {'s': _ordinal.US_PER_SECOND, 'ms': 1000, 'us': 1}
+
+
+def _chunked(function):
+    """Apply ``function`` to every chunk of a ChunkedArray."""
+    @wraps(function)
+    def wrapper(values, *args, **kwargs):
+        if isinstance(values, pa.ChunkedArray):
+            return pa.chunked_array([function(chunk, *args, **kwargs) for chunk in values.chunks])
+        return function(values, *args, **kwargs)
+    return wrapper
+
+
+def _divmod(a, b):
+    """Floor division and modulo of an int64 array by a positive int, like
+    divmod(); Arrow's integer division truncates towards zero."""
+    quotient = pc.divide(a, b)
+    remainder = pc.subtract(a, pc.multiply(quotient, b))
+    negative = pc.less(remainder, 0)
+    return (
+        pc.if_else(negative, pc.subtract(quotient, 1), quotient),
+        pc.if_else(negative, pc.add(remainder, b), remainder),
+    )
+
+
+def _from_day_numbers(n):
+    """Vectorized _ordinal.from_ordinal(): int64 day numbers -> year,
+    month and day arrays."""
+    cycles, n = _divmod(pc.subtract(n, _ordinal._EPOCH), 12053)
+    quadrennia, n = _divmod(n, 1461)
+    year = pc.add(pc.add(pc.multiply(cycles, 33), pc.multiply(quadrennia, 4)), 979)
+    # After the leap day of a 4 year period
+    later = pc.greater_equal(n, 366)
+    years, day_of_year = _divmod(pc.subtract(n, 1), 365)
+    year = pc.if_else(later, pc.add(year, years), year)
+    n = pc.if_else(later, day_of_year, n)
+
+    first_half = pc.less(n, 186)
+    month31, day31 = _divmod(n, 31)
+    month30, day30 = _divmod(pc.subtract(n, 186), 30)
+    month = pc.if_else(first_half, pc.add(month31, 1), pc.add(month30, 7))
+    day = pc.add(pc.if_else(first_half, day31, day30), 1)
+    return year, month, day
+
+
+def _to_day_numbers(year, month, day):
+    """Vectorized _ordinal.to_ordinal()"""
+    jy = pc.subtract(pc.cast(year, pa.int64()), 979)
+    cycles, jy_in_cycle = _divmod(jy, 33)
+    days = pc.add(
+        pc.add(pc.multiply(jy, 365), pc.multiply(cycles, 8)),
+        _divmod(pc.add(jy_in_cycle, 3), 4)[0],
+    )
+    month = pc.cast(month, pa.int64())
+    before_month = pc.if_else(
+        pc.less_equal(month, 7),
+        pc.multiply(pc.subtract(month, 1), 31),
+        pc.add(pc.multiply(pc.subtract(month, 7), 30), 186),
+    )
+    return pc.add(pc.add(pc.add(days, _ordinal._EPOCH - 1), before_month), pc.cast(day, pa.int64()))
+
+
+def _microseconds(values):
+    """Microseconds since 1970-01-01 of the wall times of a timestamp
+    array, as int64."""
+    if values.type.tz is not None:
+        values = pc.local_timestamp(values)
+    raw = pc.cast(values, pa.int64())
+    if values.type.unit == 'ns':
+        return _divmod(raw, 1000)[0]
+    return pc.multiply(raw, _US_PER_UNIT[values.type.unit])
+
+
+def _struct(arrays, fields, mask):
+    return pa.StructArray.from_arrays(
+        [pc.cast(values, field_type) for values, (_, field_type) in zip(arrays, fields)],
+        fields=[pa.field(name, field_type) for name, field_type in fields],
+        mask=mask,
+    )
+
+
+def _day_numbers(values):
+    """int64 day numbers of a date32 or date64 array."""
+    if pa.types.is_date32(values.type):
+        days = pc.cast(pc.cast(values, pa.int32()), pa.int64())
+    elif pa.types.is_date64(values.type):
+        days = _divmod(pc.cast(values, pa.int64()), 86400000)[0]
+    else:
+        raise TypeError(f"date32 or date64 array required, not {values.type}")
+    return pc.add(days, _ordinal.UNIX_EPOCH)
+
+
+@_chunked
+def to_jalali(values):
+    """Return a struct array of the Jalali fields of a ``date32``,
+    ``date64`` or ``timestamp`` array: year, month and day, plus hour,
+    minute, second and microsecond for timestamps. Aware timestamps give
+    their local wall time."""
+    mask = values.is_null() if values.null_count else None
+    if pa.types.is_timestamp(values.type):
+        days, us = _divmod(_microseconds(values), _ordinal.US_PER_DAY)
+        seconds, microsecond = _divmod(us, _ordinal.US_PER_SECOND)
+        minutes, second = _divmod(seconds, 60)
+        hour, minute = _divmod(minutes, 60)
+        arrays = _from_day_numbers(pc.add(days, _ordinal.UNIX_EPOCH)) + (hour, minute, second, microsecond)
+        return _struct(arrays, _DATE_FIELDS + _TIME_FIELDS, mask)
+    return _struct(_from_day_numbers(_day_numbers(values)), _DATE_FIELDS, mask)
+
+
+@_chunked
+def from_jalali(fields):
+    """Convert a struct array of Jalali fields, as returned by
+    :func:`to_jalali`, to a ``date32`` array, or to a naive
+    ``timestamp('us')`` array when it has an hour field. Missing time
+    fields are 0. The fields are not validated."""
+    days = pc.subtract(
+        _to_day_numbers(fields.field('year'), fields.field('month'), fields.field('day')),
+        _ordinal.UNIX_EPOCH,
+    )
+    mask = fields.is_null() if fields.null_count else None
+    if fields.type.get_field_index('hour') < 0:
+        result = pc.cast(pc.cast(days, pa.int32()), pa.date32())
+    else:
+        us = pc.multiply(days, _ordinal.US_PER_DAY)
+        for name, factor in (('hour', 3600), ('minute', 60), ('second', 1)):
+            if fields.type.get_field_index(name) >= 0:
+                seconds = pc.cast(pc.fill_null(fields.field(name), 0), pa.int64())
+                us = pc.add(us, pc.multiply(seconds, factor * _ordinal.US_PER_SECOND))
+        if fields.type.get_field_index('microsecond') >= 0:
+            us = pc.add(us, pc.cast(pc.fill_null(fields.field('microsecond'), 0), pa.int64()))
+        result = pc.cast(us, pa.timestamp('us'))
+    if mask is not None:
+        result = pc.if_else(mask, pa.scalar(None, result.type), result)
+    return result
+
+
+def _copy_buffer(values, typecode):
+    """Copy the data buffer of a primitive Arrow array without nulls into an
+    array.array."""
+    if values.null_count:
+        raise ValueError("arrays with nulls can not be converted")
+    result = array(typecode)
+    itemsize = result.itemsize
+    with memoryview(values.buffers()[1]) as data:
+        result.frombytes(data[values.offset * itemsize:(values.offset + len(values)) * itemsize])
+    return result
+
+
+def _wrap_buffer(data, arrow_type):
+    """Arrow array viewing the buffer of an array.array, without copying."""
+    return pa.Array.from_buffers(arrow_type, len(data), [None, pa.py_buffer(data)])
+
+
+def to_jdatearray(values):
+    """Return the JDateArray of a ``date32``/``date64`` array (or chunked
+    array) without nulls."""
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    return JDateArray.from_ordinals(_copy_buffer(pc.cast(_day_numbers(values), pa.int32()), 'i'))
+
+
+def from_jdatearray(dates):
+    """Return the ``date32`` array of a JDateArray."""
+    days = pc.subtract(_wrap_buffer(dates.ordinals, pa.int32()), _ordinal.UNIX_EPOCH)
+    return pc.cast(pc.cast(days, pa.int32()), pa.date32())
+
+
+def to_jdatetimearray(values):
+    """Return the JDatetimeArray of the wall times of a ``timestamp`` array
+    (or chunked array) without nulls."""
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    keys = pc.add(_microseconds(values), _ordinal.UNIX_EPOCH * _ordinal.US_PER_DAY)
+    return JDatetimeArray.from_keys(_copy_buffer(keys, 'q'))
+
+
+def from_jdatetimearray(datetimes):
+    """Return the naive ``timestamp('us')`` array of a JDatetimeArray."""
+    keys = _wrap_buffer(datetimes.keys, pa.int64())
+    return pc.cast(pc.subtract(keys, _ordinal.UNIX_EPOCH * _ordinal.US_PER_DAY), pa.timestamp('us'))
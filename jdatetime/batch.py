@@ -0,0 +1,225 @@
+"""Bulk operations over sequences of Jalali dates and datetimes.
+
+Sorting goes through integer keys (see ``jdatetime.datetime.sort_key()``)
+computed once per element, instead of comparing objects pairwise, which
+converts both operands to Gregorian on every comparison.
+
+    >>> import jdatetime
+    >>> from jdatetime import batch
+    >>> values = [jdatetime.datetime(1402, 1, 2), jdatetime.datetime(1401, 5, 6, 7, 8)]
+    >>> list(batch.argsort(values))
+    [1, 0]
+    >>> batch.sort(values)
+    [jdatetime.datetime(1401, 5, 6, 7, 8), jdatetime.datetime(1402, 1, 2, 0, 0)]
+
+:class:`StreamConverter` converts Gregorian dates and POSIX timestamps
+that arrive roughly in time order, such as log lines or ledger rows, by
+stepping from the previously converted day:
+
+    >>> import datetime
+    >>> converter = batch.StreamConverter()
+    >>> [converter.fromgregorian(datetime.date(2024, 3, d)) for d in (19, 20, 21)]
+    [jdatetime.date(1402, 12, 29), jdatetime.date(1403, 1, 1), jdatetime.date(1403, 1, 2)]
+
+:func:`parallel_fromepochs` converts large columns of POSIX times with
+``jdatetime.tz.fromepochs`` in a pool of processes, passing the input and
+the resulting keys through shared memory.
+"""
+import datetime as py_datetime
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import jdatetime
+
+from . import _convert, _ordinal, tz as _tz
+from .arrays import JDatetimeArray
+
+_ITEMSIZE = array('q').itemsize
+
+
+def sort_keys(values):
+    """Return an array('q') of the microsecond keys of ``values``.
+
+    ``values`` may mix ``jdatetime.date``/``datetime``,
+    ``datetime.date``/``datetime`` and Jalali ISO strings; dates sort as
+    their midnight. Like ``sorted()``, mixing naive and aware datetimes
+    raises TypeError: their keys are wall times and UTC times.
+    """
+    return _convert.microsecond_keys(values)[0]
+
+
+def argsort(values, reverse=False):
+    """Return an array('q') of the positions that would sort ``values``.
+    The sort is stable."""
+    keys = sort_keys(values)
+    return array('q', sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse))
+
+
+def sort(values, reverse=False):
+    """Return a new list with the items of ``values`` sorted chronologically."""
+    values = list(values)
+    return [values[i] for i in argsort(values, reverse=reverse)]
+
+
+class StreamConverter:
+    """StreamConverter(max_step=31)
+
+    Stateful Gregorian to Jalali converter for mostly monotonic input. The
+    Jalali fields of the last converted day are kept; a day at most
+    ``max_step`` days away is reached by adding the difference to the day
+    of month and carrying over month lengths, and only larger jumps pay a
+    full conversion. Results are identical to ``fromgregorian()`` and
+    ``fromtimestamp()``; input order only changes the speed.
+    """
+
+    def __init__(self, max_step=31):
+        self.max_step = max_step
+        # (day number, Jalali fields) of the last day, swapped as a single
+        # tuple so threads sharing a converter never see a torn pair
+        self._last = (None, None)
+
+    def jalali_fields(self, gregorian_ordinal):
+        """Return the Jalali (year, month, day) of a Gregorian ordinal."""
+        n = gregorian_ordinal - _ordinal.GREGORIAN_OFFSET
+        last_n, last_fields = self._last
+        delta = n - last_n if last_n is not None else None
+        if delta == 0:
+            return last_fields
+        if delta is not None and -self.max_step <= delta <= self.max_step:
+            year, month, day = last_fields
+            day += delta
+            if delta > 0:
+                length = _ordinal.days_in_month(year, month)
+                while day > length:
+                    day -= length
+                    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+                    length = _ordinal.days_in_month(year, month)
+            else:
+                while day < 1:
+                    year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+                    day += _ordinal.days_in_month(year, month)
+            if not _ordinal.MINYEAR <= year <= _ordinal.MAXYEAR:
+                raise ValueError("year is out of range")
+            fields = (year, month, day)
+        else:
+            if not _ordinal.MIN_ORDINAL <= n <= _ordinal.MAX_ORDINAL:
+                raise ValueError("year is out of range")
+            fields = _ordinal.from_ordinal(n)
+        self._last = (n, fields)
+        return fields
+
+    def fromgregorian(self, value, locale=None):
+        """Convert a ``datetime.date`` to ``jdatetime.date``, or a
+        ``datetime.datetime`` to ``jdatetime.datetime`` keeping its time
+        and tzinfo."""
+        fields = self.jalali_fields(value.toordinal())
+        if isinstance(value, py_datetime.datetime):
+            return jdatetime.datetime(
+                *fields,
+                value.hour,
+                value.minute,
+                value.second,
+                value.microsecond,
+                value.tzinfo,
+                locale=locale,
+            )
+        return jdatetime.date(*fields, locale=locale)
+
+    def fromtimestamp(self, timestamp, tz=None, locale=None):
+        """Same as ``jdatetime.datetime.fromtimestamp(timestamp, tz)``.
+
+        With a fixed offset ``tz`` (``datetime.timezone``) the fields are
+        computed with integer arithmetic; local time and other zones go
+        through ``datetime.datetime.fromtimestamp()`` for the offset."""
+        if not isinstance(tz, py_datetime.timezone):
+            return self.fromgregorian(py_datetime.datetime.fromtimestamp(timestamp, tz), locale)
+        us = _ordinal.timestamp_to_us(timestamp) + tz.utcoffset(None) // _ordinal.ONE_US
+        days, us = divmod(us, _ordinal.US_PER_DAY)
+        fields = self.jalali_fields(days + _ordinal.UNIX_EPOCH + _ordinal.GREGORIAN_OFFSET)
+        _, hour, minute, second, microsecond = _ordinal.from_key(us)
+        return jdatetime.datetime(*fields, hour, minute, second, microsecond, tz, locale=locale)
+
+
+def _fromepochs_chunk(epochs_name, keys_name, start, stop, tz, unit):
+    """Worker of parallel_fromepochs(): convert epochs[start:stop] of one
+    shared memory block into the keys of another."""
+    epochs_memory = shared_memory.SharedMemory(name=epochs_name)
+    keys_memory = shared_memory.SharedMemory(name=keys_name)
+    try:
+        with epochs_memory.buf[start * _ITEMSIZE:stop * _ITEMSIZE] as epochs, \
+                keys_memory.buf[start * _ITEMSIZE:stop * _ITEMSIZE] as keys:
+            with epochs.cast('q') as values:
+                keys[:] = _tz.fromepochs(values, tz, unit)[0].keys.cast('B')
+    finally:
+        epochs_memory.close()
+        keys_memory.close()
+
+
+def parallel_fromepochs(epochs, tz=_tz.TEHRAN, unit='s', max_workers=None, chunksize=None, executor=None):
+    """Same as ``jdatetime.tz.fromepochs(epochs, tz, unit)[0]``, computed by
+    a pool of processes.
+
+    epochs: POSIX times, ideally an ``array('q')``; other iterables,
+        which may hold floats, are first copied into one.
+    tz: a picklable tzinfo, such as ``jdatetime.tz.TEHRAN`` or a
+        ``datetime.timezone``.
+    chunksize: number of epochs per task, by default enough for four
+        tasks per worker (per CPU when ``max_workers`` is not given).
+    executor: a ``concurrent.futures.ProcessPoolExecutor`` to reuse; one
+        with ``max_workers`` processes is started otherwise.
+
+    Workers read their chunk from shared memory and write the keys of the
+    ``JDatetimeArray`` in place, so only names and offsets are pickled.
+    The fold flags are not returned.
+    """
+    factor = _tz._unit_factor(unit)
+    if not isinstance(epochs, array) or epochs.typecode != 'q':
+        # Integer microseconds, so that float epochs are rounded like
+        # tz.fromepochs() rounds them
+        epochs = array('q', [_ordinal.timestamp_to_us(epoch, factor) for epoch in epochs])
+        unit = 'us'
+    length = len(epochs)
+    if not length:
+        return JDatetimeArray()
+    if executor is None and max_workers == 1:
+        return _tz.fromepochs(epochs, tz, unit)[0]
+
+    if chunksize is None:
+        chunksize = -(-length // (4 * (max_workers or os.cpu_count() or 1)))
+    size = length * _ITEMSIZE
+    epochs_memory = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        keys_memory = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            epochs_memory.buf[:size] = memoryview(epochs).cast('B')
+            pool = executor or ProcessPoolExecutor(max_workers)
+            try:
+                futures = [
+                    pool.submit(
+                        _fromepochs_chunk,
+                        epochs_memory.name,
+                        keys_memory.name,
+                        start,
+                        min(start + chunksize, length),
+                        tz,
+                        unit,
+                    )
+                    for start in range(0, length, chunksize)
+                ]
+                for future in futures:
+                    future.result()
+            finally:
+                if executor is None:
+                    pool.shutdown()
+            keys = array('q')
+            with keys_memory.buf[:size] as data:
+                keys.frombytes(data)
+            return JDatetimeArray.from_keys(keys)
+        finally:
+            keys_memory.close()
+            keys_memory.unlink()
+    finally:
+        epochs_memory.close()
+        epochs_memory.unlink()
@@ -0,0 +1,189 @@
+"""Cron expressions evaluated in the Jalali calendar.
+
+The five usual fields (minute, hour, day of month, month, day of week) are
+read as Jalali fields: months are 1 (Farvardin) .. 12 (Esfand) and days of
+week follow ``jdatetime.date.weekday()``, Shanbeh == 0 ... Jomeh == 6.
+``L`` in the day of month field is the last day of the month.
+
+    >>> import jdatetime
+    >>> from jdatetime.cron import CronExpression
+    >>> cron = CronExpression('0 2 1 * *')
+    >>> cron.next_after(jdatetime.datetime(1402, 12, 15, 10, 0))
+    jdatetime.datetime(1403, 1, 1, 2, 0)
+
+Finding the next fire time jumps from field to field (month, then day,
+then hour and minute) instead of scanning every minute.
+"""
+import datetime as py_datetime
+from bisect import bisect_left
+
+import jdatetime
+
+from . import _ordinal
+
+_MONTH_NAMES = {name.lower(): i + 1 for i, name in enumerate(jdatetime.date.j_months_short_en)}
+_WEEKDAY_NAMES = {name.lower(): i for i, name in enumerate(jdatetime.date.j_weekdays_short_en)}
+_LAST_DAY = 'l'
+
+
+def _parse_value(value, names):
+    value = value.lower()
+    if names and value in names:
+        return names[value]
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"invalid cron value: {value!r}")
+
+
+def _parse_field(field, low, high, names=None):
+    """Parse one cron field to a sorted tuple of allowed values."""
+    values = set()
+    for part in field.split(','):
+        spec, step_given, step = part.partition('/')
+        step = int(step) if step_given else 1
+        if step < 1:
+            raise ValueError(f"invalid cron step: {part!r}")
+        if spec in ('*', '?'):
+            start, end = low, high
+        elif '-' in spec:
+            start, end = (_parse_value(v, names) for v in spec.split('-', 1))
+        else:
+            start = _parse_value(spec, names)
+            end = high if step_given else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"cron value out of range {low}..{high}: {part!r}")
+        values.update(range(start, end + 1, step))
+    return tuple(sorted(values))
+
+
+class CronExpression:
+    """CronExpression(expression, tz=None)
+
+    tz: the zone the expression is evaluated in. Without it the zone of the
+    datetime passed to next_after() is used, or naive wall time for naive
+    datetimes. Wall times skipped by a DST transition never fire and
+    repeated ones fire once.
+    """
+
+    def __init__(self, expression, tz=None):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression must have 5 fields: {expression!r}")
+        minute, hour, day, month, weekday = fields
+        self.expression = expression
+        self.tz = tz
+        self._minutes = _parse_field(minute, 0, 59)
+        self._hours = _parse_field(hour, 0, 23)
+
+        day_parts = day.lower().split(',')
+        self._last_day = _LAST_DAY in day_parts
+        day = ','.join(part for part in day_parts if part != _LAST_DAY)
+        self._days = frozenset(_parse_field(day, 1, 31)) if day else frozenset()
+        self._months = _parse_field(month, 1, 12, _MONTH_NAMES)
+        self._weekdays = frozenset(_parse_field(weekday, 0, 6, _WEEKDAY_NAMES))
+        self._any_day = day_parts == ['*'] or day_parts == ['?']
+        self._any_weekday = weekday in ('*', '?')
+
+        if self._any_weekday and not self._last_day and not any(
+            d <= (31 if m <= 6 else 30) for d in self._days for m in self._months
+        ):
+            raise ValueError(f"cron expression never fires: {expression!r}")
+
+    def __repr__(self):
+        return f"jdatetime.cron.CronExpression({self.expression!r})"
+
+    def _day_matches(self, n, year, month, day):
+        if self._any_day and self._any_weekday:
+            return True
+        day_ok = day in self._days or (
+            self._last_day and day == _ordinal.days_in_month(year, month)
+        )
+        if self._any_weekday:
+            return day_ok
+        weekday_ok = _ordinal.weekday(n) in self._weekdays
+        if self._any_day:
+            return weekday_ok
+        # Like cron, restricting both fields fires on either of them
+        return day_ok or weekday_ok
+
+    def _next_time(self, minute_of_day):
+        """First allowed minute of day at or after ``minute_of_day``, or None."""
+        hour, minute = divmod(minute_of_day, 60)
+        i = bisect_left(self._hours, hour)
+        if i == len(self._hours):
+            return None
+        if self._hours[i] == hour:
+            j = bisect_left(self._minutes, minute)
+            if j < len(self._minutes):
+                return hour * 60 + self._minutes[j]
+            i += 1
+            if i == len(self._hours):
+                return None
+        return self._hours[i] * 60 + self._minutes[0]
+
+    def _next_local(self, n, minute_of_day):
+        """First (day number, minute of day) firing at or after the given
+        local wall time, or None."""
+        while n <= _ordinal.MAX_ORDINAL:
+            year, month, day = _ordinal.from_ordinal(n)
+            if month not in self._months:
+                i = bisect_left(self._months, month)
+                if i == len(self._months):
+                    year, month = year + 1, self._months[0]
+                else:
+                    month = self._months[i]
+                if year > _ordinal.MAXYEAR:
+                    return None
+                n = _ordinal.to_ordinal(year, month, 1)
+                minute_of_day = 0
+                continue
+            if self._day_matches(n, year, month, day):
+                t = self._next_time(minute_of_day)
+                if t is not None:
+                    return n, t
+            n += 1
+            minute_of_day = 0
+        return None
+
+    def next_after(self, dt):
+        """Return the first fire time strictly after ``dt``, None if there is
+        none before the end of the calendar."""
+        tz = self.tz if self.tz is not None else dt.tzinfo
+        local = dt
+        if tz is not None and dt.tzinfo is not None and dt.tzinfo is not tz:
+            local = dt.astimezone(tz)
+        n = _ordinal.to_ordinal(local.year, local.month, local.day)
+        minute_of_day = local.hour * 60 + local.minute + 1
+
+        while True:
+            if minute_of_day == 1440:
+                n, minute_of_day = n + 1, 0
+            found = self._next_local(n, minute_of_day)
+            if found is None:
+                return None
+            n, minute_of_day = found
+            hour, minute = divmod(minute_of_day, 60)
+            candidate = jdatetime.datetime(
+                *_ordinal.from_ordinal(n), hour, minute, tzinfo=tz, locale=dt.locale
+            )
+            if tz is None or isinstance(tz, py_datetime.timezone):
+                return candidate
+            if _exists(candidate) and (dt.tzinfo is None or candidate > dt):
+                return candidate
+            minute_of_day += 1
+
+    def iter_from(self, dt):
+        """Yield the fire times after ``dt``, in order."""
+        while True:
+            dt = self.next_after(dt)
+            if dt is None:
+                return
+            yield dt
+
+
+def _exists(dt):
+    """Return True unless the wall time of the aware ``dt`` falls in a gap."""
+    gdt = dt.togregorian()
+    round_trip = gdt.astimezone(py_datetime.timezone.utc).astimezone(gdt.tzinfo)
+    return round_trip.replace(tzinfo=None) == gdt.replace(tzinfo=None)
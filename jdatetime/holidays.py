@@ -0,0 +1,217 @@
+"""Business day arithmetic over the Jalali calendar.
+
+A :class:`HolidayCalendar` is built from holiday definitions (one-off dates
+and dates repeated every year) plus the weekly days off. For every year it
+touches it keeps a bitmap of business days and a prefix-sum of their
+counts, so membership is a bit test and counting/offsetting is a couple of
+array lookups and bisects instead of a day by day loop.
+
+    >>> import jdatetime
+    >>> from jdatetime.holidays import HolidayCalendar
+    >>> cal = HolidayCalendar(annual_holidays=[(1, 1), (1, 2), (1, 3), (1, 4)])
+    >>> cal.is_business_day(jdatetime.date(1403, 1, 2))
+    False
+    >>> cal.add_business_days(jdatetime.date(1402, 12, 29), 1)
+    jdatetime.date(1403, 1, 5)
+"""
+from array import array
+from bisect import bisect_right
+from itertools import repeat
+
+import jdatetime
+
+from . import _convert, _ordinal
+
+FRIDAY = 6
+
+
+class HolidayCalendar:
+    """HolidayCalendar(holidays=(), annual_holidays=(), weekend=(FRIDAY,))
+
+    holidays: one-off days off, as ``jdatetime.date``, ``datetime.date``,
+        Jalali ISO strings (``'1402-07-14'``) or day numbers.
+    annual_holidays: ``(month, day)`` pairs of Jalali days off repeated
+        every year. ``(12, 30)`` only applies to leap years.
+    weekend: weekly days off as ``jdatetime.date.weekday()`` values,
+        Shanbeh == 0 ... Jomeh == 6.
+
+    Tables are built lazily by the queries; a calendar can be shared
+    between threads.
+    """
+
+    def __init__(self, holidays=(), annual_holidays=(), weekend=(FRIDAY,)):
+        weekend = frozenset(weekend)
+        if not weekend <= frozenset(range(7)):
+            raise ValueError("weekend days must be in 0..6")
+        if len(weekend) == 7:
+            raise ValueError("weekend can not cover the whole week")
+        self._weekend = weekend
+
+        self._annual = set()
+        for month, day in annual_holidays:
+            if not 1 <= month <= 12 or not 1 <= day <= (31 if month <= 6 else 30):
+                raise ValueError(f"invalid annual holiday: {month}-{day}")
+            self._annual.add(_ordinal.DAYS_BEFORE_MONTH[month - 1] + day - 1)
+
+        self._holidays = {}
+        for value in holidays:
+            year, yday = _locate(_convert.day_number(value))
+            self._holidays.setdefault(year, set()).add(yday)
+
+        # (first year, masks, prefixes, bases) of the years built so far.
+        # Tables are never modified once published: growing them builds a
+        # new tuple which replaces the old one as a whole, so queries from
+        # several threads each see a consistent snapshot.
+        self._tables = None
+
+    def _build_year(self, year):
+        n_days = _ordinal.days_in_year(year)
+        first_weekday = _ordinal.weekday(_ordinal.days_before_year(year) + 1)
+        off = self._annual | self._holidays.get(year, set())
+        weekend = self._weekend
+
+        mask = 0
+        prefix = array('H', [0])
+        count = 0
+        for yday in range(n_days):
+            if yday not in off and (first_weekday + yday) % 7 not in weekend:
+                mask |= 1 << yday
+                count += 1
+            prefix.append(count)
+        return mask, prefix
+
+    def _ensure(self, first, last=None):
+        """Return the tables, extended so they cover years ``first`` to
+        ``last`` (``first`` alone by default)."""
+        if last is None:
+            last = first
+        tables = self._tables
+        if tables is not None:
+            first_year, masks, prefixes, _ = tables
+            if first_year <= first and last < first_year + len(masks):
+                return tables
+            first, last = min(first, first_year), max(last, first_year + len(masks) - 1)
+        else:
+            first_year, masks, prefixes = first, (), ()
+
+        built_masks, built_prefixes = [], []
+        for year in range(first, last + 1):
+            i = year - first_year
+            if 0 <= i < len(masks):
+                mask, prefix = masks[i], prefixes[i]
+            else:
+                mask, prefix = self._build_year(year)
+            built_masks.append(mask)
+            built_prefixes.append(prefix)
+        bases = array('q', [0])
+        for prefix in built_prefixes:
+            bases.append(bases[-1] + prefix[-1])
+        tables = (first, tuple(built_masks), tuple(built_prefixes), bases)
+        self._tables = tables
+        return tables
+
+    def _nth_business_day(self, tables, k):
+        """Return (year, day of year) of the business day having ``k``
+        business days before it, counted from the start of ``tables``."""
+        first_year, masks, prefixes, bases = tables
+        while k < 0 or k >= bases[-1]:
+            last_year = first_year + len(masks) - 1
+            # A year has at most 366 business days: extend by at least as
+            # many years as are still needed
+            if k < 0:
+                if first_year == _ordinal.MINYEAR:
+                    raise OverflowError("date value out of range")
+                tables = self._ensure(max(_ordinal.MINYEAR, first_year + k // 366), last_year)
+            else:
+                if last_year == _ordinal.MAXYEAR:
+                    raise OverflowError("date value out of range")
+                last = min(_ordinal.MAXYEAR, last_year + (k - bases[-1]) // 366 + 1)
+                tables = self._ensure(first_year, last)
+            # Count from the start of the new tables, which another thread
+            # may also have extended backwards
+            k += tables[3][first_year - tables[0]]
+            first_year, masks, prefixes, bases = tables
+        i = bisect_right(bases, k) - 1
+        yday = bisect_right(prefixes[i], k - bases[i]) - 1
+        return first_year + i, yday
+
+    def is_business_day(self, value):
+        """Return True if ``value`` is neither a weekend day nor a holiday."""
+        year, yday = _locate_value(value)
+        first_year, masks, _, _ = self._ensure(year)
+        return bool(masks[year - first_year] >> yday & 1)
+
+    def business_days_between(self, start, end):
+        """Number of business days in [start, end), negative if end < start."""
+        return self._between(_locate_value(start), _locate_value(end))
+
+    def _between(self, start, end):
+        tables = self._ensure(min(start[0], end[0]), max(start[0], end[0]))
+        return _count_before(tables, *end) - _count_before(tables, *start)
+
+    def add_business_days(self, value, days):
+        """Return the date ``days`` business days after ``value``.
+
+        A ``value`` which is not a business day is first rolled forward to
+        the next business day, so adding 0 days returns that day.
+        """
+        year, yday = _locate_value(value)
+        tables = self._ensure(year)
+        year, yday = self._nth_business_day(tables, _count_before(tables, year, yday) + days)
+        locale = value.locale if isinstance(value, jdatetime.date) else None
+        return jdatetime.date(*_from_yday(year, yday), locale=locale)
+
+    # Vectorized forms working on day numbers (jdatetime.date.toordinal())
+
+    def is_business_day_ordinals(self, ordinals):
+        """Vectorized is_business_day(), returns array('b') of 0/1."""
+        result = array('b')
+        for n in ordinals:
+            year, yday = _locate(n)
+            first_year, masks, _, _ = self._ensure(year)
+            result.append(masks[year - first_year] >> yday & 1)
+        return result
+
+    def business_days_between_ordinals(self, starts, ends):
+        """Vectorized business_days_between(), returns array('q')."""
+        return array('q', (self._between(_locate(start), _locate(end)) for start, end in zip(starts, ends)))
+
+    def add_business_days_ordinals(self, ordinals, days):
+        """Vectorized add_business_days() over day numbers, returns array('i').
+
+        ``days`` is either an int applied to every element or a sequence of
+        the same length as ``ordinals``.
+        """
+        if isinstance(days, int):
+            days = repeat(days)
+        result = array('i')
+        for n, offset in zip(ordinals, days):
+            year, yday = _locate(n)
+            tables = self._ensure(year)
+            year, yday = self._nth_business_day(tables, _count_before(tables, year, yday) + offset)
+            result.append(_ordinal.days_before_year(year) + yday + 1)
+        return result
+
+
+def _count_before(tables, year, yday):
+    """Number of business days from the start of ``tables`` up to, but
+    excluding, the given day, which they must cover."""
+    first_year, _, prefixes, bases = tables
+    i = year - first_year
+    return bases[i] + prefixes[i][yday]
+
+
+def _locate(n):
+    """day number -> (year, zero based day of year)"""
+    year, month, day = _ordinal.from_ordinal(n)
+    return year, _ordinal.DAYS_BEFORE_MONTH[month - 1] + day - 1
+
+
+def _locate_value(value):
+    if isinstance(value, jdatetime.date):
+        return value.year, _ordinal.DAYS_BEFORE_MONTH[value.month - 1] + value.day - 1
+    return _locate(_convert.day_number(value))
+
+
+def _from_yday(year, yday):
+    return _ordinal.from_ordinal(_ordinal.days_before_year(year) + yday + 1)
@@ -0,0 +1,191 @@
+"""Sorted index of Jalali datetimes backed by integer keys.
+
+A :class:`JDatetimeIndex` stores the microsecond keys of its datetimes
+(day number * 86400 * 10**6 + microseconds since midnight) in an
+``array('q')``, so range queries are bisects over integers and slices are
+zero-copy views of the same buffer.
+
+    >>> import jdatetime
+    >>> from jdatetime.index import JDatetimeIndex
+    >>> index = JDatetimeIndex([
+    ...     jdatetime.datetime(1402, 7, 30, 23, 0),
+    ...     jdatetime.datetime(1402, 8, 1, 8, 30),
+    ...     jdatetime.datetime(1402, 8, 15, 12, 0),
+    ...     jdatetime.datetime(1402, 9, 1, 0, 0),
+    ... ])
+    >>> index.slice_locs('1402-08', '1402-08')
+    (1, 3)
+    >>> list(index['1402-08'])
+    [jdatetime.datetime(1402, 8, 1, 8, 30), jdatetime.datetime(1402, 8, 15, 12, 0)]
+"""
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+import jdatetime
+
+from . import _convert, _ordinal
+
+_PARTIAL_STRING_RE = re.compile(
+    r'(\d{4})(?:-(\d{1,2})(?:-(\d{1,2})'
+    r'(?:[T ](\d{1,2})(?::(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?)?)?)?)?'
+)
+
+
+def _parse_partial_string(value):
+    """Return the [start, end) microsecond keys covered by a partial Jalali
+    datetime string such as '1402', '1402-08' or '1402-08-15 12'."""
+    match = _PARTIAL_STRING_RE.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(f"invalid partial datetime string: {value!r}")
+    year, month, day, hour, minute, second, fraction = match.groups()
+    year = int(year)
+    if month is None:
+        start = _ordinal.days_before_year(year) + 1
+        return start * _ordinal.US_PER_DAY, (start + _ordinal.days_in_year(year)) * _ordinal.US_PER_DAY
+    month = int(month)
+    # Validates the fields the same way jdatetime.date() does
+    jdatetime.date(year, month, int(day or 1))
+    if day is None:
+        start = _ordinal.to_ordinal(year, month, 1)
+        end = start + _ordinal.days_in_month(year, month)
+        return start * _ordinal.US_PER_DAY, end * _ordinal.US_PER_DAY
+    n = _ordinal.to_ordinal(year, month, int(day))
+    fields = [int(hour or 0), int(minute or 0), int(second or 0), int('{:0<6}'.format(fraction or ''))]
+    jdatetime.time(*fields)
+    start = _ordinal.to_key(n, *fields)
+    if hour is None:
+        width = _ordinal.US_PER_DAY
+    elif minute is None:
+        width = 3600 * _ordinal.US_PER_SECOND
+    elif second is None:
+        width = 60 * _ordinal.US_PER_SECOND
+    elif fraction is None:
+        width = _ordinal.US_PER_SECOND
+    else:
+        width = 10 ** (6 - len(fraction))
+    return start, start + width
+
+
+def _datetime_from_key(key):
+    n, hour, minute, second, microsecond = _ordinal.from_key(key)
+    return jdatetime.datetime(*_ordinal.from_ordinal(n), hour, minute, second, microsecond)
+
+
+class JDatetimeIndex:
+    """JDatetimeIndex(values=(), sort=False)
+
+    values: ``jdatetime.datetime``/``date``, ``datetime.datetime``/``date``
+        or Jalali ISO strings, in non-decreasing order unless ``sort`` is
+        true. Aware datetimes are stored as UTC wall time and items are
+        returned as naive ``jdatetime.datetime``. Naive and aware datetimes
+        can't be mixed, in values or lookups, like in comparisons
+        (TypeError).
+    """
+    # Whether the datetimes indexed are aware, None when unknown, see
+    # _convert.check_awareness()
+    _aware = None
+
+    def __init__(self, values=(), sort=False):
+        keys, self._aware = _convert.microsecond_keys(values)
+        self._keys = memoryview(self._checked(keys, sort))
+
+    @staticmethod
+    def _checked(keys, sort):
+        if sort:
+            return array('q', sorted(keys))
+        if any(a > b for a, b in zip(keys, keys[1:])):
+            raise ValueError("values must be sorted, pass sort=True to sort them")
+        return keys
+
+    @classmethod
+    def from_keys(cls, keys, sort=False):
+        """Build an index from microsecond keys. A ``array('q')`` is used
+        as is, without copying, when no sorting is needed."""
+        if not (isinstance(keys, array) and keys.typecode == 'q'):
+            keys = array('q', keys)
+        return cls._from_view(memoryview(cls._checked(keys, sort)))
+
+    @classmethod
+    def _from_view(cls, view, aware=None):
+        index = cls.__new__(cls)
+        index._keys = view
+        index._aware = aware
+        return index
+
+    def _key(self, value):
+        _convert.check_awareness(self._aware, value)
+        return _convert.microsecond_key(value)
+
+    @property
+    def keys(self):
+        """Read-only memoryview of the microsecond keys."""
+        return self._keys.toreadonly()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        for key in self._keys:
+            yield _datetime_from_key(key)
+
+    def __repr__(self):
+        return f"jdatetime.index.JDatetimeIndex({list(self)!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, JDatetimeIndex):
+            return NotImplemented
+        return self._keys == other._keys
+
+    def __contains__(self, value):
+        key = self._key(value)
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def __getitem__(self, item):
+        """index[i] -> jdatetime.datetime
+        index[i:j] -> zero-copy positional view
+        index['1402-08'], index['1402-08':'1402-09'] -> zero-copy view by label
+        """
+        if isinstance(item, int):
+            return _datetime_from_key(self._keys[item])
+        if isinstance(item, slice):
+            if all(isinstance(x, int) or x is None for x in (item.start, item.stop)):
+                if item.step not in (None, 1):
+                    raise ValueError("JDatetimeIndex slices must be contiguous")
+                return self._from_view(self._keys[item], self._aware)
+            start, stop = self.slice_locs(item.start, item.stop)
+            return self._from_view(self._keys[start:stop], self._aware)
+        start, stop = self.slice_locs(item, item)
+        return self._from_view(self._keys[start:stop], self._aware)
+
+    def searchsorted(self, value, side='left'):
+        """Position where ``value`` would be inserted to keep the order.
+        ``value`` may also be a list/tuple/array, an array('q') of positions
+        is returned then."""
+        if side not in ('left', 'right'):
+            raise ValueError("side must be 'left' or 'right'")
+        search = bisect_left if side == 'left' else bisect_right
+        if isinstance(value, (list, tuple, array)):
+            keys = self._keys
+            return array('q', (search(keys, self._key(v)) for v in value))
+        return search(self._keys, self._key(value))
+
+    def slice_locs(self, start=None, end=None):
+        """Return the (start, stop) positions of the labels between
+        ``start`` and ``end``, both included. Strings are partial Jalali
+        datetimes and cover their whole period."""
+        keys = self._keys
+        if start is None:
+            lo = 0
+        elif isinstance(start, str):
+            lo = bisect_left(keys, _parse_partial_string(start)[0])
+        else:
+            lo = bisect_left(keys, self._key(start))
+        if end is None:
+            hi = len(keys)
+        elif isinstance(end, str):
+            hi = bisect_left(keys, _parse_partial_string(end)[1])
+        else:
+            hi = bisect_right(keys, self._key(end))
+        return lo, max(lo, hi)
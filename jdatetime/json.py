@@ -0,0 +1,139 @@
+"""JSON encoding and decoding of Jalali dates and datetimes.
+
+:class:`JSONEncoder` writes ``jdatetime.date`` and ``datetime`` values as
+ISO strings formatted straight from their fields, and the object hooks
+turn such strings back into values. Strings are only parsed after a check
+of their length and separators, and ``fields`` restricts decoding to some
+keys so that other strings are not even looked at.
+
+    >>> import jdatetime
+    >>> from jdatetime import json
+    >>> data = json.dumps({'id': 7, 'created': jdatetime.datetime(1402, 8, 15, 12, 30)})
+    >>> data
+    '{"id": 7, "created": "1402-08-15T12:30:00"}'
+    >>> json.loads(data, fields=['created'])
+    {'id': 7, 'created': jdatetime.datetime(1402, 8, 15, 12, 30)}
+
+Strings are the same as ``isoformat()``, except that years before 1000
+are padded to 4 digits. Without ``fields`` dates in lists are not
+decoded, only values of objects; lists under the keys in ``fields`` are
+decoded item by item.
+"""
+import json
+import re
+
+import jdatetime
+
+# Lengths of YYYY-MM-DDTHH:MM:SS, with .ffffff and with +HHMM or +HH:MM
+_DATETIME_LENGTHS = frozenset(19 + fraction + offset for fraction in (0, 7) for offset in (0, 5, 6))
+
+_DATETIME_PATTERN = re.compile(
+    r'(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d):(\d\d)(?:\.(\d{6}))?([+-]\d\d:?\d\d)?', re.ASCII
+)
+
+
+def format_value(value):
+    """ISO string of a ``jdatetime.date`` or ``datetime``."""
+    if isinstance(value, jdatetime.datetime):
+        microsecond = value.microsecond
+        result = '%04d-%02d-%02dT%02d:%02d:%02d' % (
+            value.year, value.month, value.day, value.hour, value.minute, value.second,
+        )
+        if microsecond:
+            result += '.%06d' % microsecond
+        offset = value.utcoffset()
+        if offset is not None:
+            result += jdatetime._format_utcoffset(offset)
+        return result
+    return '%04d-%02d-%02d' % (value.year, value.month, value.day)
+
+
+def parse_value(value):
+    """Return the ``jdatetime.date`` or ``datetime`` of a Jalali ISO string
+    written by :func:`format_value`, or ``value`` itself if it is not one."""
+    if not isinstance(value, str):
+        return value
+    length = len(value)
+    if length == 10:
+        if value[4] == '-' and value[7] == '-' and value[:4].isdigit():
+            try:
+                return jdatetime.date(int(value[:4]), int(value[5:7]), int(value[8:]))
+            except ValueError:
+                pass
+        return value
+    if length not in _DATETIME_LENGTHS or value[4] != '-' or value[13] != ':':
+        return value
+    match = _DATETIME_PATTERN.fullmatch(value)
+    if match is None:
+        return value
+    year, month, day, hour, minute, second, microsecond, offset = match.groups()
+    try:
+        return jdatetime.datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour),
+            int(minute),
+            int(second),
+            int(microsecond) if microsecond else 0,
+            jdatetime.datetime._timezone_from_string(offset),
+        )
+    except ValueError:
+        return value
+
+
+class JSONEncoder(json.JSONEncoder):
+    """``json.JSONEncoder`` writing Jalali dates and datetimes as ISO strings."""
+
+    def default(self, o):
+        if isinstance(o, jdatetime.date):
+            return format_value(o)
+        return super().default(o)
+
+
+def make_object_hook(fields=None):
+    """Return an ``object_hook`` for ``json.load()`` decoding the Jalali ISO
+    strings of the keys in ``fields``, or of every key if None. Lists of
+    strings under the keys in ``fields`` are decoded too."""
+    if fields is None:
+        def object_hook(obj):
+            for key, value in obj.items():
+                if type(value) is str:
+                    obj[key] = parse_value(value)
+            return obj
+    else:
+        fields = frozenset(fields)
+
+        def object_hook(obj):
+            for key in fields.intersection(obj):
+                value = obj[key]
+                if type(value) is list:
+                    obj[key] = [parse_value(item) for item in value]
+                else:
+                    obj[key] = parse_value(value)
+            return obj
+    return object_hook
+
+
+def make_object_pairs_hook(fields=None):
+    """Same as :func:`make_object_hook`, as an ``object_pairs_hook``."""
+    object_hook = make_object_hook(fields)
+
+    def object_pairs_hook(pairs):
+        return object_hook(dict(pairs))
+    return object_pairs_hook
+
+
+object_hook = make_object_hook()
+object_pairs_hook = make_object_pairs_hook()
+
+
+def dumps(obj, **kwargs):
+    """``json.dumps()`` with :class:`JSONEncoder`."""
+    return json.dumps(obj, cls=JSONEncoder, **kwargs)
+
+
+def loads(s, fields=None, **kwargs):
+    """``json.loads()`` decoding the Jalali ISO strings of the keys in
+    ``fields``, or of every key if None."""
+    return json.loads(s, object_hook=make_object_hook(fields), **kwargs)
@@ -0,0 +1,117 @@
+"""Lookup of named periods (fiscal years, payroll cycles, tariff windows)
+delimited by Jalali start dates.
+
+The boundaries are stored as integer keys (day numbers, or microsecond keys
+when any boundary carries a time) so finding the period of a value is a
+single bisect, whatever calendar the value comes in.
+
+    >>> import jdatetime
+    >>> from jdatetime.periods import PeriodIndex
+    >>> fiscal = PeriodIndex(['1401-01-01', '1402-01-01', '1403-01-01'], labels=['FY01', 'FY02', 'FY03'])
+    >>> fiscal.lookup(jdatetime.date(1402, 5, 1))
+    'FY02'
+    >>> import datetime
+    >>> fiscal.lookup(datetime.date(2023, 3, 20))
+    'FY01'
+"""
+from array import array
+from bisect import bisect_right
+
+from . import _convert
+
+
+class PeriodIndex:
+    """PeriodIndex(boundaries, labels=None, end=None)
+
+    boundaries: strictly increasing start of each period as
+        ``jdatetime.date``/``datetime``, ``datetime.date``/``datetime`` or
+        Jalali ISO strings. Period ``i`` spans ``[boundaries[i], boundaries[i + 1])``.
+    labels: optional label of each period, returned by lookup().
+    end: optional exclusive end of the last period, which is open otherwise.
+
+    Boundaries with a time of day and the values looked up in them can't
+    mix naive and aware datetimes, like in comparisons (TypeError).
+    """
+
+    def __init__(self, boundaries, labels=None, end=None):
+        boundaries = list(boundaries)
+        if not boundaries:
+            raise ValueError("at least one boundary is required")
+        if labels is not None:
+            labels = list(labels)
+            if len(labels) != len(boundaries):
+                raise ValueError("labels and boundaries must have the same length")
+        self.labels = labels
+
+        edges = boundaries if end is None else boundaries + [end]
+        self._with_time = any(_convert.is_datetime(edge) for edge in edges)
+        self._to_key = _convert.microsecond_key if self._with_time else _convert.day_number
+        # Microsecond keys of naive and aware datetimes are wall and UTC
+        # times: like comparisons, mixing them raises TypeError
+        self._aware = None
+        if self._with_time:
+            for edge in edges:
+                self._aware = _convert.check_awareness(self._aware, edge)
+        keys = array('q', map(self._to_key, boundaries))
+        if any(a >= b for a, b in zip(keys, keys[1:])):
+            raise ValueError("boundaries must be strictly increasing")
+        self._starts = keys
+        self._end = None if end is None else self._to_key(end)
+        if self._end is not None and self._end <= keys[-1]:
+            raise ValueError("end must be after the last boundary")
+
+    def __len__(self):
+        return len(self._starts)
+
+    @property
+    def resolution(self):
+        """'D' when keys are day numbers, 'us' when they are microsecond keys."""
+        return 'us' if self._with_time else 'D'
+
+    def _key(self, value):
+        if self._with_time:
+            _convert.check_awareness(self._aware, value)
+        return self._to_key(value)
+
+    def _locate_key(self, key):
+        if self._end is not None and key >= self._end:
+            return -1
+        return bisect_right(self._starts, key) - 1
+
+    def locate(self, value):
+        """Return the index of the period containing ``value``, -1 if none does."""
+        return self._locate_key(self._key(value))
+
+    def lookup(self, value, default=None):
+        """Return the label (or index, without labels) of the period
+        containing ``value``, ``default`` if none does."""
+        i = self._locate_key(self._key(value))
+        if i < 0:
+            return default
+        return i if self.labels is None else self.labels[i]
+
+    def locate_keys(self, keys):
+        """Vectorized locate() over day numbers or microsecond keys
+        (matching ``resolution``), returns array('i')."""
+        starts = self._starts
+        end = self._end
+        result = array('i')
+        append = result.append
+        for key in keys:
+            if end is not None and key >= end:
+                append(-1)
+            else:
+                append(bisect_right(starts, key) - 1)
+        return result
+
+    def locate_many(self, values):
+        """Vectorized locate() over any mix of Jalali and Gregorian values."""
+        return self.locate_keys(map(self._key, values))
+
+    def lookup_many(self, values, default=None):
+        """Vectorized lookup(), returns a list."""
+        labels = self.labels
+        return [
+            default if i < 0 else (i if labels is None else labels[i])
+            for i in self.locate_many(values)
+        ]
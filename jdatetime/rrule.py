@@ -0,0 +1,384 @@
+"""Recurrence rules over the Jalali calendar, in the spirit of dateutil.rrule.
+
+Occurrences are computed period by period (year, month, week or day) from
+the calendar tables, so a rule such as "the last Friday of every month"
+never walks the days between two occurrences.
+
+    >>> import jdatetime
+    >>> from jdatetime.rrule import MONTHLY, YEARLY, FR, SA, rrule
+    >>> list(rrule(MONTHLY, jdatetime.date(1402, 1, 1), bymonthday=1, count=3))
+    [jdatetime.date(1402, 1, 1), jdatetime.date(1402, 2, 1), jdatetime.date(1402, 3, 1)]
+    >>> rrule(MONTHLY, jdatetime.date(1402, 1, 1), byweekday=SA(2)).after(jdatetime.date(1402, 6, 1))
+    jdatetime.date(1402, 6, 11)
+    >>> last_working_day = rrule(YEARLY, jdatetime.date(1400, 1, 1), bymonth=12,
+    ...                          byweekday=(SA, SU, MO, TU, WE, TH), bysetpos=-1)
+    >>> last_working_day.after(jdatetime.date(1402, 1, 1))
+    jdatetime.date(1402, 12, 29)
+"""
+from collections import OrderedDict
+from itertools import islice
+
+import jdatetime
+
+from . import _convert, _ordinal
+
+YEARLY, MONTHLY, WEEKLY, DAILY = range(4)
+
+# Number of expanded windows memoized per rule by expand()
+_WINDOW_CACHE_SIZE = 64
+
+
+class weekday:
+    """Weekday of a rule, Shanbeh == 0 ... Jomeh == 6, optionally the nth
+    one of its period (``SA(2)`` is the second Saturday, ``FR(-1)`` the last
+    Friday)."""
+    __slots__ = ('weekday', 'n')
+
+    def __init__(self, weekday, n=None):
+        if not 0 <= weekday <= 6:
+            raise ValueError("weekday must be in 0..6")
+        if n == 0:
+            raise ValueError("can't create weekday with n == 0")
+        self.weekday = weekday
+        self.n = n
+
+    def __call__(self, n):
+        if n == self.n:
+            return self
+        return weekday(self.weekday, n)
+
+    def __eq__(self, other):
+        if not isinstance(other, weekday):
+            return NotImplemented
+        return self.weekday == other.weekday and self.n == other.n
+
+    def __hash__(self):
+        return hash((self.weekday, self.n))
+
+    def __repr__(self):
+        name = ('SA', 'SU', 'MO', 'TU', 'WE', 'TH', 'FR')[self.weekday]
+        if self.n is None:
+            return name
+        return f'{name}({self.n:+d})'
+
+
+SA, SU, MO, TU, WE, TH, FR = (weekday(i) for i in range(7))
+
+
+def _as_tuple(value):
+    if value is None:
+        return ()
+    if isinstance(value, (int, weekday)):
+        return (value,)
+    return tuple(value)
+
+
+class rrule:
+    """rrule(freq, dtstart, interval=1, count=None, until=None, bymonth=None,
+    bymonthday=None, byweekday=None, bysetpos=None, calendar=None)
+
+    freq: one of YEARLY, MONTHLY, WEEKLY or DAILY.
+    dtstart: first possible occurrence, a ``jdatetime.date`` or
+        ``jdatetime.datetime``. Occurrences have its type, time of day,
+        tzinfo and locale.
+    bymonth, bymonthday, byweekday: as in dateutil; negative month days
+        count from the end of the month and ``weekday`` instances with
+        ``n`` pick the nth weekday of the month (or of the year for a
+        YEARLY rule without bymonth). Weeks start on Shanbeh.
+    bysetpos: positions, within each period, of the occurrences to keep.
+    calendar: a ``jdatetime.holidays.HolidayCalendar``; only its business
+        days are occurrences. It is applied before bysetpos.
+    """
+
+    def __init__(
+        self,
+        freq,
+        dtstart,
+        interval=1,
+        count=None,
+        until=None,
+        bymonth=None,
+        bymonthday=None,
+        byweekday=None,
+        bysetpos=None,
+        calendar=None,
+    ):
+        if freq not in (YEARLY, MONTHLY, WEEKLY, DAILY):
+            raise ValueError("invalid frequency")
+        if not isinstance(dtstart, jdatetime.date):
+            raise TypeError("dtstart must be jdatetime.date or jdatetime.datetime")
+        if interval < 1:
+            raise ValueError("interval must be a positive integer")
+        self._freq = freq
+        self._dtstart = dtstart
+        self._interval = interval
+        self._count = count
+        self._until = None if until is None else _convert.wall_key(until)
+        self._calendar = calendar
+
+        self._bymonth = frozenset(_as_tuple(bymonth))
+        if any(not 1 <= m <= 12 for m in self._bymonth):
+            raise ValueError("bymonth must be in 1..12")
+        self._bymonthday = frozenset(_as_tuple(bymonthday))
+        if any(not 1 <= abs(d) <= 31 for d in self._bymonthday):
+            raise ValueError("bymonthday must be in -31..-1 or 1..31")
+        self._byweekday = tuple(
+            wd if isinstance(wd, weekday) else weekday(wd) for wd in _as_tuple(byweekday)
+        )
+        self._weekdays = frozenset(wd.weekday for wd in self._byweekday)
+        self._bysetpos = _as_tuple(bysetpos)
+        if any(pos == 0 for pos in self._bysetpos):
+            raise ValueError("bysetpos can't be 0")
+
+        # Defaults taken from dtstart, as dateutil does
+        if not (self._bymonthday or self._byweekday):
+            if freq == YEARLY:
+                if not self._bymonth:
+                    self._bymonth = frozenset((dtstart.month,))
+                self._bymonthday = frozenset((dtstart.day,))
+            elif freq == MONTHLY:
+                self._bymonthday = frozenset((dtstart.day,))
+            elif freq == WEEKLY:
+                self._byweekday = (weekday(dtstart.weekday()),)
+                self._weekdays = frozenset((dtstart.weekday(),))
+
+        self._start = _ordinal.to_ordinal(dtstart.year, dtstart.month, dtstart.day)
+        if isinstance(dtstart, jdatetime.datetime):
+            self._time_key = _ordinal.to_key(
+                0, dtstart.hour, dtstart.minute, dtstart.second, dtstart.microsecond
+            )
+        else:
+            self._time_key = 0
+        self._windows = OrderedDict()
+
+    # Candidate days of each kind of period, as sorted day numbers
+
+    def _weekday_offsets(self, first, n_days):
+        """Offsets in [0, n_days) of the byweekday days of a span starting
+        at day number ``first``, nth weekdays being counted in the span."""
+        offsets = set()
+        first_weekday = _ordinal.weekday(first)
+        last_weekday = _ordinal.weekday(first + n_days - 1)
+        for wd in self._byweekday:
+            if wd.n is None:
+                offsets.update(range((wd.weekday - first_weekday) % 7, n_days, 7))
+            elif wd.n > 0:
+                offset = (wd.weekday - first_weekday) % 7 + 7 * (wd.n - 1)
+                if offset < n_days:
+                    offsets.add(offset)
+            else:
+                offset = n_days - 1 - (last_weekday - wd.weekday) % 7 + 7 * (wd.n + 1)
+                if offset >= 0:
+                    offsets.add(offset)
+        return offsets
+
+    def _monthday_offsets(self, n_days):
+        return {
+            (d if d > 0 else n_days + d + 1) - 1
+            for d in self._bymonthday if abs(d) <= n_days
+        }
+
+    def _month_days(self, year, month):
+        first = _ordinal.to_ordinal(year, month, 1)
+        n_days = _ordinal.days_in_month(year, month)
+        if self._bymonthday and self._byweekday:
+            offsets = self._monthday_offsets(n_days) & self._weekday_offsets(first, n_days)
+        elif self._bymonthday:
+            offsets = self._monthday_offsets(n_days)
+        else:
+            offsets = self._weekday_offsets(first, n_days)
+        return [first + offset for offset in sorted(offsets)]
+
+    def _year_days(self, year):
+        if self._bymonth:
+            days = []
+            for month in sorted(self._bymonth):
+                days.extend(self._month_days(year, month))
+            return days
+
+        first = _ordinal.days_before_year(year) + 1
+        offsets = None
+        if self._bymonthday:
+            offsets = set()
+            for month in range(1, 13):
+                month_offset = _ordinal.DAYS_BEFORE_MONTH[month - 1]
+                n_days = _ordinal.days_in_month(year, month)
+                offsets.update(month_offset + offset for offset in self._monthday_offsets(n_days))
+        if self._byweekday:
+            weekday_offsets = self._weekday_offsets(first, _ordinal.days_in_year(year))
+            offsets = weekday_offsets if offsets is None else offsets & weekday_offsets
+        return [first + offset for offset in sorted(offsets)]
+
+    def _week_days(self, week_start):
+        if self._weekdays:
+            days = [week_start + wd for wd in sorted(self._weekdays)]
+        else:
+            # bymonthday without byweekday: every day of the week, as in dateutil
+            days = range(week_start, week_start + 7)
+        if self._bymonth or self._bymonthday:
+            days = [n for n in days if self._matches_month_filters(n)]
+        return days
+
+    def _matches_month_filters(self, n):
+        year, month, day = _ordinal.from_ordinal(n)
+        if self._bymonth and month not in self._bymonth:
+            return False
+        if self._bymonthday:
+            n_days = _ordinal.days_in_month(year, month)
+            if day not in self._bymonthday and day - n_days - 1 not in self._bymonthday:
+                return False
+        return True
+
+    def _day_matches(self, n):
+        if self._weekdays and _ordinal.weekday(n) not in self._weekdays:
+            return False
+        return self._matches_month_filters(n)
+
+    def _select(self, days):
+        if self._calendar is not None:
+            days = [n for n in days if self._calendar.is_business_day(n)]
+        if self._bysetpos:
+            selected = set()
+            for pos in self._bysetpos:
+                if -len(days) <= pos <= len(days):
+                    selected.add(days[pos - 1 if pos > 0 else pos])
+            days = sorted(selected)
+        return days
+
+    def _iter_days(self, from_n=None):
+        """Yield occurrence day numbers in order, starting at the period
+        containing ``from_n`` (aligned on the interval) when given."""
+        start = self._start
+        interval = self._interval
+        freq = self._freq
+        year, month, _ = _ordinal.from_ordinal(start)
+        skip = 0
+
+        if freq == YEARLY:
+            if from_n is not None:
+                skip = max(0, (_ordinal.from_ordinal(from_n)[0] - year) // interval)
+            for y in range(year + skip * interval, _ordinal.MAXYEAR + 1, interval):
+                for n in self._select(self._year_days(y)):
+                    if n >= start:
+                        yield n
+        elif freq == MONTHLY:
+            index = year * 12 + month - 1
+            if from_n is not None:
+                y, m, _ = _ordinal.from_ordinal(from_n)
+                skip = max(0, (y * 12 + m - 1 - index) // interval)
+            for i in range(index + skip * interval, (_ordinal.MAXYEAR + 1) * 12, interval):
+                y, m = divmod(i, 12)
+                if self._bymonth and m + 1 not in self._bymonth:
+                    continue
+                for n in self._select(self._month_days(y, m + 1)):
+                    if n >= start:
+                        yield n
+        elif freq == WEEKLY:
+            week_start = start - _ordinal.weekday(start)
+            if from_n is not None:
+                skip = max(0, (from_n - week_start) // (7 * interval))
+            for w in range(week_start + skip * 7 * interval, _ordinal.MAX_ORDINAL + 1, 7 * interval):
+                for n in self._select(self._week_days(w)):
+                    if start <= n <= _ordinal.MAX_ORDINAL:
+                        yield n
+        else:
+            if from_n is not None:
+                skip = max(0, (from_n - start) // interval)
+            for n in range(start + skip * interval, _ordinal.MAX_ORDINAL + 1, interval):
+                if self._day_matches(n) and self._select([n]):
+                    yield n
+
+    def _iter_keys(self, from_key=None):
+        """Yield (key, day number) of the occurrences, applying count and until."""
+        from_n = None
+        if from_key is not None and self._count is None:
+            from_n = from_key // _ordinal.US_PER_DAY
+        time_key = self._time_key
+        until = self._until
+        days = self._iter_days(from_n)
+        if self._count is not None:
+            days = islice(days, self._count)
+        for n in days:
+            key = n * _ordinal.US_PER_DAY + time_key
+            if until is not None and key > until:
+                return
+            yield key, n
+
+    def _occurrence(self, n):
+        dt = self._dtstart
+        y, m, d = _ordinal.from_ordinal(n)
+        if isinstance(dt, jdatetime.datetime):
+            return jdatetime.datetime(
+                y, m, d, dt.hour, dt.minute, dt.second, dt.microsecond, dt.tzinfo,
+                locale=dt.locale, fold=dt.fold,
+            )
+        return jdatetime.date(y, m, d, locale=dt.locale)
+
+    def __iter__(self):
+        for _, n in self._iter_keys():
+            yield self._occurrence(n)
+
+    def between(self, after, before, inc=False):
+        """Return the occurrences between ``after`` and ``before``, included
+        when ``inc`` is true. Bounds are compared on their wall clock fields."""
+        after_key = _convert.wall_key(after)
+        before_key = _convert.wall_key(before)
+        result = []
+        for key, n in self._iter_keys(after_key):
+            if key > before_key or (key == before_key and not inc):
+                break
+            if key > after_key or (key == after_key and inc):
+                result.append(self._occurrence(n))
+        return result
+
+    def after(self, dt, inc=False):
+        """Return the first occurrence after ``dt``, None if there is none."""
+        dt_key = _convert.wall_key(dt)
+        for key, n in self._iter_keys(dt_key):
+            if key > dt_key or (key == dt_key and inc):
+                return self._occurrence(n)
+        return None
+
+    def before(self, dt, inc=False):
+        """Return the last occurrence before ``dt``, None if there is none."""
+        dt_key = _convert.wall_key(dt)
+        dt_n = dt_key // _ordinal.US_PER_DAY
+        # Search from a year before dt, doubling the span until an
+        # occurrence is found; a rule with count is walked from dtstart.
+        span = 366
+        while True:
+            from_n = dt_n - span
+            from_key = None if from_n <= self._start else from_n * _ordinal.US_PER_DAY
+            last = None
+            for key, n in self._iter_keys(from_key):
+                if key > dt_key or (key == dt_key and not inc):
+                    break
+                last = n
+            if last is not None or from_key is None or self._count is not None:
+                return None if last is None else self._occurrence(last)
+            span *= 2
+
+    def expand(self, start, end):
+        """Return the occurrences in [start, end) as a tuple.
+
+        Results are memoized per window, so expanding the same window again
+        (e.g. "this month" for every user sharing a rule) is a dict lookup.
+        """
+        window = (_convert.wall_key(start), _convert.wall_key(end))
+        try:
+            self._windows.move_to_end(window)
+            return self._windows[window]
+        except KeyError:
+            pass
+        occurrences = tuple(self._occurrence(n) for _, n in self._iter_window(*window))
+        self._windows[window] = occurrences
+        if len(self._windows) > _WINDOW_CACHE_SIZE:
+            self._windows.popitem(last=False)
+        return occurrences
+
+    def _iter_window(self, start_key, end_key):
+        for key, n in self._iter_keys(start_key):
+            if key >= end_key:
+                return
+            if key >= start_key:
+                yield key, n
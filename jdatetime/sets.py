@@ -0,0 +1,243 @@
+"""Bitmap-backed sets of Jalali days.
+
+A :class:`JDateSet` keeps one bit per day number (see
+``jdatetime.date.toordinal()``) in a Python int, relative to the lowest
+day it has seen. Union, intersection and difference are single integer
+operations whatever the number of days, and nothing is hashed.
+
+    >>> import jdatetime
+    >>> from jdatetime.sets import JDateSet
+    >>> active = JDateSet(['1402-08-01', '1402-08-02', '1402-09-10'])
+    >>> returning = active & JDateSet(['1402-08-02', '1402-09-10', '1402-09-11'])
+    >>> list(returning)
+    [jdatetime.date(1402, 8, 2), jdatetime.date(1402, 9, 10)]
+    >>> active.count_per_month()
+    {(1402, 8): 2, (1402, 9): 1}
+"""
+from array import array
+
+import jdatetime
+
+from . import _convert, _ordinal
+
+try:
+    _bit_count = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _bit_count(value):
+        return bin(value).count('1')
+
+# Positions of the set bits of every byte value
+_BYTE_BITS = tuple(tuple(i for i in range(8) if byte >> i & 1) for byte in range(256))
+
+
+class JDateSet:
+    """JDateSet(values=())
+
+    values: ``jdatetime.date``, ``datetime.date``, Jalali ISO strings or
+    day numbers.
+    """
+
+    def __init__(self, values=()):
+        self._offset = 0
+        self._bits = 0
+        ordinals = [_convert.day_number(value) for value in values]
+        if ordinals:
+            offset = min(ordinals)
+            buffer = bytearray((max(ordinals) - offset) // 8 + 1)
+            for n in ordinals:
+                i = n - offset
+                buffer[i >> 3] |= 1 << (i & 7)
+            self._offset, self._bits = offset, int.from_bytes(buffer, 'little')
+
+    @classmethod
+    def _wrap(cls, offset, bits):
+        result = cls.__new__(cls)
+        result._offset, result._bits = _normalized(offset, bits)
+        return result
+
+    @classmethod
+    def from_ordinals(cls, ordinals):
+        """Build a set from day numbers."""
+        return cls(ordinals)
+
+    @classmethod
+    def range(cls, start, stop):
+        """Set of every day in [start, stop)."""
+        first, last = _convert.day_number(start), _convert.day_number(stop)
+        if last <= first:
+            return cls()
+        return cls._wrap(first, (1 << (last - first)) - 1)
+
+    def _aligned(self, other):
+        """Return (offset, self bits, other bits) on a common offset."""
+        if not isinstance(other, JDateSet):
+            other = JDateSet(other)
+        if not other._bits:
+            return self._offset, self._bits, 0
+        if not self._bits:
+            return other._offset, 0, other._bits
+        offset = min(self._offset, other._offset)
+        return (
+            offset,
+            self._bits << (self._offset - offset),
+            other._bits << (other._offset - offset),
+        )
+
+    def __len__(self):
+        return _bit_count(self._bits)
+
+    def __bool__(self):
+        return self._bits != 0
+
+    def __contains__(self, value):
+        i = _convert.day_number(value) - self._offset
+        return i >= 0 and bool(self._bits >> i & 1)
+
+    def __iter__(self):
+        for n in self.ordinals():
+            yield jdatetime.date(*_ordinal.from_ordinal(n))
+
+    def __repr__(self):
+        return f"jdatetime.sets.JDateSet({[str(d) for d in self]!r})"
+
+    def ordinals(self):
+        """Return the day numbers of the set, in order, as an array('i')."""
+        result = array('i')
+        bits = self._bits
+        if not bits:
+            return result
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+        offset = self._offset
+        for i, byte in enumerate(data):
+            if byte:
+                base = offset + 8 * i
+                result.extend(base + bit for bit in _BYTE_BITS[byte])
+        return result
+
+    def add(self, value):
+        n = _convert.day_number(value)
+        if not self._bits:
+            self._offset, self._bits = n, 1
+        elif n < self._offset:
+            self._bits = (self._bits << (self._offset - n)) | 1
+            self._offset = n
+        else:
+            self._bits |= 1 << (n - self._offset)
+
+    def discard(self, value):
+        i = _convert.day_number(value) - self._offset
+        if i >= 0 and self._bits >> i & 1:
+            self._offset, self._bits = _normalized(self._offset, self._bits & ~(1 << i))
+
+    def min(self):
+        if not self._bits:
+            raise ValueError("min() of an empty JDateSet")
+        return jdatetime.date(*_ordinal.from_ordinal(self._offset))
+
+    def max(self):
+        if not self._bits:
+            raise ValueError("max() of an empty JDateSet")
+        return jdatetime.date(*_ordinal.from_ordinal(self._offset + self._bits.bit_length() - 1))
+
+    def union(self, *others):
+        result = self
+        for other in others:
+            offset, a, b = result._aligned(other)
+            result = self._wrap(offset, a | b)
+        return result if others else self.copy()
+
+    def intersection(self, *others):
+        result = self
+        for other in others:
+            offset, a, b = result._aligned(other)
+            result = self._wrap(offset, a & b)
+        return result if others else self.copy()
+
+    def difference(self, *others):
+        result = self
+        for other in others:
+            offset, a, b = result._aligned(other)
+            result = self._wrap(offset, a & ~b)
+        return result if others else self.copy()
+
+    def symmetric_difference(self, other):
+        offset, a, b = self._aligned(other)
+        return self._wrap(offset, a ^ b)
+
+    def copy(self):
+        return self._wrap(self._offset, self._bits)
+
+    def __or__(self, other):
+        if not isinstance(other, JDateSet):
+            return NotImplemented
+        return self.union(other)
+
+    def __and__(self, other):
+        if not isinstance(other, JDateSet):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        if not isinstance(other, JDateSet):
+            return NotImplemented
+        return self.difference(other)
+
+    def __xor__(self, other):
+        if not isinstance(other, JDateSet):
+            return NotImplemented
+        return self.symmetric_difference(other)
+
+    def __eq__(self, other):
+        if not isinstance(other, JDateSet):
+            return NotImplemented
+        return (self._offset, self._bits) == (other._offset, other._bits)
+
+    def __le__(self, other):
+        if not isinstance(other, JDateSet):
+            return NotImplemented
+        _, a, b = self._aligned(other)
+        return a & ~b == 0
+
+    def __ge__(self, other):
+        if not isinstance(other, JDateSet):
+            return NotImplemented
+        return other <= self
+
+    def isdisjoint(self, other):
+        _, a, b = self._aligned(other)
+        return a & b == 0
+
+    __hash__ = None
+
+    def count_per_month(self):
+        """Return {(year, month): number of days} for the months having
+        at least one day in the set, in order."""
+        result = {}
+        bits = self._bits
+        if not bits:
+            return result
+        year, month, _ = _ordinal.from_ordinal(self._offset)
+        # Realign the bitmap on the first day of the first month and read
+        # each month from the bytes around it: shifting the whole int once
+        # per month would be quadratic in the length of the range
+        bits <<= self._offset - _ordinal.to_ordinal(year, month, 1)
+        length = bits.bit_length()
+        data = bits.to_bytes((length + 7) // 8, 'little')
+        position = 0
+        while position < length:
+            n_days = _ordinal.days_in_month(year, month)
+            chunk = int.from_bytes(data[position >> 3:(position + n_days + 7) >> 3], 'little')
+            count = _bit_count((chunk >> (position & 7)) & ((1 << n_days) - 1))
+            if count:
+                result[(year, month)] = count
+            position += n_days
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return result
+
+
+def _normalized(offset, bits):
+    """Move the offset on the lowest member so the int stays small."""
+    if not bits:
+        return 0, 0
+    low = (bits & -bits).bit_length() - 1
+    return offset + low, bits >> low
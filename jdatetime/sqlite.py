@@ -0,0 +1,153 @@
+"""sqlite3 adapters and converters for Jalali dates and datetimes.
+
+:func:`register` makes ``sqlite3`` store ``jdatetime.date`` and
+``datetime`` parameters in one of three forms:
+
+- ``'jalali'``: Jalali ISO text, ``1402-08-15`` and ``1402-08-15T12:30:00``
+- ``'gregorian'``: Gregorian ISO text, like the adapters of ``datetime``
+- ``'integer'``: the day number of dates and the microsecond key of
+  datetimes (in UTC for aware ones), see ``sort_key()``
+
+Dates and naive datetimes sort like the values in all three forms.
+Aware datetimes keep their offset in the text forms, which sort by wall
+time and not by instant; store them as ``'integer'``, or convert them to
+a single zone first, when ``ORDER BY`` and range queries must follow the
+instants.
+
+Columns declared as ``JDATE`` or ``JDATETIME`` are read back as Jalali
+values on connections opened with ``detect_types=sqlite3.PARSE_DECLTYPES``:
+
+    >>> import sqlite3, jdatetime
+    >>> from jdatetime import sqlite
+    >>> sqlite.register('jalali')
+    >>> db = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES)
+    >>> _ = db.execute('CREATE TABLE events (day JDATE)')
+    >>> _ = db.execute('INSERT INTO events VALUES (?)', (jdatetime.date(1402, 8, 15),))
+    >>> db.execute('SELECT day FROM events').fetchall()
+    [(jdatetime.date(1402, 8, 15),)]
+
+Without declared types, :func:`convert_columns` converts the columns of a
+fetched result set one column at a time, with one decoder per column.
+"""
+import datetime as py_datetime
+import sqlite3
+
+import jdatetime
+
+from . import _ordinal
+from .batch import StreamConverter
+from .json import format_value, parse_value
+
+STORAGES = ('jalali', 'gregorian', 'integer')
+
+
+def _check_storage(storage):
+    if storage not in STORAGES:
+        raise ValueError(f"storage must be one of {', '.join(STORAGES)}: {storage!r}")
+
+
+def _adapters(storage):
+    """Return the (date adapter, datetime adapter) of a storage."""
+    if storage == 'jalali':
+        return format_value, format_value
+    if storage == 'gregorian':
+        return (lambda d: d.togregorian().isoformat()), (lambda dt: dt.togregorian().isoformat(' '))
+    return jdatetime.date.sort_key, jdatetime.datetime.sort_key
+
+
+def _parse_jalali(kind):
+    def parse(text):
+        value = parse_value(text)
+        if type(value) is not kind:
+            raise ValueError(f"Invalid Jalali isoformat string: {text!r}")
+        return value
+    return parse
+
+
+def decoder(kind, storage):
+    """Return a function converting stored values of a storage to
+    ``jdatetime.date`` (``kind='date'``) or ``jdatetime.datetime``
+    (``kind='datetime'``), keeping None.
+
+    Gregorian values are wrapped without computing their Jalali fields
+    until they are used, like ``fromgregorian()``. A value equal to the
+    previous one gives the previous result, and integer datetimes keep a
+    StreamConverter, so that sorted columns, where days repeat, are cheap.
+    The function can be shared between threads.
+    """
+    _check_storage(storage)
+    if kind not in ('date', 'datetime'):
+        raise ValueError(f"kind must be 'date' or 'datetime': {kind!r}")
+    if storage == 'jalali':
+        parse = _parse_jalali(jdatetime.datetime if kind == 'datetime' else jdatetime.date)
+    elif storage == 'gregorian':
+        if kind == 'date':
+            fromisoformat, wrap = py_datetime.date.fromisoformat, jdatetime.date._from_gregorian
+        else:
+            fromisoformat, wrap = py_datetime.datetime.fromisoformat, jdatetime.datetime._from_gregorian
+
+        def parse(text):
+            return wrap(fromisoformat(text))
+    elif kind == 'date':
+        def parse(n):
+            gregorian = py_datetime.date.fromordinal(int(n) + _ordinal.GREGORIAN_OFFSET)
+            return jdatetime.date._from_gregorian(gregorian)
+    else:
+        converter = StreamConverter()
+
+        def parse(key):
+            n, hour, minute, second, microsecond = _ordinal.from_key(int(key))
+            fields = converter.jalali_fields(n + _ordinal.GREGORIAN_OFFSET)
+            return jdatetime.datetime(*fields, hour, minute, second, microsecond)
+
+    # (stored value, result) as one tuple, so threads never see a torn pair
+    last = [(None, None)]
+
+    def decode(value):
+        if value is None:
+            return None
+        previous, result = last[0]
+        if value == previous:
+            return result
+        result = parse(value.decode() if isinstance(value, bytes) else value)
+        last[0] = (value, result)
+        return result
+    return decode
+
+
+def register(storage='jalali'):
+    """Register the sqlite3 adapters of ``jdatetime.date`` and
+    ``datetime`` for ``storage``, and the converters of the JDATE and
+    JDATETIME declared types. Replaces a previous registration."""
+    _check_storage(storage)
+    date_adapter, datetime_adapter = _adapters(storage)
+    sqlite3.register_adapter(jdatetime.date, date_adapter)
+    sqlite3.register_adapter(jdatetime.datetime, datetime_adapter)
+    sqlite3.register_converter('JDATE', decoder('date', storage))
+    sqlite3.register_converter('JDATETIME', decoder('datetime', storage))
+
+
+def unregister():
+    """Remove the adapters and converters installed by :func:`register`."""
+    for kind in (jdatetime.date, jdatetime.datetime):
+        sqlite3.adapters.pop((kind, sqlite3.PrepareProtocol), None)
+    for name in ('JDATE', 'JDATETIME'):
+        sqlite3.converters.pop(name, None)
+
+
+def convert_columns(rows, columns, storage='jalali'):
+    """Return the rows of a result set, such as ``cursor.fetchall()``, as a
+    list of tuples with some columns converted to Jalali values.
+
+    columns: {column position: 'date' or 'datetime'}
+    storage: how the columns were stored, see :func:`register`. With
+        'gregorian', plain SQLite dates and timestamps of other
+        applications are converted.
+    """
+    decoders = {position: decoder(kind, storage) for position, kind in columns.items()}
+    if not rows:
+        return []
+    transposed = [list(column) for column in zip(*rows)]
+    for position, decode in decoders.items():
+        transposed[position] = list(map(decode, transposed[position]))
+    return list(zip(*transposed))
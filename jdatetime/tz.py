@@ -0,0 +1,260 @@
+"""Built-in Asia/Tehran time zone.
+
+:data:`TEHRAN` follows the tz database rules for Asia/Tehran (tzdata
+2025b), including the DST periods up to 1401 and the +04 era of
+1356-1357, without needing the system zone files. Transitions are kept as
+sorted UTC and wall-time seconds so offset lookups are a bisect, and wall
+times of ``jdatetime.datetime`` values are read from their Jalali fields.
+
+    >>> import datetime, jdatetime
+    >>> from jdatetime.tz import TEHRAN
+    >>> summer = jdatetime.datetime(1400, 5, 1, 12, 0, tzinfo=TEHRAN)
+    >>> summer.utcoffset(), summer.tzname()
+    (datetime.timedelta(seconds=16200), '+0430')
+    >>> summer.astimezone(datetime.timezone.utc)
+    jdatetime.datetime(1400, 5, 1, 7, 30, 0, 0, tzinfo=UTC)
+
+:func:`fromepochs` and :func:`toepochs` apply the same tables to whole
+arrays of POSIX times and local wall times:
+
+    >>> from jdatetime.tz import fromepochs, toepochs
+    >>> local, folds = fromepochs([1663785000, 1663788600])
+    >>> list(local), list(folds)
+    ([jdatetime.datetime(1401, 6, 30, 23, 0), jdatetime.datetime(1401, 6, 30, 23, 0)], [0, 1])
+    >>> toepochs(local, fold=folds)
+    (array('q', [1663785000, 1663788600]), array('q'))
+"""
+import datetime as py_datetime
+from array import array
+from bisect import bisect_right
+
+import jdatetime
+
+from . import _convert, _ordinal
+from .arrays import JDatetimeArray
+
+_LMT = 12344
+_IRST = 12600
+_IRDT = 16200
+
+# Transitions before the regular DST rule: Jalali wall time at which the
+# transition happens (in the offset in force before it), then the UTC
+# offset, DST and name in force after it.
+_IRREGULAR_TRANSITIONS = (
+    ((1294, 10, 10, 0), _LMT, 0, 'TMT'),
+    ((1314, 3, 22, 0), _IRST, 0, '+0330'),
+    ((1356, 1, 1, 23), _IRDT, 3600, '+0430'),
+    ((1356, 7, 29, 0), 14400, 0, '+04'),
+    ((1357, 1, 5, 0), 18000, 3600, '+05'),
+    ((1357, 5, 14, 1), 14400, 0, '+04'),
+    ((1357, 8, 20, 0), _IRST, 0, '+0330'),
+    ((1358, 3, 6, 0), _IRDT, 3600, '+0430'),
+    ((1358, 6, 28, 0), _IRST, 0, '+0330'),
+    ((1359, 1, 1, 0), _IRDT, 3600, '+0430'),
+    ((1359, 7, 1, 0), _IRST, 0, '+0330'),
+    ((1370, 2, 13, 0), _IRDT, 3600, '+0430'),
+    ((1370, 6, 31, 0), _IRST, 0, '+0330'),
+)
+
+# Years of the regular rule: DST from Farvardin 2 00:00 to Shahrivar 31
+# 00:00, abolished after 1401.
+_DST_YEARS = tuple(range(1371, 1385)) + tuple(range(1387, 1402))
+
+
+def _wall_seconds(year, month, day, hour):
+    return (_ordinal.to_ordinal(year, month, day) - _ordinal.UNIX_EPOCH) * 86400 + hour * 3600
+
+
+def _build_tables():
+    """Return (UTC transition seconds, wall seconds for fold=0, wall seconds
+    for fold=1, ttinfos); ttinfos[i] is in force after i transitions."""
+    transitions = list(_IRREGULAR_TRANSITIONS)
+    for year in _DST_YEARS:
+        transitions.append(((year, 1, 2, 0), _IRDT, 3600, '+0430'))
+        transitions.append(((year, 6, 31, 0), _IRST, 0, '+0330'))
+
+    ttinfos = [(py_datetime.timedelta(seconds=_LMT), py_datetime.timedelta(0), 'LMT')]
+    utc, wall_fold0, wall_fold1 = [], [], []
+    before = _LMT
+    for fields, offset, dst, name in transitions:
+        t = _wall_seconds(*fields) - before
+        utc.append(t)
+        # Like zoneinfo: with fold=0 gaps and repeated wall times resolve to
+        # the offset before the transition, with fold=1 to the one after.
+        wall_fold0.append(t + max(before, offset))
+        wall_fold1.append(t + min(before, offset))
+        ttinfos.append((py_datetime.timedelta(seconds=offset), py_datetime.timedelta(seconds=dst), name))
+        before = offset
+    return tuple(utc), (tuple(wall_fold0), tuple(wall_fold1)), tuple(ttinfos)
+
+
+_UTC_TRANSITIONS, _WALL_TRANSITIONS, _TTINFOS = _build_tables()
+_LAST_WALL_TRANSITION = _WALL_TRANSITIONS[0][-1]
+_OFFSETS_US = tuple(ttinfo[0] // _ordinal.ONE_US for ttinfo in _TTINFOS)
+
+
+_GREGORIAN_EPOCH = _ordinal.UNIX_EPOCH + _ordinal.GREGORIAN_OFFSET
+
+
+def _local_seconds(dt):
+    """Seconds from 1970-01-01 to the wall time of a datetime.datetime or
+    jdatetime.datetime, ignoring its tzinfo."""
+    if isinstance(dt, jdatetime.date):
+        days = dt.toordinal() - _ordinal.UNIX_EPOCH
+    else:
+        days = dt.toordinal() - _GREGORIAN_EPOCH
+    return days * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+class TehranTimezone(py_datetime.tzinfo):
+    """Asia/Tehran rules as a tzinfo; use the :data:`TEHRAN` instance.
+
+    Accepts both ``datetime.datetime`` and ``jdatetime.datetime`` values.
+    """
+
+    def _ttinfo(self, dt):
+        ts = _local_seconds(dt)
+        if ts >= _LAST_WALL_TRANSITION:
+            return _TTINFOS[-1]
+        return _TTINFOS[bisect_right(_WALL_TRANSITIONS[dt.fold], ts)]
+
+    def utcoffset(self, dt):
+        if dt is None:
+            return None
+        return self._ttinfo(dt)[0]
+
+    def dst(self, dt):
+        if dt is None:
+            return None
+        return self._ttinfo(dt)[1]
+
+    def tzname(self, dt):
+        if dt is None:
+            return None
+        return self._ttinfo(dt)[2]
+
+    def fromutc(self, dt):
+        """UTC wall time in ``dt`` -> Tehran wall time, with fold=1 on the
+        second occurrence of repeated wall times."""
+        if not isinstance(dt, py_datetime.datetime):
+            raise TypeError("fromutc() requires a datetime argument")
+        if dt.tzinfo is not self:
+            raise ValueError("dt.tzinfo is not self")
+        ts = _local_seconds(dt)
+        i = bisect_right(_UTC_TRANSITIONS, ts)
+        offset = _TTINFOS[i][0]
+        result = dt + offset
+        if i and ts < _UTC_TRANSITIONS[i - 1] + (_TTINFOS[i - 1][0] - offset).total_seconds():
+            result = result.replace(fold=1)
+        return result
+
+    def __repr__(self):
+        return 'jdatetime.tz.TEHRAN'
+
+    def __str__(self):
+        return 'Asia/Tehran'
+
+    def __reduce__(self):
+        return 'TEHRAN'
+
+
+TEHRAN = TehranTimezone()
+
+_EPOCH_KEY = _ordinal.UNIX_EPOCH * _ordinal.US_PER_DAY
+_EPOCH = py_datetime.datetime(1970, 1, 1, tzinfo=py_datetime.timezone.utc)
+_UNITS = {'s': _ordinal.US_PER_SECOND, 'ms': 1000, 'us': 1}
+
+
+def _tables(tz):
+    """Return the (UTC transitions, wall transitions, offsets in
+    microseconds) of ``tz``, or None when it has no known tables."""
+    if isinstance(tz, TehranTimezone):
+        return _UTC_TRANSITIONS, _WALL_TRANSITIONS, _OFFSETS_US
+    if isinstance(tz, py_datetime.timezone):
+        return (), ((), ()), (tz.utcoffset(None) // _ordinal.ONE_US,)
+    return None
+
+
+def _unit_factor(unit):
+    try:
+        return _UNITS[unit]
+    except KeyError:
+        raise ValueError(f"unit must be one of {', '.join(_UNITS)}: {unit!r}")
+
+
+def fromepochs(epochs, tz=TEHRAN, unit='s'):
+    """Convert POSIX times to wall times in ``tz``.
+
+    Returns a ``JDatetimeArray`` of the local wall times and an array('b')
+    of their fold flags, 1 for the second occurrence of a repeated wall
+    time. ``unit`` is the unit of ``epochs``: 's', 'ms' or 'us'; float
+    epochs, such as ``time.time()``, are rounded to the microsecond.
+    ``tz`` is :data:`TEHRAN` or a ``datetime.timezone``; other tzinfos
+    are converted one value at a time.
+    """
+    factor = _unit_factor(unit)
+    keys, folds = array('q'), array('b')
+    tables = _tables(tz)
+    if tables is None:
+        for epoch in epochs:
+            local = (_EPOCH + _ordinal.timestamp_to_us(epoch, factor) * _ordinal.ONE_US).astimezone(tz)
+            keys.append(_convert.wall_key(local))
+            folds.append(local.fold)
+        return JDatetimeArray.from_keys(keys), folds
+
+    utc_transitions, _, offsets = tables
+    us_per_second = _ordinal.US_PER_SECOND
+    for epoch in epochs:
+        us = epoch * factor if type(epoch) is int else _ordinal.timestamp_to_us(epoch, factor)
+        ts = us // us_per_second
+        i = bisect_right(utc_transitions, ts)
+        offset = offsets[i]
+        keys.append(us + offset + _EPOCH_KEY)
+        # Within the repeated hour after a backward transition
+        folds.append(i > 0 and ts < utc_transitions[i - 1] + (offsets[i - 1] - offset) // us_per_second)
+    return JDatetimeArray.from_keys(keys), folds
+
+
+def toepochs(values, tz=TEHRAN, fold=0, unit='s'):
+    """Convert wall times in ``tz`` to POSIX times.
+
+    values: a ``JDatetimeArray`` or an iterable of ``jdatetime.datetime``,
+        ``datetime.datetime`` or Jalali ISO strings, read as wall times
+        whatever their tzinfo.
+    fold: 0, 1 or a sequence of fold flags, such as the one returned by
+        :func:`fromepochs`.
+
+    Returns an array('q') of the epochs in ``unit`` (floored) and an
+    array('q') of the positions of the wall times that do not exist in
+    ``tz``, skipped by a forward transition. Those are converted like
+    ``datetime`` does, with the offset selected by their fold.
+    """
+    factor = _unit_factor(unit)
+    if isinstance(values, JDatetimeArray):
+        keys = values.keys
+    else:
+        keys = array('q', map(_convert.wall_key, values))
+    folds = [fold] * len(keys) if isinstance(fold, int) else fold
+    if len(folds) != len(keys):
+        raise ValueError("fold must be an int or have one flag per value")
+
+    epochs, nonexistent = array('q'), array('q')
+    tables = _tables(tz)
+    us_per_second = _ordinal.US_PER_SECOND
+    for position, (key, f) in enumerate(zip(keys, folds)):
+        local_us = key - _EPOCH_KEY
+        if tables is None:
+            n, hour, minute, second, microsecond = _ordinal.from_key(key)
+            wall = jdatetime.datetime(*_ordinal.from_ordinal(n), hour, minute, second, microsecond)
+            wall = wall.togregorian().replace(tzinfo=tz, fold=f)
+            us = local_us - wall.utcoffset() // _ordinal.ONE_US
+            exists = (_EPOCH + us * _ordinal.ONE_US).astimezone(tz).replace(fold=f) == wall
+        else:
+            utc_transitions, wall_transitions, offsets = tables
+            i = bisect_right(wall_transitions[f], local_us // us_per_second)
+            us = local_us - offsets[i]
+            exists = offsets[bisect_right(utc_transitions, us // us_per_second)] == offsets[i]
+        if not exists:
+            nonexistent.append(position)
+        epochs.append(us // factor)
+    return epochs, nonexistent
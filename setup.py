@@ -16,6 +16,7 @@ setup(
     long_description=open('README').read(),
     python_requires=">=3.9",
     install_requires=["jalali-core>=1.0"],
+    extras_require={"arrow": ["pyarrow"]},
     classifiers=[
         "Intended Audience :: Developers",
         "Intended Audience :: System Administrators",
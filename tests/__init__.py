@@ -1,8 +1,22 @@
+import datetime
 import pathlib
 import pickle
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 
 def load_pickle(filename):
     pickle_path = pathlib.Path(__file__).parent / 'pickled_objects' / filename
     with pickle_path.open('rb') as f:
         return pickle.load(f)
+
+
+def tehran_zoneinfo():
+    """Return ZoneInfo('Asia/Tehran') if the system has it with the rules
+    of tzdata 2022b or later (no DST from 1402), None otherwise."""
+    try:
+        zone = ZoneInfo('Asia/Tehran')
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+    if zone.utcoffset(datetime.datetime(2023, 7, 1)) != datetime.timedelta(hours=3, minutes=30):
+        return None
+    return zone
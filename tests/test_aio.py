@@ -0,0 +1,102 @@
+import asyncio
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import jdatetime
+from jdatetime.aio import convert_batch, fromgregorian_stream
+
+
+async def aiterate(items, delay=0):
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+
+async def collect(stream):
+    return [item async for item in stream]
+
+
+class TestFromGregorianStream(IsolatedAsyncioTestCase):
+    def setUp(self):
+        start = datetime.datetime(2024, 3, 1, 12, 30, tzinfo=datetime.timezone.utc)
+        self.values = [start + datetime.timedelta(hours=13 * i) for i in range(250)]
+        self.expected = [jdatetime.datetime.fromgregorian(datetime=value) for value in self.values]
+
+    async def test_values(self):
+        result = await collect(fromgregorian_stream(aiterate(self.values), batch_size=16))
+        self.assertEqual(result, self.expected)
+        self.assertTrue(all(r.tzinfo is datetime.timezone.utc for r in result))
+
+    async def test_records(self):
+        records = [{'id': i, 'created': value, 'day': value.date()} for i, value in enumerate(self.values)]
+        records[3]['created'] = None
+        result = await collect(fromgregorian_stream(aiterate(records), fields=['created', 'day', 'missing']))
+        self.assertEqual([r['id'] for r in result], list(range(250)))
+        self.assertIsNone(result[3]['created'])
+        self.assertEqual([r['created'] for r in result[4:]], self.expected[4:])
+        self.assertEqual([r['day'] for r in result], [e.date() for e in self.expected])
+        self.assertIsInstance(records[0]['created'], datetime.datetime)
+
+    async def test_timestamps(self):
+        timestamps = [value.timestamp() for value in self.values]
+        result = await collect(fromgregorian_stream(aiterate(timestamps), tz=datetime.timezone.utc))
+        self.assertEqual(result, self.expected)
+
+    async def test_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            stream = fromgregorian_stream(aiterate(self.values), batch_size=7, executor=executor)
+            result = await collect(stream)
+        self.assertEqual(result, self.expected)
+
+    async def test_executor_uses_context_locale(self):
+        with ThreadPoolExecutor(2) as executor, jdatetime.locale_context('nl_NL'):
+            for pool in (None, executor):
+                stream = fromgregorian_stream(aiterate(self.values[:20]), batch_size=7, executor=pool)
+                self.assertEqual({r.locale for r in await collect(stream)}, {'nl_NL'})
+            stream = fromgregorian_stream(aiterate(self.values[:5]), executor=executor, locale='fa_IR')
+            self.assertEqual({r.locale for r in await collect(stream)}, {'fa_IR'})
+
+    async def test_max_delay_flushes_partial_batches(self):
+        received = []
+
+        async def source():
+            for value in self.values[:3]:
+                yield value
+            # Only continue once the first items have been delivered
+            while len(received) < 3:
+                await asyncio.sleep(0.01)
+            yield self.values[3]
+
+        stream = fromgregorian_stream(source(), batch_size=100, max_delay=0.02)
+        async for item in stream:
+            received.append(item)
+        self.assertEqual(received, self.expected[:4])
+
+    async def test_reads_on_demand(self):
+        read = []
+
+        async def source():
+            for value in self.values:
+                read.append(value)
+                yield value
+
+        stream = fromgregorian_stream(source(), batch_size=10)
+        self.assertEqual(await stream.__anext__(), self.expected[0])
+        self.assertEqual(len(read), 10)
+        await stream.aclose()
+
+    async def test_source_errors_propagate(self):
+        async def source():
+            yield self.values[0]
+            raise OSError('connection lost')
+
+        with self.assertRaises(OSError):
+            await collect(fromgregorian_stream(source(), max_delay=1))
+
+
+class TestConvertBatch(TestCase):
+    def test_dates_and_locale(self):
+        result = convert_batch([datetime.date(2024, 3, 20), None], locale='fa_IR')
+        self.assertEqual(result, [jdatetime.date(1403, 1, 1, locale='fa_IR'), None])
+        self.assertEqual(result[0].locale, 'fa_IR')
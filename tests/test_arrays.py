@@ -0,0 +1,123 @@
+import datetime
+import sys
+from array import array
+from unittest import TestCase, skipIf
+
+import jdatetime
+from jdatetime.arrays import JDateArray, JDatetimeArray
+
+
+class TestJDateArray(TestCase):
+    def setUp(self):
+        start = jdatetime.date(1402, 12, 1)
+        self.dates = [start + datetime.timedelta(days=(i * 7) % 45) for i in range(100)]
+        self.array = JDateArray(self.dates)
+
+    def test_elements(self):
+        self.assertEqual(len(self.array), 100)
+        self.assertEqual(self.array[3], self.dates[3])
+        self.assertEqual(self.array[-1], self.dates[-1])
+        self.assertEqual(list(self.array), self.dates)
+        self.assertEqual(list(self.array[10:20]), self.dates[10:20])
+
+    def test_mixed_inputs(self):
+        dates = JDateArray([jdatetime.date(1402, 1, 1), datetime.date(2023, 3, 22), '1402-01-03'])
+        self.assertEqual(list(dates.day), [1, 2, 3])
+
+    def test_fields(self):
+        self.assertEqual(list(self.array.year), [d.year for d in self.dates])
+        self.assertEqual(list(self.array.month), [d.month for d in self.dates])
+        self.assertEqual(list(self.array.day), [d.day for d in self.dates])
+        self.assertEqual(list(self.array.weekday), [d.weekday() for d in self.dates])
+
+    def test_sort_unique_searchsorted(self):
+        self.assertEqual([self.dates[i] for i in self.array.argsort()], sorted(self.dates))
+        self.array.sort()
+        self.assertEqual(list(self.array), sorted(self.dates))
+        unique = self.array.unique()
+        self.assertEqual(list(unique), sorted(set(self.dates), key=lambda d: d.toordinal()))
+        self.assertEqual(unique.searchsorted(jdatetime.date(1403, 1, 1)), 29)
+        self.assertEqual(unique.searchsorted(jdatetime.date(1403, 1, 1), side='right'), 30)
+
+    def test_timedelta_arithmetic(self):
+        delta = datetime.timedelta(days=40)
+        self.assertEqual(list(self.array + delta), [d + delta for d in self.dates])
+        self.assertEqual(list(delta + self.array), [d + delta for d in self.dates])
+        self.assertEqual(list(self.array - delta), [d - delta for d in self.dates])
+        shifted = self.array + delta
+        self.assertEqual(list(shifted - self.array), [40] * 100)
+        with self.assertRaises(TypeError):
+            self.array + 1
+
+    def test_zero_copy_ordinals(self):
+        ordinals = array('i', [d.toordinal() for d in self.dates])
+        dates = JDateArray.from_ordinals(ordinals)
+        self.assertEqual(dates, self.array)
+        view = dates.ordinals
+        self.assertEqual(view.format, 'i')
+        view[0] += 1
+        self.assertEqual(dates[0], self.dates[0] + datetime.timedelta(days=1))
+
+    @skipIf(sys.version_info < (3, 12), "buffer protocol for python classes needs python 3.12")
+    def test_buffer_protocol(self):
+        view = memoryview(self.array)
+        self.assertEqual(view.tolist(), [d.toordinal() for d in self.dates])
+
+    def test_bytes_codec(self):
+        data = self.array.to_bytes()
+        self.assertEqual(len(data), 400)
+        records = [data[i:i + 4] for i in range(0, len(data), 4)]
+        self.assertEqual(records, [d.to_bytes() for d in self.dates])
+        self.assertEqual(sorted(records), [d.to_bytes() for d in sorted(self.dates)])
+        self.assertEqual(JDateArray.from_bytes(memoryview(data)), self.array)
+        with self.assertRaises(ValueError):
+            JDateArray.from_bytes(data[:-1])
+
+
+class TestJDatetimeArray(TestCase):
+    def setUp(self):
+        start = jdatetime.datetime(1402, 12, 28, 22, 0)
+        self.datetimes = [start + datetime.timedelta(minutes=97 * i, microseconds=i) for i in range(100)]
+        self.array = JDatetimeArray(self.datetimes)
+
+    def test_elements_and_fields(self):
+        self.assertEqual(list(self.array), self.datetimes)
+        for field in ('year', 'month', 'day', 'hour', 'minute', 'second', 'microsecond'):
+            expected = [getattr(d, field) for d in self.datetimes]
+            self.assertEqual(list(getattr(self.array, field)), expected)
+        self.assertEqual(list(self.array.weekday), [d.weekday() for d in self.datetimes])
+        self.assertEqual(list(self.array.date()), [d.date() for d in self.datetimes])
+
+    def test_timedelta_arithmetic(self):
+        delta = datetime.timedelta(hours=5, microseconds=3)
+        self.assertEqual(list(self.array + delta), [d + delta for d in self.datetimes])
+        self.assertEqual(list(self.array - delta), [d - delta for d in self.datetimes])
+        differences = self.array - (self.array - delta)
+        self.assertEqual(set(differences), {delta // datetime.timedelta(microseconds=1)})
+
+    def test_naive_and_aware_are_not_mixed(self):
+        utc = datetime.timezone.utc
+        with self.assertRaises(TypeError):
+            JDatetimeArray([self.datetimes[0], self.datetimes[1].replace(tzinfo=utc)])
+        with self.assertRaises(TypeError):
+            self.array[10:].searchsorted(self.datetimes[50].replace(tzinfo=utc))
+        aware = JDatetimeArray([d.replace(tzinfo=utc) for d in self.datetimes])
+        self.assertEqual(aware.keys, self.array.keys)
+        self.assertEqual(aware.searchsorted(self.datetimes[50].replace(tzinfo=utc)), 50)
+        with self.assertRaises(TypeError):
+            (aware + datetime.timedelta(hours=1)).searchsorted(self.datetimes[50])
+        with self.assertRaises(TypeError):
+            aware - self.array
+        self.assertEqual(set(aware - JDatetimeArray.from_keys(self.array.keys)), {0})
+
+    def test_from_keys(self):
+        keys = array('q', self.array.keys)
+        self.assertEqual(JDatetimeArray.from_keys(keys), self.array)
+        self.assertEqual(JDatetimeArray.from_keys(list(keys)), self.array)
+
+    def test_bytes_codec(self):
+        data = self.array.to_bytes()
+        records = [data[i:i + 8] for i in range(0, len(data), 8)]
+        self.assertEqual(records, [d.to_bytes() for d in self.datetimes])
+        self.assertEqual(JDatetimeArray.from_bytes(bytearray(data)), self.array)
+        self.assertEqual(list(self.array.keys), list(JDatetimeArray(self.datetimes).keys))
@@ -0,0 +1,107 @@
+import datetime
+import random
+from unittest import TestCase, skipIf
+
+import jdatetime
+from jdatetime.arrays import JDateArray, JDatetimeArray
+
+try:
+    import pyarrow as pa
+
+    from jdatetime import arrow
+except ImportError:
+    pa = None
+
+
+@skipIf(pa is None, 'pyarrow is not installed')
+class TestArrowDates(TestCase):
+    def setUp(self):
+        rng = random.Random(49)
+        # Whole range of jdatetime, and both sides of a 33 year cycle
+        self.dates = [datetime.date(622, 3, 22), datetime.date(9999, 3, 20)] + [
+            datetime.date.fromordinal(rng.randrange(226895, 3651773)) for _ in range(3000)
+        ] + [datetime.date(2024, 3, 19) + datetime.timedelta(days=i) for i in range(400)]
+        self.array = pa.array(self.dates, pa.date32())
+
+    def test_to_jalali(self):
+        rows = arrow.to_jalali(self.array).to_pylist()
+        for gregorian, row in zip(self.dates, rows):
+            expected = jdatetime.date.fromgregorian(date=gregorian)
+            self.assertEqual(row, {'year': expected.year, 'month': expected.month, 'day': expected.day})
+
+    def test_round_trip(self):
+        self.assertTrue(arrow.from_jalali(arrow.to_jalali(self.array)).equals(self.array))
+
+    def test_date64_nulls_and_chunks(self):
+        values = pa.chunked_array([
+            pa.array([datetime.date(2024, 3, 20), None], pa.date64()),
+            pa.array([datetime.date(2023, 3, 20)], pa.date64()),
+        ])
+        result = arrow.to_jalali(values)
+        self.assertIsInstance(result, pa.ChunkedArray)
+        self.assertEqual(result.to_pylist(), [
+            {'year': 1403, 'month': 1, 'day': 1}, None, {'year': 1401, 'month': 12, 'day': 29},
+        ])
+        self.assertEqual(
+            arrow.from_jalali(result).to_pylist(),
+            [datetime.date(2024, 3, 20), None, datetime.date(2023, 3, 20)],
+        )
+
+    def test_jdatearray(self):
+        dates = arrow.to_jdatearray(self.array[1:50])
+        self.assertEqual(dates, JDateArray(self.dates[1:50]))
+        self.assertTrue(arrow.from_jdatearray(dates).equals(self.array[1:50]))
+        with self.assertRaises(ValueError):
+            arrow.to_jdatearray(pa.array([None, datetime.date(2024, 1, 1)]))
+
+    def test_invalid_type(self):
+        with self.assertRaises(TypeError):
+            arrow.to_jalali(pa.array([1, 2]))
+
+
+@skipIf(pa is None, 'pyarrow is not installed')
+class TestArrowTimestamps(TestCase):
+    def setUp(self):
+        rng = random.Random(49)
+        epoch = datetime.datetime(1970, 1, 1)
+        self.datetimes = [
+            epoch + datetime.timedelta(microseconds=rng.randrange(-9 * 10 ** 15, 9 * 10 ** 15))
+            for _ in range(2000)
+        ]
+
+    def test_to_jalali_all_units(self):
+        for unit in ('s', 'ms', 'us', 'ns'):
+            values = pa.array(self.datetimes, pa.timestamp('us')).cast(pa.timestamp(unit), safe=False)
+            rows = arrow.to_jalali(values).to_pylist()
+            for gregorian, row in zip(values.to_pylist(), rows):
+                expected = jdatetime.datetime.fromgregorian(datetime=gregorian)
+                self.assertEqual(row, {
+                    'year': expected.year,
+                    'month': expected.month,
+                    'day': expected.day,
+                    'hour': expected.hour,
+                    'minute': expected.minute,
+                    'second': expected.second,
+                    'microsecond': expected.microsecond,
+                })
+            round_trip = arrow.from_jalali(arrow.to_jalali(values))
+            self.assertTrue(round_trip.equals(values.cast(pa.timestamp('us'))))
+
+    def test_aware_timestamps_give_wall_time(self):
+        utc = datetime.datetime(2022, 9, 21, 19, 0, tzinfo=datetime.timezone.utc)
+        values = pa.array([utc], pa.timestamp('s', tz='+03:30'))
+        self.assertEqual(arrow.to_jalali(values).to_pylist()[0]['hour'], 22)
+        self.assertEqual(arrow.to_jalali(values).to_pylist()[0]['minute'], 30)
+
+    def test_from_jalali_without_time_fields(self):
+        fields = pa.array(
+            [{'year': 1403, 'month': 1, 'day': 1, 'hour': 12}],
+            pa.struct([('year', pa.int16()), ('month', pa.int8()), ('day', pa.int8()), ('hour', pa.int8())]),
+        )
+        self.assertEqual(arrow.from_jalali(fields).to_pylist(), [datetime.datetime(2024, 3, 20, 12)])
+
+    def test_jdatetimearray(self):
+        values = pa.array(self.datetimes, pa.timestamp('us'))
+        datetimes = arrow.to_jdatetimearray(values)
+        self.assertEqual(datetimes, JDatetimeArray(self.datetimes))
+        self.assertTrue(arrow.from_jdatetimearray(datetimes).equals(values))
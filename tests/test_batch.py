@@ -0,0 +1,130 @@
+import datetime
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+import jdatetime
+from jdatetime import batch
+from jdatetime.tz import fromepochs
+
+
+class TestSort(TestCase):
+    def setUp(self):
+        rng = random.Random(33)
+        start = jdatetime.datetime(1400, 1, 1)
+        self.values = [
+            start + datetime.timedelta(seconds=rng.randrange(10 ** 8), microseconds=rng.randrange(10 ** 6))
+            for _ in range(500)
+        ]
+
+    def test_sort_keys_order_like_values(self):
+        keys = batch.sort_keys(self.values)
+        self.assertEqual(list(keys), [v.sort_key() for v in self.values])
+
+    def test_sort(self):
+        self.assertEqual(batch.sort(self.values), sorted(self.values))
+        self.assertEqual(batch.sort(self.values, reverse=True), sorted(self.values, reverse=True))
+
+    def test_argsort_is_stable(self):
+        values = [jdatetime.date(1402, 1, 2), jdatetime.date(1402, 1, 1), jdatetime.date(1402, 1, 2)]
+        self.assertEqual(list(batch.argsort(values)), [1, 0, 2])
+
+    def test_mixed_inputs(self):
+        values = [
+            '1402-01-01T10:00:00',
+            jdatetime.date(1402, 1, 1),
+            datetime.datetime(2023, 3, 21, 9, 0),
+            jdatetime.datetime(1401, 12, 29, 23, 0),
+        ]
+        self.assertEqual(list(batch.argsort(values)), [3, 1, 2, 0])
+
+    def test_naive_and_aware_are_not_mixed(self):
+        tehran = datetime.timezone(datetime.timedelta(hours=3, minutes=30))
+        values = [jdatetime.datetime(1402, 1, 1, 8, tzinfo=tehran), jdatetime.datetime(1402, 1, 1, 6)]
+        with self.assertRaises(TypeError):
+            sorted(values)
+        for function in (batch.sort_keys, batch.argsort, batch.sort):
+            with self.assertRaises(TypeError):
+                function(values)
+        aware = [values[0], '1402-01-01T06:00:00+03:30', jdatetime.date(1402, 1, 1)]
+        self.assertEqual(list(batch.argsort(aware)), [2, 1, 0])
+
+
+class TestStreamConverter(TestCase):
+    def test_steps_match_fromgregorian(self):
+        rng = random.Random(34)
+        converter = batch.StreamConverter()
+        ordinal = datetime.date(2020, 1, 1).toordinal()
+        for _ in range(3000):
+            ordinal += rng.choice([0, 1, 1, 2, -1, -29, 30, 400, -1000])
+            value = datetime.date.fromordinal(ordinal)
+            self.assertEqual(converter.fromgregorian(value), jdatetime.date.fromgregorian(date=value))
+
+    def test_crosses_leap_year_end(self):
+        converter = batch.StreamConverter()
+        converter.fromgregorian(datetime.date(2025, 3, 19))
+        self.assertEqual(converter.jalali_fields(datetime.date(2025, 3, 20).toordinal()), (1403, 12, 30))
+        self.assertEqual(converter.jalali_fields(datetime.date(2025, 3, 21).toordinal()), (1404, 1, 1))
+        self.assertEqual(converter.jalali_fields(datetime.date(2025, 2, 19).toordinal()), (1403, 12, 1))
+
+    def test_datetime_keeps_time_and_tzinfo(self):
+        value = datetime.datetime(2024, 3, 20, 5, 6, 7, 8, tzinfo=datetime.timezone.utc)
+        result = batch.StreamConverter().fromgregorian(value, locale='fa_IR')
+        self.assertEqual(result, jdatetime.datetime.fromgregorian(datetime=value, locale='fa_IR'))
+        self.assertIs(result.tzinfo, datetime.timezone.utc)
+        self.assertEqual(result.locale, 'fa_IR')
+
+    def test_fromtimestamp(self):
+        rng = random.Random(34)
+        converter = batch.StreamConverter()
+        tehran = datetime.timezone(datetime.timedelta(hours=3, minutes=30))
+        timestamp = 1.7e9
+        for _ in range(2000):
+            timestamp += rng.uniform(-1000, 50000)
+            for tz in (None, datetime.timezone.utc, tehran):
+                result = converter.fromtimestamp(timestamp, tz)
+                expected = jdatetime.datetime.fromtimestamp(timestamp, tz)
+                self.assertEqual(result, expected)
+                self.assertEqual(result.microsecond, expected.microsecond)
+                self.assertIs(result.tzinfo, tz)
+
+    def test_out_of_range(self):
+        converter = batch.StreamConverter()
+        converter.fromgregorian(datetime.date(622, 3, 22))
+        with self.assertRaises(ValueError):
+            converter.jalali_fields(datetime.date(622, 3, 21).toordinal() - 2)
+
+
+class TestParallelFromEpochs(TestCase):
+    def setUp(self):
+        # Around the last DST end of Asia/Tehran, with its repeated hour
+        self.epochs = array('q', range(1663700000, 1663900000, 397))
+
+    def test_matches_fromepochs(self):
+        result = batch.parallel_fromepochs(self.epochs, max_workers=2, chunksize=100)
+        self.assertEqual(result, fromepochs(self.epochs)[0])
+
+    def test_fixed_offset_and_unit(self):
+        minus_five = datetime.timezone(datetime.timedelta(hours=-5))
+        milliseconds = [epoch * 1000 + 999 for epoch in self.epochs]
+        with ProcessPoolExecutor(2) as executor:
+            result = batch.parallel_fromepochs(milliseconds, minus_five, unit='ms', executor=executor)
+        self.assertEqual(result, fromepochs(milliseconds, minus_five, unit='ms')[0])
+
+    def test_float_epochs(self):
+        floats = [epoch + 0.25 for epoch in self.epochs[:1000]]
+        result = batch.parallel_fromepochs(floats, max_workers=2, chunksize=100)
+        self.assertEqual(result, fromepochs(floats)[0])
+        self.assertEqual(result[0].microsecond, 250000)
+
+    def test_single_worker_and_empty_input(self):
+        self.assertEqual(
+            batch.parallel_fromepochs(self.epochs, max_workers=1),
+            fromepochs(self.epochs)[0],
+        )
+        self.assertEqual(len(batch.parallel_fromepochs([], max_workers=2)), 0)
+
+    def test_invalid_unit(self):
+        with self.assertRaises(ValueError):
+            batch.parallel_fromepochs(self.epochs, unit='ns', max_workers=2)
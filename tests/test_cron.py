@@ -0,0 +1,102 @@
+import datetime
+from itertools import islice
+from unittest import TestCase, skipUnless
+
+import jdatetime
+from jdatetime.cron import CronExpression
+from tests import tehran_zoneinfo
+
+TEHRAN_ZONEINFO = tehran_zoneinfo()
+
+
+class TestCronExpression(TestCase):
+    def test_first_of_every_month(self):
+        cron = CronExpression('0 2 1 * *')
+        self.assertEqual(
+            list(islice(cron.iter_from(jdatetime.datetime(1402, 11, 1, 2, 0)), 3)),
+            [
+                jdatetime.datetime(1402, 12, 1, 2, 0),
+                jdatetime.datetime(1403, 1, 1, 2, 0),
+                jdatetime.datetime(1403, 2, 1, 2, 0),
+            ],
+        )
+
+    def test_next_after_is_strictly_after(self):
+        cron = CronExpression('*/15 * * * *')
+        self.assertEqual(
+            cron.next_after(jdatetime.datetime(1402, 1, 1, 10, 15)),
+            jdatetime.datetime(1402, 1, 1, 10, 30),
+        )
+        self.assertEqual(
+            cron.next_after(jdatetime.datetime(1402, 1, 1, 23, 50, 30)),
+            jdatetime.datetime(1402, 1, 2, 0, 0),
+        )
+
+    def test_last_day_of_month(self):
+        cron = CronExpression('30 23 L * *')
+        self.assertEqual(
+            [dt.date() for dt in islice(cron.iter_from(jdatetime.datetime(1402, 6, 1)), 8)],
+            [
+                jdatetime.date(1402, 6, 31),
+                jdatetime.date(1402, 7, 30),
+                jdatetime.date(1402, 8, 30),
+                jdatetime.date(1402, 9, 30),
+                jdatetime.date(1402, 10, 30),
+                jdatetime.date(1402, 11, 30),
+                jdatetime.date(1402, 12, 29),
+                jdatetime.date(1403, 1, 31),
+            ],
+        )
+
+    def test_month_and_weekday_names(self):
+        cron = CronExpression('0 9 * esf-esf fri')
+        fire_times = list(islice(cron.iter_from(jdatetime.datetime(1402, 1, 1)), 5))
+        self.assertTrue(all(dt.month == 12 and dt.weekday() == 6 for dt in fire_times))
+        self.assertEqual(fire_times[0].year, 1402)
+        self.assertEqual(fire_times[-1].year, 1403)
+
+    def test_day_and_weekday_are_either(self):
+        cron = CronExpression('0 0 1 * sat')
+        for dt in islice(cron.iter_from(jdatetime.datetime(1402, 1, 1)), 30):
+            self.assertTrue(dt.day == 1 or dt.weekday() == 0)
+
+    def test_matches_brute_force(self):
+        cron = CronExpression('5,35 */6 10-20/5 1,7 *')
+        start = jdatetime.datetime(1402, 1, 1)
+        expected = []
+        dt = start
+        while len(expected) < 20:
+            dt += datetime.timedelta(minutes=5)
+            if (
+                dt.minute in (5, 35) and dt.hour % 6 == 0 and
+                dt.day in (10, 15, 20) and dt.month in (1, 7)
+            ):
+                expected.append(dt)
+        self.assertEqual(list(islice(cron.iter_from(start), 20)), expected)
+
+    def test_fixed_offset_timezone(self):
+        tehran = datetime.timezone(datetime.timedelta(hours=3, minutes=30))
+        cron = CronExpression('0 2 1 * *', tz=tehran)
+        utc_dt = jdatetime.datetime(1402, 12, 29, 22, 0, tzinfo=datetime.timezone.utc)
+        fire_time = cron.next_after(utc_dt)
+        self.assertEqual(fire_time, jdatetime.datetime(1403, 1, 1, 2, 0, tzinfo=tehran))
+        self.assertEqual(fire_time.tzinfo, tehran)
+
+    @skipUnless(TEHRAN_ZONEINFO, 'Asia/Tehran with current tzdata rules is not available')
+    def test_skipped_and_repeated_wall_times(self):
+        tz = TEHRAN_ZONEINFO
+        cron = CronExpression('30 0 * * *', tz=tz)
+        fire_times = list(islice(cron.iter_from(jdatetime.datetime(1401, 1, 1, 12, 0, tzinfo=tz)), 2))
+        # 1401-01-02 00:30 does not exist, clocks went from 00:00 to 01:00
+        self.assertEqual([dt.day for dt in fire_times], [3, 4])
+
+        cron = CronExpression('30 23 * * *', tz=tz)
+        fire_times = list(islice(cron.iter_from(jdatetime.datetime(1401, 6, 30, 12, 0, tzinfo=tz)), 2))
+        # 1401-06-30 23:30 happens twice but fires once
+        self.assertEqual([dt.day for dt in fire_times], [30, 31])
+
+    def test_invalid_expressions(self):
+        for expression in ('* * * *', '60 * * * *', '* 24 * * *', '* * * 13 *', '* * * * 7',
+                           '*/0 * * * *', '* * * foo *', '0 0 31 7-12 *'):
+            with self.assertRaises(ValueError, msg=expression):
+                CronExpression(expression)
@@ -0,0 +1,145 @@
+import datetime
+import random
+import sys
+import threading
+from unittest import TestCase
+
+import jdatetime
+from jdatetime.holidays import HolidayCalendar
+
+NOWRUZ = [(1, 1), (1, 2), (1, 3), (1, 4), (1, 12), (1, 13), (3, 14), (3, 15), (11, 22), (12, 29)]
+
+
+class TestHolidayCalendar(TestCase):
+    def setUp(self):
+        self.calendar = HolidayCalendar(
+            holidays=[jdatetime.date(1402, 7, 14), '1403-02-12', datetime.date(2024, 7, 16)],
+            annual_holidays=NOWRUZ,
+        )
+
+    def brute_force_is_business_day(self, d):
+        if d.weekday() == 6 or (d.month, d.day) in NOWRUZ:
+            return False
+        return d not in (
+            jdatetime.date(1402, 7, 14),
+            jdatetime.date(1403, 2, 12),
+            jdatetime.date.fromgregorian(date=datetime.date(2024, 7, 16)),
+        )
+
+    def days(self, start, count):
+        return [start + datetime.timedelta(days=i) for i in range(count)]
+
+    def test_is_business_day(self):
+        for d in self.days(jdatetime.date(1401, 11, 1), 900):
+            self.assertEqual(self.calendar.is_business_day(d), self.brute_force_is_business_day(d), d)
+
+    def test_is_business_day_accepts_gregorian_and_ordinals(self):
+        self.assertFalse(self.calendar.is_business_day(datetime.date(2024, 3, 20)))
+        self.assertFalse(self.calendar.is_business_day(jdatetime.date(1403, 1, 1).toordinal()))
+        self.assertTrue(self.calendar.is_business_day(jdatetime.datetime(1403, 1, 5, 10, 30)))
+
+    def test_business_days_between(self):
+        start = jdatetime.date(1401, 12, 1)
+        days = self.days(start, 500)
+        expected = 0
+        for d in days:
+            self.assertEqual(self.calendar.business_days_between(start, d), expected)
+            self.assertEqual(self.calendar.business_days_between(d, start), -expected)
+            expected += self.brute_force_is_business_day(d)
+
+    def test_add_business_days(self):
+        start = jdatetime.date(1402, 12, 20)
+        business_days = [d for d in self.days(start, 400) if self.brute_force_is_business_day(d)]
+        for n, expected in enumerate(business_days):
+            self.assertEqual(self.calendar.add_business_days(start, n), expected)
+            self.assertEqual(self.calendar.add_business_days(expected, -n), start)
+
+    def test_add_business_days_rolls_forward_from_holiday(self):
+        self.assertEqual(
+            self.calendar.add_business_days(jdatetime.date(1403, 1, 1), 0),
+            jdatetime.date(1403, 1, 5),
+        )
+        self.assertEqual(
+            self.calendar.add_business_days(jdatetime.date(1403, 1, 1), -1),
+            jdatetime.date(1402, 12, 28),
+        )
+
+    def test_add_business_days_keeps_locale(self):
+        d = jdatetime.date(1402, 1, 20, locale='nl_NL')
+        self.assertEqual(self.calendar.add_business_days(d, 3).locale, 'nl_NL')
+
+    def test_add_business_days_out_of_range(self):
+        with self.assertRaises(OverflowError):
+            self.calendar.add_business_days(jdatetime.date.max, 10)
+        with self.assertRaises(OverflowError):
+            self.calendar.add_business_days(jdatetime.date.min, -10)
+
+    def test_vectorized_forms(self):
+        days = self.days(jdatetime.date(1402, 12, 1), 60)
+        ordinals = [d.toordinal() for d in days]
+        self.assertEqual(
+            list(self.calendar.is_business_day_ordinals(ordinals)),
+            [int(self.calendar.is_business_day(d)) for d in days],
+        )
+        self.assertEqual(
+            list(self.calendar.business_days_between_ordinals(ordinals[:-1], ordinals[1:])),
+            [self.calendar.business_days_between(a, b) for a, b in zip(days, days[1:])],
+        )
+        self.assertEqual(
+            list(self.calendar.add_business_days_ordinals(ordinals, 5)),
+            [self.calendar.add_business_days(d, 5).toordinal() for d in days],
+        )
+        self.assertEqual(
+            list(self.calendar.add_business_days_ordinals(ordinals, range(60))),
+            [self.calendar.add_business_days(d, i).toordinal() for i, d in enumerate(days)],
+        )
+
+    def test_shared_between_threads(self):
+        rng = random.Random(26)
+        queries = [
+            (jdatetime.date(rng.randrange(1000, 1800), rng.randrange(1, 13), rng.randrange(1, 30)),
+             rng.randrange(-2000, 2000))
+            for _ in range(400)
+        ]
+
+        def answers(calendar, queries):
+            return [
+                (calendar.is_business_day(d), calendar.add_business_days(d, n),
+                 calendar.business_days_between(d, d + datetime.timedelta(days=n)))
+                for d, n in queries
+            ]
+
+        expected = answers(HolidayCalendar(annual_holidays=NOWRUZ), queries)
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        calendar = HolidayCalendar(annual_holidays=NOWRUZ)
+        barrier = threading.Barrier(8)
+        results = {}
+
+        def run(i):
+            # Each thread asks the same questions in its own order, so the
+            # tables are grown from different places at once
+            order = list(range(len(queries)))
+            random.Random(i).shuffle(order)
+            barrier.wait()
+            found = answers(calendar, [queries[j] for j in order])
+            results[i] = [found[order.index(j)] for j in range(len(queries))]
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 8)
+        for found in results.values():
+            self.assertEqual(found, expected)
+
+    def test_invalid_definitions(self):
+        with self.assertRaises(ValueError):
+            HolidayCalendar(weekend=range(7))
+        with self.assertRaises(ValueError):
+            HolidayCalendar(weekend=[7])
+        with self.assertRaises(ValueError):
+            HolidayCalendar(annual_holidays=[(7, 31)])
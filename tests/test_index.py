@@ -0,0 +1,99 @@
+import datetime
+from array import array
+from unittest import TestCase
+
+import jdatetime
+from jdatetime.index import JDatetimeIndex
+
+
+class TestJDatetimeIndex(TestCase):
+    def setUp(self):
+        start = jdatetime.datetime(1402, 7, 1)
+        self.values = [start + datetime.timedelta(hours=7 * i) for i in range(1000)]
+        self.index = JDatetimeIndex(self.values)
+
+    def test_items(self):
+        self.assertEqual(len(self.index), 1000)
+        self.assertEqual(self.index[0], self.values[0])
+        self.assertEqual(self.index[-1], self.values[-1])
+        self.assertEqual(list(self.index), self.values)
+        self.assertIn(self.values[10], self.index)
+        self.assertNotIn(self.values[10] + datetime.timedelta(seconds=1), self.index)
+
+    def test_unsorted_values(self):
+        with self.assertRaises(ValueError):
+            JDatetimeIndex(reversed(self.values))
+        index = JDatetimeIndex(reversed(self.values), sort=True)
+        self.assertEqual(index, self.index)
+
+    def test_mixed_inputs(self):
+        index = JDatetimeIndex([
+            jdatetime.date(1402, 1, 1),
+            datetime.datetime(2023, 3, 21, 10, 0),
+            '1402-01-01T12:00:00',
+        ])
+        self.assertEqual(list(index), [
+            jdatetime.datetime(1402, 1, 1),
+            jdatetime.datetime(1402, 1, 1, 10, 0),
+            jdatetime.datetime(1402, 1, 1, 12, 0),
+        ])
+
+    def test_searchsorted(self):
+        value = jdatetime.datetime(1402, 8, 1)
+        expected = sum(1 for v in self.values if v < value)
+        self.assertEqual(self.index.searchsorted(value), expected)
+        self.assertEqual(self.index.searchsorted(self.values[5]), 5)
+        self.assertEqual(self.index.searchsorted(self.values[5], side='right'), 6)
+        self.assertEqual(
+            list(self.index.searchsorted([self.values[5], value])),
+            [5, expected],
+        )
+        self.assertEqual(self.index.searchsorted(value.togregorian()), expected)
+
+    def test_naive_and_aware_are_not_mixed(self):
+        utc = datetime.timezone.utc
+        with self.assertRaises(TypeError):
+            JDatetimeIndex([jdatetime.datetime(1402, 1, 1), jdatetime.datetime(1402, 1, 2, tzinfo=utc)])
+        aware = jdatetime.datetime(1402, 7, 1, 7, tzinfo=utc)
+        for lookup in (self.index.__contains__, self.index.searchsorted):
+            with self.assertRaises(TypeError):
+                lookup(aware)
+        with self.assertRaises(TypeError):
+            self.index[5:][aware:]
+        index = JDatetimeIndex([aware, '1402-07-01T08:00:00+00:00'])
+        self.assertIn(aware, index)
+        with self.assertRaises(TypeError):
+            index.searchsorted([jdatetime.datetime(1402, 7, 1, 7)])
+        self.assertEqual(index.searchsorted(jdatetime.date(1402, 7, 2)), 2)
+
+    def test_partial_string_slicing(self):
+        aban = [v for v in self.values if v.month == 8]
+        self.assertEqual(list(self.index['1402-08']), aban)
+        self.assertEqual(list(self.index['1402-08':'1402-09']), [v for v in self.values if v.month in (8, 9)])
+        self.assertEqual(
+            list(self.index['1402-08-10']),
+            [v for v in self.values if v.month == 8 and v.day == 10],
+        )
+        self.assertEqual(
+            list(self.index['1402-08-10 07']),
+            [v for v in self.values if (v.month, v.day, v.hour) == (8, 10, 7)],
+        )
+        self.assertEqual(len(self.index['1402']), len([v for v in self.values if v.year == 1402]))
+        self.assertEqual(len(self.index['1401']), 0)
+        with self.assertRaises(ValueError):
+            self.index['1402-13']
+
+    def test_label_slicing_is_inclusive(self):
+        view = self.index[self.values[3]:self.values[6]]
+        self.assertEqual(list(view), self.values[3:7])
+        self.assertEqual(list(self.index[:self.values[2]]), self.values[:3])
+
+    def test_views_are_zero_copy(self):
+        keys = array('q', self.index.keys)
+        index = JDatetimeIndex.from_keys(keys)
+        view = index[10:20]
+        self.assertEqual(list(view), self.values[10:20])
+        self.assertEqual(list(view['1402-07-03':]), [v for v in self.values[10:20] if v.day >= 3])
+        with self.assertRaises(BufferError):
+            keys.append(0)
+        self.assertTrue(view.keys.readonly)
@@ -168,6 +168,61 @@ class TestJDate(TestCase):
         d = load_pickle('jdate_py3_jdatetime3.7.pickle')
         self.assertEqual(d, jdatetime.date(1400, 10, 11))
 
+    def test_pickle_is_compact(self):
+        d = jdatetime.date(1400, 10, 11, locale='fa_IR')
+        data = pickle.dumps(d)
+        self.assertLess(len(data), 80)
+        loaded = pickle.loads(data)
+        self.assertEqual(loaded, d)
+        self.assertEqual(loaded.locale, 'fa_IR')
+        self.assertEqual(loaded.j_months, d.j_months_fa)
+
+    def test_bytes(self):
+        dates = [
+            jdatetime.date.min, jdatetime.date(1402, 12, 29), jdatetime.date(1403, 1, 1), jdatetime.date.max,
+        ]
+        encoded = [d.to_bytes() for d in dates]
+        self.assertEqual(encoded[1], jdatetime.date(1402, 12, 29).toordinal().to_bytes(4, 'big'))
+        self.assertEqual(sorted(encoded), encoded)
+        self.assertEqual([jdatetime.date.from_bytes(b) for b in encoded], dates)
+        with self.assertRaises(ValueError):
+            jdatetime.date.from_bytes(b'\x00\x00\x00')
+        with self.assertRaises(ValueError):
+            jdatetime.date.from_bytes(b'\x00\x00\x00\x00')
+
+    def test_sort_key(self):
+        d = jdatetime.date(1402, 12, 29)
+        self.assertEqual(d.sort_key(), d.toordinal())
+        self.assertLess(d.sort_key(), jdatetime.date(1403, 1, 1).sort_key())
+
+    def test_togregorian_is_memoized(self):
+        d = jdatetime.date(1402, 12, 29)
+        self.assertEqual(d.togregorian(), datetime.date(2024, 3, 19))
+        self.assertIs(d.togregorian(), d.togregorian())
+
+    def test_fromgregorian_computes_jalali_fields_lazily(self):
+        d = jdatetime.date.fromgregorian(date=datetime.datetime(2024, 3, 19, 23, 0))
+        self.assertEqual(d.togregorian(), datetime.date(2024, 3, 19))
+        self.assertNotIn('_date__year', vars(d))
+        self.assertEqual(d, jdatetime.date(1402, 12, 29))
+        self.assertEqual(d.toordinal(), jdatetime.date(1402, 12, 29).toordinal())
+
+    def test_comparing_lazy_dates_keeps_them_lazy(self):
+        a = jdatetime.date.fromgregorian(date=datetime.date(2024, 3, 19))
+        b = jdatetime.date.fromgregorian(date=datetime.date(2024, 3, 20))
+        self.assertLess(a, b)
+        self.assertLessEqual(a, b)
+        self.assertGreater(b, a)
+        self.assertGreaterEqual(b, a)
+        self.assertNotEqual(a, b)
+        self.assertEqual(a, jdatetime.date.fromgregorian(date=datetime.date(2024, 3, 19)))
+        self.assertEqual(len({a, b, jdatetime.date.fromgregorian(date=datetime.date(2024, 3, 19))}), 2)
+        self.assertLess(a, jdatetime.date(1403, 1, 2))
+        self.assertGreater(jdatetime.date(1403, 1, 2), a)
+        self.assertEqual(a, jdatetime.date(1402, 12, 29))
+        self.assertNotIn('_date__year', vars(a))
+        self.assertNotIn('_date__year', vars(b))
+
     def test_fromisoformat(self):
         self.assertEqual(
             jdatetime.date.fromisoformat("1378-02-22"),
@@ -1,5 +1,7 @@
+import asyncio
 import datetime
 import locale
+import os
 import pickle
 import platform
 import sys
@@ -20,6 +22,10 @@ except ImportError:
 from tests import load_pickle
 
 
+class SubclassedDatetime(jdatetime.datetime):
+    pass
+
+
 class GMTTime(jdatetime.tzinfo):
     def utcoffset(self, dt):
         return jdatetime.timedelta(hours=0)
@@ -260,6 +266,34 @@ class TestJDateTime(TestCase):
 
         self.assertEqual(jnow.date(), gnow)
 
+    def test_now_recomputes_date_on_new_day(self):
+        # A stale cached day must not leak into the result
+        self.addCleanup(setattr, jdatetime, '_current_day', jdatetime._current_day)
+        jdatetime._current_day = (datetime.date(2000, 1, 1).toordinal(), (1378, 10, 11))
+        utc = datetime.timezone.utc
+        gnow = datetime.datetime.now(utc)
+        jnow = jdatetime.datetime.now(utc)
+        if gnow.date() == jnow.togregorian().date():
+            self.assertEqual(jnow.date(), jdatetime.date.fromgregorian(date=gnow.date()))
+        self.assertEqual(jdatetime.date.today(), jdatetime.date.fromgregorian(date=datetime.date.today()))
+        self.assertEqual(jdatetime._current_day[0], datetime.date.today().toordinal())
+
+    def test_coarse_clock(self):
+        self.assertFalse(jdatetime.set_coarse_clock(True))
+        self.addCleanup(jdatetime.set_coarse_clock, False)
+        teh = TehranTime()
+        before = datetime.datetime.now(teh)
+        jnow = jdatetime.datetime.now(teh)
+        self.assertIs(jnow.tzinfo, teh)
+        self.assertLess(abs(jnow.togregorian() - before), datetime.timedelta(seconds=1))
+        utcnow = jdatetime.datetime.utcnow()
+        self.assertIsNone(utcnow.tzinfo)
+        self.assertLess(
+            abs(utcnow.togregorian() - datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)),
+            datetime.timedelta(seconds=1),
+        )
+        self.assertTrue(jdatetime.set_coarse_clock(False))
+
     def test_datetimefromtimestamp(self):
         t = time.time()
         jnow = jdatetime.datetime.fromtimestamp(t).date()
@@ -422,6 +456,40 @@ class TestJDateTime(TestCase):
                 date = jdatetime.datetime.strptime(date_string, date_format)
                 self.assertEqual(datetime.timezone(time_delta), date.tzinfo)
 
+    def test_strptime_z_directive_shares_timezones(self):
+        first = jdatetime.datetime.strptime('1402-01-01 +03:30', '%Y-%m-%d %z')
+        second = jdatetime.datetime.strptime('1402-01-02 +0330', '%Y-%m-%d %z')
+        self.assertIs(first.tzinfo, second.tzinfo)
+        self.assertEqual(first.tzinfo, datetime.timezone(datetime.timedelta(hours=3, minutes=30)))
+        self.assertEqual(first.strftime('%z'), '+0330')
+        self.assertEqual(second.strftime('%z'), '+0330')
+
+    def test_strptime_z_directive_shares_timezones_across_threads(self):
+        barrier = threading.Barrier(8)
+        results = []
+
+        def parse():
+            barrier.wait()
+            results.append(jdatetime.datetime.strptime('1402-01-01 -02:15', '%Y-%m-%d %z').tzinfo)
+
+        threads = [threading.Thread(target=parse) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(8, len(results))
+        self.assertTrue(all(tz is results[0] for tz in results))
+
+    def test_strptime_format_cache_is_bounded(self):
+        for minute in range(300):
+            fmt = '%Y-%m-%d ' + str(minute)
+            self.assertEqual(
+                jdatetime.datetime.strptime('1402-01-01 ' + str(minute), fmt),
+                jdatetime.datetime(1402, 1, 1),
+            )
+        self.assertLessEqual(len(jdatetime._strptime_regex.cache), 256)
+
     def test_strptime_invalid_date_string_z_directive(self):
         tests = [
             ('0123', '%z', "time data '0123' does not match format '%z'"),
@@ -707,6 +775,89 @@ class TestJDateTime(TestCase):
         jdt = jdatetime.datetime(1398, 4, 11, 11, 6, 5, 123456, tzinfo=tzinfo)
         self.assertEqual(str(jdt), '1398-04-11 11:06:05.123456+0430')
 
+    def test_sort_key(self):
+        dt = jdatetime.datetime(1402, 12, 29, 23, 59, 59, 999999)
+        self.assertEqual(dt.sort_key() + 1, jdatetime.datetime(1403, 1, 1).sort_key())
+        self.assertEqual(
+            jdatetime.datetime(1403, 1, 1, 3, 30, tzinfo=TehranTime()).sort_key(),
+            jdatetime.datetime(1403, 1, 1, tzinfo=GMTTime()).sort_key(),
+        )
+
+    def test_fromgregorian_computes_jalali_fields_lazily(self):
+        gdt = datetime.datetime(2024, 3, 20, 1, 2, 3, 4, tzinfo=datetime.timezone.utc, fold=1)
+        dt = jdatetime.datetime.fromgregorian(datetime=gdt)
+        self.assertEqual(dt.togregorian(), gdt)
+        self.assertEqual(dt.timestamp(), gdt.timestamp())
+        self.assertEqual(hash(dt), hash(gdt))
+        self.assertLess(dt, jdatetime.datetime(1403, 1, 2, tzinfo=GMTTime()))
+        self.assertNotIn('_date__year', vars(dt))
+        self.assertIsInstance(dt.timetz(), jdatetime.time)
+        self.assertEqual(dt.fold, 1)
+        self.assertEqual(dt.togregorian().fold, 1)
+
+        self.assertEqual((dt.year, dt.month, dt.day), (1403, 1, 1))
+        self.assertIn('_date__year', vars(dt))
+        self.assertEqual(dt, jdatetime.datetime(1403, 1, 1, 1, 2, 3, 4, tzinfo=datetime.timezone.utc))
+
+    @skipUnless(hasattr(time, 'tzset'), 'requires time.tzset()')
+    def test_utcfromtimestamp_ignores_local_timezone(self):
+        orig_tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'Asia/Tehran'
+        time.tzset()
+
+        def restore():
+            if orig_tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = orig_tz
+            time.tzset()
+        self.addCleanup(restore)
+
+        dt = jdatetime.datetime.utcfromtimestamp(1700000000.5)
+        self.assertEqual(dt, jdatetime.datetime(1402, 8, 23, 22, 13, 20, 500000))
+        self.assertIsNone(dt.tzinfo)
+
+    def test_togregorian_matches_jalali_core(self):
+        for value in (
+            jdatetime.date(1, 1, 1),
+            jdatetime.date(1403, 12, 30),
+            jdatetime.datetime(1402, 1, 1, 12),
+            jdatetime.datetime(9377, 12, 29, 23, 59),
+        ):
+            gregorian = jdatetime.JalaliToGregorian(value.year, value.month, value.day).getGregorianList()
+            self.assertEqual(value.togregorian().timetuple()[:3], tuple(gregorian))
+
+    def test_togregorian_is_memoized(self):
+        dt = jdatetime.datetime(1402, 8, 15, 12, 30, tzinfo=TehranTime())
+        gdt = dt.togregorian()
+        self.assertEqual(gdt, datetime.datetime(2023, 11, 6, 12, 30, tzinfo=TehranTime()))
+        self.assertIs(dt.togregorian(), gdt)
+        self.assertEqual(dt.weekday(), 2)
+        self.assertIs(dt.togregorian(), gdt)
+        self.assertEqual(pickle.loads(pickle.dumps(dt)), dt)
+
+    def test_date_togregorian_does_not_clobber_datetime(self):
+        gdt = datetime.datetime(2023, 11, 6, 12, 30)
+        for dt in (jdatetime.datetime(1402, 8, 15, 12, 30), jdatetime.datetime.fromgregorian(datetime=gdt)):
+            self.assertEqual(jdatetime.date.togregorian(dt), datetime.date(2023, 11, 6))
+            self.assertEqual(dt.togregorian(), gdt)
+            self.assertIsInstance(dt.togregorian(), datetime.datetime)
+            other = jdatetime.datetime(1402, 8, 15, 12, 30)
+            self.assertEqual(dt, other)
+            self.assertEqual(hash(dt), hash(other))
+            self.assertIsInstance(jdatetime.date.togregorian(dt), datetime.date)
+            self.assertNotIsInstance(jdatetime.date.togregorian(dt), datetime.datetime)
+
+    def test_lazy_datetime_out_of_range(self):
+        with self.assertRaises(ValueError):
+            jdatetime.datetime.fromgregorian(datetime=datetime.datetime(622, 3, 20))
+
+    def test_pickle_lazy_datetime(self):
+        dt = jdatetime.datetime.fromtimestamp(1700000000)
+        loaded = pickle.loads(pickle.dumps(dt))
+        self.assertEqual(loaded, dt)
+        self.assertEqual(str(loaded), str(jdatetime.datetime.fromtimestamp(1700000000)))
+
     def test_pickle(self):
         dt = jdatetime.datetime.now()
         self.assertEqual(pickle.loads(pickle.dumps(dt)), dt)
@@ -715,6 +866,71 @@ class TestJDateTime(TestCase):
         dt = load_pickle('jdatetime_py3_jdatetime3.7.pickle')
         self.assertEqual(dt, jdatetime.datetime(1400, 10, 11, 1, 2, 3, 30))
 
+    def test_pickle_keeps_tzinfo_fold_and_locale(self):
+        dt = jdatetime.datetime(1401, 6, 30, 23, 30, 1, 999999, GMTTime(), fold=1, locale='fa_IR')
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            loaded = pickle.loads(pickle.dumps(dt, protocol))
+            self.assertEqual(loaded, dt)
+            self.assertEqual(loaded.microsecond, 999999)
+            self.assertIsInstance(loaded.tzinfo, GMTTime)
+            self.assertEqual(loaded.fold, 1)
+            self.assertEqual(loaded.locale, 'fa_IR')
+            self.assertEqual(loaded.j_months, dt.j_months_fa)
+
+    def test_pickle_is_compact(self):
+        data = pickle.dumps(jdatetime.datetime(1400, 10, 11, 1, 2, 3, 30))
+        self.assertNotIn(b'Farvardin', data)
+        self.assertLess(len(data), 100)
+
+    def test_pickle_keeps_missing_locale(self):
+        data = pickle.dumps(jdatetime.datetime(1400, 10, 11, 1, 2, 3, 30))
+        with jdatetime.locale_context('fa_IR'):
+            loaded = pickle.loads(data)
+        self.assertIsNone(loaded.locale)
+
+    def test_bytes_naive(self):
+        values = [
+            jdatetime.datetime(1, 1, 1),
+            jdatetime.datetime(1402, 12, 29, 23, 59, 59, 999999),
+            jdatetime.datetime(1403, 1, 1),
+            jdatetime.datetime(9377, 12, 30, 23, 59, 59, 999999),
+        ]
+        encoded = [dt.to_bytes() for dt in values]
+        self.assertEqual({len(b) for b in encoded}, {8})
+        self.assertEqual(sorted(encoded), encoded)
+        self.assertEqual([jdatetime.datetime.from_bytes(b) for b in encoded], values)
+
+    def test_bytes_aware(self):
+        tehran = datetime.timezone(datetime.timedelta(hours=3, minutes=30))
+        minus_five = datetime.timezone(datetime.timedelta(hours=-5))
+        values = [
+            jdatetime.datetime(1403, 1, 1, 1, 0, tzinfo=tehran),
+            jdatetime.datetime(1402, 12, 29, 17, 0, tzinfo=minus_five),
+            jdatetime.datetime(1403, 1, 1, 0, 0, tzinfo=GMTTime()),
+        ]
+        encoded = [dt.to_bytes() for dt in values]
+        self.assertEqual({len(b) for b in encoded}, {10})
+        self.assertEqual(sorted(encoded), encoded)
+        for dt, data in zip(values, encoded):
+            decoded = jdatetime.datetime.from_bytes(data)
+            self.assertEqual(decoded, dt)
+            self.assertEqual(decoded.utcoffset(), dt.utcoffset())
+            self.assertEqual(decoded.hour, dt.hour)
+
+    def test_bytes_invalid(self):
+        with self.assertRaises(ValueError):
+            jdatetime.datetime.from_bytes(b'\x00' * 9)
+        with self.assertRaises(ValueError):
+            jdatetime.datetime.from_bytes(b'\x00' * 8)
+        with self.assertRaises(ValueError):
+            thirty_seconds = datetime.timezone(datetime.timedelta(seconds=30))
+            jdatetime.datetime(1400, 1, 1, tzinfo=thirty_seconds).to_bytes()
+
+    def test_pickle_subclass(self):
+        loaded = pickle.loads(pickle.dumps(SubclassedDatetime(1400, 10, 11, 1, 2, 3)))
+        self.assertIs(type(loaded), SubclassedDatetime)
+        self.assertEqual(loaded, jdatetime.datetime(1400, 10, 11, 1, 2, 3))
+
 
 class TestJdatetimeComparison(TestCase):
     # __eq__
@@ -845,9 +1061,7 @@ class TestJdatetimeGetSetLocale(TestCase):
     def record_thread_locale(record, event, locale):
         """Set and capture locale in current thread.
         Use an event to coordinate execution for multithreaded
-        tests. Because thread idents maybe recycled and reused
-        and jdatetime uses threads idents to identify unique
-        threads.
+        tests, so both threads are alive at the same time.
         """
         event.wait(timeout=10)
         jdatetime.set_locale(locale)
@@ -856,7 +1070,6 @@ class TestJdatetimeGetSetLocale(TestCase):
     def test_get_locale_returns_none_if_no_locale_set_yet(self):
         self.assertIsNone(jdatetime.get_locale())
 
-    @skipIf(greenlet_installed, 'thread ident is used when greenlet is not installed')
     def test_set_locale_is_per_thread_with_no_effect_on_other_threads(self):
         event = threading.Event()
         fa_record = []
@@ -876,7 +1089,7 @@ class TestJdatetimeGetSetLocale(TestCase):
         self.assertEqual('nl_NL', nl_record[0])
         self.assertIsNone(jdatetime.get_locale())  # MainThread is not affected neither
 
-    @skipUnless(greenlet_installed, 'greenelts ident is used when greenlet module is installed')
+    @skipUnless(greenlet_installed, 'greenlet is not installed')
     def test_set_locale_is_per_greenlet_with_no_effect_on_other_greenlets(self):
         fa_record = []
 
@@ -903,7 +1116,6 @@ class TestJdatetimeGetSetLocale(TestCase):
         self.assertEqual(1, len(nl_record))
         self.assertEqual('nl_NL', nl_record[0])
 
-    @skipIf(greenlet_installed, 'thread ident is used when greenlet is not installed')
     def test_set_locale_sets_default_locale_for_date_objects(self):
         def record_locale_formatted_date(record, locale):
             jdatetime.set_locale(locale)
@@ -918,7 +1130,7 @@ class TestJdatetimeGetSetLocale(TestCase):
 
         self.assertEqual(['یک‌شنبه', 'خرداد'], fa_record)
 
-    @skipUnless(greenlet_installed, 'greenlets ident is used when greenlet module is installed')
+    @skipUnless(greenlet_installed, 'greenlet is not installed')
     def test_set_locale_sets_default_locale_for_date_objects_with_greenlets(self):
         def record_locale_formatted_date(record, locale):
             jdatetime.set_locale(locale)
@@ -932,6 +1144,52 @@ class TestJdatetimeGetSetLocale(TestCase):
 
         self.assertEqual(['یک‌شنبه', 'خرداد'], fa_record)
 
+    def test_set_locale_is_per_asyncio_task(self):
+        async def record_task_locale(locale, started, record):
+            jdatetime.set_locale(locale)
+            started.set()
+            await asyncio.sleep(0)
+            record.append((jdatetime.get_locale(), jdatetime.date(1397, 3, 27).locale))
+
+        async def main():
+            fa_started, nl_started = asyncio.Event(), asyncio.Event()
+            fa_record, nl_record = [], []
+            await asyncio.gather(
+                record_task_locale('fa_IR', fa_started, fa_record),
+                record_task_locale('nl_NL', nl_started, nl_record),
+            )
+            return fa_record, nl_record, jdatetime.get_locale()
+
+        fa_record, nl_record, main_locale = asyncio.run(main())
+
+        self.assertEqual([('fa_IR', 'fa_IR')], fa_record)
+        self.assertEqual([('nl_NL', 'nl_NL')], nl_record)
+        self.assertIsNone(main_locale)
+        self.assertIsNone(jdatetime.get_locale())
+
+    def test_asyncio_task_inherits_locale_of_its_creator(self):
+        async def main():
+            with jdatetime.locale_context('fa_IR'):
+                return await asyncio.create_task(asyncio.sleep(0, jdatetime.get_locale()))
+
+        self.assertEqual('fa_IR', asyncio.run(main()))
+
+    def test_locale_context_restores_previous_locale(self):
+        with jdatetime.locale_context('fa_IR') as locale:
+            self.assertEqual('fa_IR', locale)
+            self.assertEqual('fa_IR', jdatetime.get_locale())
+            self.assertEqual('fa_IR', jdatetime.date(1397, 3, 27).locale)
+            with jdatetime.locale_context('nl_NL'):
+                self.assertEqual('nl_NL', jdatetime.datetime(1397, 3, 27).locale)
+            self.assertEqual('fa_IR', jdatetime.get_locale())
+        self.assertIsNone(jdatetime.get_locale())
+
+    def test_locale_context_restores_previous_locale_on_error(self):
+        with self.assertRaises(ZeroDivisionError):
+            with jdatetime.locale_context('fa_IR'):
+                1 / 0
+        self.assertIsNone(jdatetime.get_locale())
+
     def test_fromisoformat(self):
         UTC = datetime.timezone.utc
 
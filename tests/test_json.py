@@ -0,0 +1,75 @@
+import datetime
+import json
+from unittest import TestCase
+
+import jdatetime
+from jdatetime import json as jjson
+from jdatetime.tz import TEHRAN
+
+
+class TestJSON(TestCase):
+    def setUp(self):
+        self.values = [
+            jdatetime.date(1402, 12, 29),
+            jdatetime.datetime(1403, 1, 1),
+            jdatetime.datetime(1403, 1, 1, 12, 30, 5, 123),
+            jdatetime.datetime(1401, 5, 1, 23, 30, tzinfo=TEHRAN),
+            jdatetime.datetime(1402, 8, 15, 7, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))),
+        ]
+
+    def test_format_value_matches_isoformat(self):
+        for value in self.values:
+            self.assertEqual(jjson.format_value(value), value.isoformat())
+        self.assertEqual(jjson.format_value(jdatetime.date(5, 1, 2)), '0005-01-02')
+        self.assertEqual(jjson.format_value(jdatetime.datetime(5, 1, 2)), '0005-01-02T00:00:00')
+
+    def test_round_trip(self):
+        data = jjson.dumps({'values': self.values, 'first': self.values[0]})
+        self.assertEqual(json.loads(data)['values'], [v.isoformat() for v in self.values])
+        loaded = jjson.loads(data)
+        self.assertEqual(loaded['first'], self.values[0])
+        # Lists are not decoded
+        self.assertEqual(loaded['values'], [v.isoformat() for v in self.values])
+        for value in self.values:
+            decoded = jjson.loads(jjson.dumps({'v': value}))['v']
+            self.assertIs(type(decoded), type(value))
+            self.assertEqual(decoded, value)
+            if isinstance(value, jdatetime.datetime):
+                self.assertEqual(decoded.utcoffset(), value.utcoffset())
+
+    def test_parse_value(self):
+        self.assertEqual(jjson.parse_value('1402-08-15 12:30:00+03:30'), jdatetime.datetime(
+            1402, 8, 15, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=3, minutes=30)),
+        ))
+        for value in ('1402-13-01', '1402-12-30', 'abcd-ef-gh', '1402-01-01T25:00:00', 'hello', '', 42, None):
+            self.assertIs(jjson.parse_value(value), value)
+
+    def test_fields(self):
+        data = '{"id": "1402-01-01", "created": "1402-01-02", "nested": {"created": "1402-01-03"}}'
+        loaded = jjson.loads(data, fields=['created'])
+        self.assertEqual(loaded['id'], '1402-01-01')
+        self.assertEqual(loaded['created'], jdatetime.date(1402, 1, 2))
+        self.assertEqual(loaded['nested']['created'], jdatetime.date(1402, 1, 3))
+
+    def test_fields_decode_lists(self):
+        data = '{"holidays": ["1402-01-01", "x", 3, "1402-01-02T08:00:00"], "other": ["1402-01-01"]}'
+        loaded = jjson.loads(data, fields=['holidays'])
+        self.assertEqual(loaded['holidays'], [
+            jdatetime.date(1402, 1, 1), 'x', 3, jdatetime.datetime(1402, 1, 2, 8),
+        ])
+        self.assertEqual(loaded['other'], ['1402-01-01'])
+        hook = jjson.make_object_pairs_hook(fields=['holidays'])
+        self.assertEqual(json.loads(data, object_pairs_hook=hook)['holidays'], loaded['holidays'])
+
+    def test_hooks_with_json_module(self):
+        data = '{"a": "1402-01-02", "b": "x"}'
+        expected = {'a': jdatetime.date(1402, 1, 2), 'b': 'x'}
+        self.assertEqual(json.loads(data, object_hook=jjson.object_hook), expected)
+        self.assertEqual(json.loads(data, object_pairs_hook=jjson.object_pairs_hook), expected)
+        hook = jjson.make_object_pairs_hook(fields=['b'])
+        self.assertEqual(json.loads(data, object_pairs_hook=hook), {'a': '1402-01-02', 'b': 'x'})
+
+    def test_encoder_rejects_other_types(self):
+        with self.assertRaises(TypeError):
+            jjson.dumps({'a': object()})
+        self.assertEqual(json.dumps([jdatetime.date(1402, 1, 2)], cls=jjson.JSONEncoder), '["1402-01-02"]')
@@ -0,0 +1,35 @@
+import datetime
+from unittest import TestCase
+
+import jdatetime
+from jdatetime import _ordinal
+
+
+class TestOrdinal(TestCase):
+    def test_round_trip_matches_date(self):
+        for year in list(range(1, 70)) + list(range(1300, 1500)) + list(range(9300, 9378)):
+            for month, day in ((1, 1), (6, 31), (7, 1), (12, 29)):
+                d = jdatetime.date(year, month, day)
+                n = _ordinal.to_ordinal(year, month, day)
+                self.assertEqual(n, d.toordinal())
+                self.assertEqual(_ordinal.from_ordinal(n), (year, month, day))
+                self.assertEqual(_ordinal.weekday(n), d.weekday())
+
+    def test_from_ordinal_matches_gregorian_conversion(self):
+        g = datetime.date(2020, 1, 1)
+        for i in range(800):
+            d = jdatetime.date.fromgregorian(date=g + datetime.timedelta(days=i))
+            n = _ordinal.from_gregorian_ordinal(g.toordinal() + i)
+            self.assertEqual(_ordinal.from_ordinal(n), (d.year, d.month, d.day))
+
+    def test_year_lengths(self):
+        for year in range(1, 200):
+            self.assertEqual(
+                _ordinal.days_in_year(year),
+                _ordinal.days_before_year(year + 1) - _ordinal.days_before_year(year),
+            )
+            self.assertEqual(_ordinal.isleap(year), jdatetime.date(year, 1, 1).isleap())
+
+    def test_bounds(self):
+        self.assertEqual(_ordinal.MIN_ORDINAL, jdatetime.date.min.toordinal())
+        self.assertEqual(_ordinal.MAX_ORDINAL, jdatetime.date.max.toordinal())
@@ -0,0 +1,92 @@
+import datetime
+from unittest import TestCase
+
+import jdatetime
+from jdatetime.periods import PeriodIndex
+
+
+class TestPeriodIndex(TestCase):
+    def setUp(self):
+        self.fiscal = PeriodIndex(
+            [jdatetime.date(1401, 1, 1), jdatetime.date(1402, 1, 1), '1403-01-01'],
+            labels=['FY01', 'FY02', 'FY03'],
+            end=jdatetime.date(1404, 1, 1),
+        )
+
+    def test_lookup(self):
+        self.assertEqual(self.fiscal.resolution, 'D')
+        self.assertIsNone(self.fiscal.lookup(jdatetime.date(1400, 12, 29)))
+        self.assertEqual(self.fiscal.lookup(jdatetime.date(1401, 1, 1)), 'FY01')
+        self.assertEqual(self.fiscal.lookup(jdatetime.date(1402, 12, 29)), 'FY02')
+        self.assertEqual(self.fiscal.lookup(jdatetime.datetime(1403, 12, 30, 23, 59)), 'FY03')
+        self.assertEqual(self.fiscal.lookup(jdatetime.date(1404, 1, 1), 'closed'), 'closed')
+
+    def test_lookup_gregorian_values(self):
+        self.assertEqual(self.fiscal.lookup(datetime.date(2023, 3, 20)), 'FY01')
+        self.assertEqual(self.fiscal.lookup(datetime.datetime(2023, 3, 21, 0, 0)), 'FY02')
+        self.assertEqual(self.fiscal.locate(datetime.date(2025, 3, 21)), -1)
+
+    def test_locate_without_labels(self):
+        index = PeriodIndex(['1402-01-01', '1402-07-01'])
+        self.assertEqual(index.lookup(jdatetime.date(1402, 6, 31)), 0)
+        self.assertEqual(index.lookup(jdatetime.date(1410, 1, 1)), 1)
+        self.assertEqual(len(index), 2)
+
+    def test_time_boundaries(self):
+        tariffs = PeriodIndex(
+            [
+                jdatetime.datetime(1402, 1, 1, 0, 0),
+                jdatetime.datetime(1402, 1, 1, 7, 0),
+                jdatetime.datetime(1402, 1, 1, 19, 0),
+            ],
+            labels=['night', 'day', 'evening'],
+            end=jdatetime.date(1402, 1, 2),
+        )
+        self.assertEqual(tariffs.resolution, 'us')
+        self.assertEqual(tariffs.lookup(jdatetime.datetime(1402, 1, 1, 6, 59, 59, 999999)), 'night')
+        self.assertEqual(tariffs.lookup(datetime.datetime(2023, 3, 21, 7, 0)), 'day')
+        self.assertEqual(tariffs.lookup('1402-01-01T20:15:00'), 'evening')
+        self.assertIsNone(tariffs.lookup(jdatetime.date(1402, 1, 2)))
+
+    def test_naive_and_aware_are_not_mixed(self):
+        utc = datetime.timezone.utc
+        naive = PeriodIndex([jdatetime.datetime(1402, 1, 1, 0), jdatetime.datetime(1402, 1, 1, 7)])
+        for value in (jdatetime.datetime(1402, 1, 1, 8, tzinfo=utc), '1402-01-01T08:00:00+03:30'):
+            with self.assertRaises(TypeError):
+                naive.lookup(value)
+        with self.assertRaises(TypeError):
+            naive.locate_many([jdatetime.datetime(1402, 1, 1, 8), datetime.datetime(2023, 3, 21, tzinfo=utc)])
+        aware = PeriodIndex(['1402-01-01T00:00:00+00:00', jdatetime.datetime(1402, 1, 1, 7, tzinfo=utc)])
+        self.assertEqual(aware.lookup(jdatetime.datetime(1402, 1, 1, 8, tzinfo=utc)), 1)
+        with self.assertRaises(TypeError):
+            aware.lookup(jdatetime.datetime(1402, 1, 1, 8))
+        # Dates have no offset and go with either
+        self.assertEqual(naive.lookup(jdatetime.date(1402, 1, 2)), 1)
+        self.assertEqual(aware.lookup(jdatetime.date(1402, 1, 2)), 1)
+        with self.assertRaises(TypeError):
+            PeriodIndex([jdatetime.datetime(1402, 1, 1), jdatetime.datetime(1402, 1, 2, tzinfo=utc)])
+
+    def test_vectorized_lookup(self):
+        days = [jdatetime.date(1400, 12, 1) + datetime.timedelta(days=i * 37) for i in range(50)]
+        self.assertEqual(
+            list(self.fiscal.locate_many(days)),
+            [self.fiscal.locate(d) for d in days],
+        )
+        self.assertEqual(
+            list(self.fiscal.locate_keys(d.toordinal() for d in days)),
+            [self.fiscal.locate(d) for d in days],
+        )
+        self.assertEqual(
+            self.fiscal.lookup_many([d.togregorian() for d in days], default='-'),
+            [self.fiscal.lookup(d, '-') for d in days],
+        )
+
+    def test_invalid_boundaries(self):
+        with self.assertRaises(ValueError):
+            PeriodIndex([])
+        with self.assertRaises(ValueError):
+            PeriodIndex(['1402-01-01', '1401-01-01'])
+        with self.assertRaises(ValueError):
+            PeriodIndex(['1402-01-01'], labels=['a', 'b'])
+        with self.assertRaises(ValueError):
+            PeriodIndex(['1402-01-01'], end='1401-01-01')
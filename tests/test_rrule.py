@@ -0,0 +1,139 @@
+import datetime
+from unittest import TestCase
+
+import jdatetime
+from jdatetime.holidays import HolidayCalendar
+from jdatetime.rrule import (
+    DAILY, FR, MONTHLY, SA, SU, TH, WEEKLY, YEARLY, rrule,
+)
+
+
+def days(start, count):
+    return [start + datetime.timedelta(days=i) for i in range(count)]
+
+
+class TestRrule(TestCase):
+    def test_monthly_first_day(self):
+        rule = rrule(MONTHLY, jdatetime.date(1402, 1, 1), bymonthday=1, count=14)
+        self.assertEqual(
+            list(rule),
+            [jdatetime.date(1402 + i // 12, i % 12 + 1, 1) for i in range(14)],
+        )
+
+    def test_monthly_defaults_to_dtstart_day(self):
+        rule = rrule(MONTHLY, jdatetime.date(1402, 5, 31), count=3)
+        self.assertEqual(
+            list(rule),
+            [jdatetime.date(1402, 5, 31), jdatetime.date(1402, 6, 31), jdatetime.date(1403, 1, 31)],
+        )
+
+    def test_monthly_last_day(self):
+        rule = rrule(MONTHLY, jdatetime.date(1402, 11, 1), bymonthday=-1, count=3)
+        self.assertEqual(
+            list(rule),
+            [jdatetime.date(1402, 11, 30), jdatetime.date(1402, 12, 29), jdatetime.date(1403, 1, 31)],
+        )
+
+    def test_second_saturday(self):
+        rule = rrule(MONTHLY, jdatetime.date(1402, 1, 1), byweekday=SA(2), until=jdatetime.date(1404, 1, 1))
+        expected = []
+        for d in days(jdatetime.date(1402, 1, 1), 800):
+            if d.weekday() == 0 and 8 <= d.day <= 14 and d < jdatetime.date(1404, 1, 1):
+                expected.append(d)
+        self.assertEqual(list(rule), expected)
+
+    def test_last_friday_of_year(self):
+        rule = rrule(YEARLY, jdatetime.date(1400, 1, 1), byweekday=FR(-1), count=3)
+        for d in rule:
+            self.assertEqual(d.weekday(), 6)
+            self.assertGreater(d + datetime.timedelta(days=7), jdatetime.date(d.year, 12, 29))
+
+    def test_last_working_day_of_esfand(self):
+        calendar = HolidayCalendar(annual_holidays=[(12, 29)], weekend=[5, 6])
+        rule = rrule(YEARLY, jdatetime.date(1400, 1, 1), bymonth=12, bysetpos=-1, calendar=calendar,
+                     byweekday=range(7))
+        self.assertEqual(
+            rule.between(jdatetime.date(1401, 1, 1), jdatetime.date(1404, 1, 1)),
+            [jdatetime.date(1401, 12, 28), jdatetime.date(1402, 12, 28), jdatetime.date(1403, 12, 28)],
+        )
+
+    def test_weekly_with_interval(self):
+        rule = rrule(WEEKLY, jdatetime.date(1402, 1, 1), interval=2, byweekday=(SA, TH), count=6)
+        result = list(rule)
+        self.assertEqual(result[0], jdatetime.date(1402, 1, 3))
+        self.assertEqual([d.weekday() for d in result], [5, 0, 5, 0, 5, 0])
+        self.assertEqual(result[2] - result[0], datetime.timedelta(days=14))
+
+    def test_weekly_bymonthday_without_byweekday(self):
+        rule = rrule(WEEKLY, jdatetime.date(1402, 1, 1), bymonthday=5, count=3)
+        self.assertEqual(
+            list(rule), [jdatetime.date(1402, 1, 5), jdatetime.date(1402, 2, 5), jdatetime.date(1402, 3, 5)],
+        )
+        rule = rrule(WEEKLY, jdatetime.date(1402, 1, 1), bymonth=12, bymonthday=-1)
+        self.assertEqual(rule.after(jdatetime.date(1402, 1, 1)), jdatetime.date(1402, 12, 29))
+        # bymonth alone keeps the weekday of dtstart
+        rule = rrule(WEEKLY, jdatetime.date(1402, 1, 1), bymonth=2, count=2)
+        self.assertEqual([d.weekday() for d in rule], [jdatetime.date(1402, 1, 1).weekday()] * 2)
+
+    def test_daily_filters(self):
+        rule = rrule(DAILY, jdatetime.date(1402, 1, 1), bymonth=(1, 2), byweekday=SU)
+        expected = [
+            d for d in days(jdatetime.date(1402, 1, 1), 62) if d.weekday() == 1
+        ]
+        self.assertEqual(rule.between(jdatetime.date(1402, 1, 1), jdatetime.date(1402, 3, 1)), expected)
+
+    def test_yearly_defaults_to_dtstart(self):
+        rule = rrule(YEARLY, jdatetime.date(1399, 12, 30))
+        self.assertEqual(rule.after(jdatetime.date(1399, 12, 30)), jdatetime.date(1403, 12, 30))
+
+    def test_datetime_occurrences(self):
+        tehran = datetime.timezone(datetime.timedelta(hours=3, minutes=30))
+        start = jdatetime.datetime(1402, 1, 1, 2, 0, tzinfo=tehran, locale='nl_NL')
+        rule = rrule(MONTHLY, start)
+        occurrence = rule.after(jdatetime.datetime(1402, 3, 1, 2, 0), inc=True)
+        self.assertEqual(occurrence, jdatetime.datetime(1402, 3, 1, 2, 0, tzinfo=tehran, locale='nl_NL'))
+        occurrence = rule.after(jdatetime.datetime(1402, 3, 1, 2, 0))
+        self.assertEqual((occurrence.month, occurrence.hour), (4, 2))
+
+    def test_after_before_between(self):
+        rule = rrule(MONTHLY, jdatetime.date(1402, 1, 10), count=5)
+        self.assertEqual(rule.after(jdatetime.date(1402, 2, 10)), jdatetime.date(1402, 3, 10))
+        self.assertEqual(rule.after(jdatetime.date(1402, 2, 10), inc=True), jdatetime.date(1402, 2, 10))
+        self.assertIsNone(rule.after(jdatetime.date(1402, 5, 10)))
+        self.assertEqual(rule.before(jdatetime.date(1402, 2, 10)), jdatetime.date(1402, 1, 10))
+        self.assertEqual(rule.before(jdatetime.date(1403, 1, 1)), jdatetime.date(1402, 5, 10))
+        self.assertIsNone(rule.before(jdatetime.date(1402, 1, 10)))
+        self.assertEqual(
+            rule.between(jdatetime.date(1402, 2, 10), jdatetime.date(1402, 4, 10), inc=True),
+            [jdatetime.date(1402, 2, 10), jdatetime.date(1402, 3, 10), jdatetime.date(1402, 4, 10)],
+        )
+
+    def test_before_far_from_dtstart(self):
+        rule = rrule(MONTHLY, jdatetime.date(1, 1, 10), byweekday=FR(-1), bysetpos=1)
+        self.assertEqual(rule.before(jdatetime.date(9000, 1, 1)), rrule(
+            MONTHLY, jdatetime.date(8999, 1, 1), byweekday=FR(-1),
+        ).after(jdatetime.date(8999, 12, 1)))
+        rule = rrule(YEARLY, jdatetime.date(1400, 1, 1), bymonth=1, bymonthday=1)
+        self.assertEqual(rule.before(jdatetime.date(9000, 1, 1)), jdatetime.date(8999, 1, 1))
+        self.assertIsNone(rule.before(jdatetime.date(1300, 1, 1)))
+        rule = rrule(YEARLY, jdatetime.date(1400, 1, 1), bymonth=12, bymonthday=31)
+        self.assertIsNone(rule.before(jdatetime.date(9000, 1, 1)))
+
+    def test_expand_is_cached(self):
+        rule = rrule(WEEKLY, jdatetime.date(1400, 1, 1))
+        window = rule.expand(jdatetime.date(1402, 1, 1), jdatetime.date(1402, 2, 1))
+        self.assertEqual(len(window), 4)
+        self.assertIs(rule.expand(jdatetime.date(1402, 1, 1), jdatetime.date(1402, 2, 1)), window)
+
+    def test_weekday_repr_and_validation(self):
+        self.assertEqual(repr(SA(2)), 'SA(+2)')
+        self.assertEqual(repr(FR), 'FR')
+        self.assertEqual(SA(1), SA(1))
+        with self.assertRaises(ValueError):
+            SA(0)
+        with self.assertRaises(ValueError):
+            rrule(7, jdatetime.date(1402, 1, 1))
+        with self.assertRaises(ValueError):
+            rrule(MONTHLY, jdatetime.date(1402, 1, 1), bymonthday=32)
+        with self.assertRaises(TypeError):
+            rrule(MONTHLY, datetime.date(2023, 3, 21))
@@ -0,0 +1,86 @@
+import datetime
+import random
+from unittest import TestCase
+
+import jdatetime
+from jdatetime.sets import JDateSet
+
+
+class TestJDateSet(TestCase):
+    def setUp(self):
+        rng = random.Random(1402)
+        start = jdatetime.date(1401, 10, 1)
+        self.a = {start + datetime.timedelta(days=rng.randrange(500)) for _ in range(200)}
+        self.b = {start + datetime.timedelta(days=rng.randrange(300, 900)) for _ in range(200)}
+        self.set_a = JDateSet(self.a)
+        self.set_b = JDateSet(self.b)
+
+    def sorted_dates(self, dates):
+        return sorted(dates, key=lambda d: d.toordinal())
+
+    def test_membership_and_iteration(self):
+        self.assertEqual(len(self.set_a), len(self.a))
+        self.assertEqual(list(self.set_a), self.sorted_dates(self.a))
+        for d in self.a:
+            self.assertIn(d, self.set_a)
+            self.assertIn(d.togregorian(), self.set_a)
+        self.assertNotIn(jdatetime.date(1300, 1, 1), self.set_a)
+        self.assertEqual(self.set_a.min(), min(self.a))
+        self.assertEqual(self.set_a.max(), max(self.a))
+        self.assertEqual(list(self.set_a.ordinals()), [d.toordinal() for d in self.sorted_dates(self.a)])
+
+    def test_set_operations(self):
+        self.assertEqual(list(self.set_a | self.set_b), self.sorted_dates(self.a | self.b))
+        self.assertEqual(list(self.set_a & self.set_b), self.sorted_dates(self.a & self.b))
+        self.assertEqual(list(self.set_a - self.set_b), self.sorted_dates(self.a - self.b))
+        self.assertEqual(list(self.set_b - self.set_a), self.sorted_dates(self.b - self.a))
+        self.assertEqual(list(self.set_a ^ self.set_b), self.sorted_dates(self.a ^ self.b))
+        self.assertEqual(self.set_a.union(self.b), self.set_a | self.set_b)
+        self.assertEqual(self.set_a.intersection(self.set_b, self.set_a), self.set_a & self.set_b)
+        self.assertTrue(self.set_a & self.set_b <= self.set_a)
+        self.assertTrue(self.set_a >= self.set_a - self.set_b)
+        self.assertTrue((self.set_a - self.set_b).isdisjoint(self.set_b))
+        self.assertEqual(JDateSet() | self.set_a, self.set_a)
+        self.assertFalse(JDateSet() & self.set_a)
+
+    def test_add_and_discard(self):
+        dates = JDateSet()
+        for d in self.sorted_dates(self.a)[::-1]:
+            dates.add(d)
+        self.assertEqual(dates, self.set_a)
+        for d in self.a:
+            dates.discard(d)
+            dates.discard(d)
+        self.assertEqual(len(dates), 0)
+        self.assertEqual(dates, JDateSet())
+
+    def test_count_per_month(self):
+        expected = {}
+        for d in self.sorted_dates(self.a):
+            expected[(d.year, d.month)] = expected.get((d.year, d.month), 0) + 1
+        self.assertEqual(self.set_a.count_per_month(), expected)
+        self.assertEqual(list(self.set_a.count_per_month()), list(expected))
+
+    def test_count_per_month_long_range(self):
+        rng = random.Random(32)
+        start = jdatetime.date(1, 1, 1).toordinal()
+        ordinals = {start + rng.randrange(3000 * 365) for _ in range(5000)}
+        expected = {}
+        for n in sorted(ordinals):
+            d = jdatetime.date.fromordinal(n)
+            expected[(d.year, d.month)] = expected.get((d.year, d.month), 0) + 1
+        self.assertEqual(JDateSet.from_ordinals(ordinals).count_per_month(), expected)
+        dates = JDateSet.range(jdatetime.date(1300, 1, 1), jdatetime.date(1400, 1, 1))
+        self.assertEqual(sum(dates.count_per_month().values()), len(dates))
+        self.assertEqual(len(dates.count_per_month()), 1200)
+
+    def test_range(self):
+        dates = JDateSet.range(jdatetime.date(1402, 12, 1), jdatetime.date(1403, 2, 1))
+        self.assertEqual(dates.count_per_month(), {(1402, 12): 29, (1403, 1): 31})
+        self.assertEqual(len(JDateSet.range('1402-01-02', '1402-01-01')), 0)
+
+    def test_empty_set(self):
+        with self.assertRaises(ValueError):
+            JDateSet().min()
+        self.assertEqual(list(JDateSet()), [])
+        self.assertEqual(JDateSet().count_per_month(), {})
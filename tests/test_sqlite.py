@@ -0,0 +1,95 @@
+import datetime
+import sqlite3
+from unittest import TestCase
+
+import jdatetime
+from jdatetime import sqlite
+
+
+class TestSqlite(TestCase):
+    def setUp(self):
+        self.dates = [jdatetime.date(1402, 12, 29) + datetime.timedelta(days=i * 17) for i in range(50)]
+        self.datetimes = [
+            jdatetime.datetime(1402, 12, 29, 23, 59, 59, 999999)
+            + datetime.timedelta(hours=i * 5, microseconds=i)
+            for i in range(50)
+        ]
+
+    def tearDown(self):
+        sqlite.unregister()
+
+    def connect(self):
+        db = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES)
+        self.addCleanup(db.close)
+        db.execute('CREATE TABLE t (id INTEGER, d JDATE, dt JDATETIME)')
+        return db
+
+    def test_storages_round_trip_and_sort(self):
+        for storage in sqlite.STORAGES:
+            with self.subTest(storage=storage):
+                sqlite.register(storage)
+                db = self.connect()
+                rows = list(zip(range(50), reversed(self.dates), reversed(self.datetimes)))
+                rows.append((50, None, None))
+                db.executemany('INSERT INTO t VALUES (?, ?, ?)', rows)
+                self.assertEqual(db.execute('SELECT * FROM t ORDER BY id').fetchall(), rows)
+                self.assertEqual(
+                    [d for d, in db.execute('SELECT d FROM t WHERE d IS NOT NULL ORDER BY d')],
+                    self.dates,
+                )
+                self.assertEqual(
+                    [dt for dt, in db.execute('SELECT dt FROM t WHERE dt IS NOT NULL ORDER BY dt')],
+                    self.datetimes,
+                )
+
+    def test_stored_values(self):
+        day = jdatetime.date(1403, 1, 1)
+        moment = jdatetime.datetime(1403, 1, 1, 12, 30)
+        expected = {
+            'jalali': ('1403-01-01', '1403-01-01T12:30:00'),
+            'gregorian': ('2024-03-20', '2024-03-20 12:30:00'),
+            'integer': (day.toordinal(), moment.sort_key()),
+        }
+        for storage, values in expected.items():
+            with self.subTest(storage=storage):
+                sqlite.register(storage)
+                db = sqlite3.connect(':memory:')
+                self.addCleanup(db.close)
+                self.assertEqual(db.execute('SELECT ?, ?', (day, moment)).fetchone(), values)
+
+    def test_convert_columns(self):
+        db = sqlite3.connect(':memory:')
+        self.addCleanup(db.close)
+        db.execute('CREATE TABLE t (id INTEGER, d DATE, dt TIMESTAMP)')
+        rows = [(i, d.togregorian().isoformat(), dt.togregorian().isoformat(' '))
+                for i, (d, dt) in enumerate(zip(self.dates, self.datetimes))]
+        db.executemany('INSERT INTO t VALUES (?, ?, ?)', rows + [(50, None, None)])
+        fetched = db.execute('SELECT * FROM t ORDER BY id').fetchall()
+        result = sqlite.convert_columns(fetched, {1: 'date', 2: 'datetime'}, storage='gregorian')
+        self.assertEqual(result, list(zip(range(50), self.dates, self.datetimes)) + [(50, None, None)])
+        self.assertEqual(sqlite.convert_columns([], {1: 'date'}), [])
+
+    def test_convert_columns_integer_and_jalali(self):
+        rows = [(d.toordinal(), dt.sort_key(), str(d)) for d, dt in zip(self.dates, self.datetimes)]
+        result = sqlite.convert_columns(rows, {0: 'date', 1: 'datetime'}, storage='integer')
+        self.assertEqual(result, [(d, dt, str(d)) for d, dt in zip(self.dates, self.datetimes)])
+        result = sqlite.convert_columns(result, {2: 'date'})
+        self.assertEqual([row[2] for row in result], self.dates)
+
+    def test_decoder_repeated_values(self):
+        decode = sqlite.decoder('date', 'gregorian')
+        first = decode('2024-03-20')
+        self.assertIs(decode('2024-03-20'), first)
+        self.assertEqual(decode(b'2024-03-21'), jdatetime.date(1403, 1, 2))
+        self.assertIsNone(decode(None))
+        self.assertEqual(decode('2024-03-20'), jdatetime.date(1403, 1, 1))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            sqlite.register('text')
+        with self.assertRaises(ValueError):
+            sqlite.decoder('time', 'jalali')
+        with self.assertRaises(ValueError):
+            sqlite.decoder('date', 'jalali')('1402-01-01T00:00:00')
+        with self.assertRaises(ValueError):
+            sqlite.decoder('datetime', 'jalali')(b'1402-13-01 00:00:00')
@@ -0,0 +1,133 @@
+import datetime
+import pickle
+from array import array
+from unittest import TestCase, skipUnless
+
+import jdatetime
+from jdatetime.arrays import JDatetimeArray
+from jdatetime.tz import _UTC_TRANSITIONS, TEHRAN, fromepochs, toepochs
+from tests import tehran_zoneinfo
+
+UTC = datetime.timezone.utc
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=UTC)
+TEHRAN_ZONEINFO = tehran_zoneinfo()
+requires_zoneinfo = skipUnless(TEHRAN_ZONEINFO, 'Asia/Tehran with current tzdata rules is not available')
+
+
+class TestTehranTimezone(TestCase):
+    def setUp(self):
+        self.zoneinfo = TEHRAN_ZONEINFO
+
+    def instants(self):
+        for t in _UTC_TRANSITIONS:
+            for delta in (-3601, -3600, -1801, -1800, -1, 0, 1, 1799, 1800, 3599, 3600):
+                yield EPOCH + datetime.timedelta(seconds=t + delta)
+        yield EPOCH + datetime.timedelta(days=30000)
+
+    @requires_zoneinfo
+    def test_fromutc_matches_zoneinfo(self):
+        for instant in self.instants():
+            local, expected = instant.astimezone(TEHRAN), instant.astimezone(self.zoneinfo)
+            self.assertEqual(local.replace(tzinfo=None), expected.replace(tzinfo=None))
+            self.assertEqual(local.fold, expected.fold)
+            self.assertEqual(local.tzname(), expected.tzname())
+
+    @requires_zoneinfo
+    def test_wall_time_offsets_match_zoneinfo(self):
+        for instant in self.instants():
+            wall = (instant + datetime.timedelta(seconds=12600)).replace(tzinfo=None)
+            for fold in (0, 1):
+                local = wall.replace(tzinfo=TEHRAN, fold=fold)
+                expected = wall.replace(tzinfo=self.zoneinfo, fold=fold)
+                self.assertEqual(local.utcoffset(), expected.utcoffset())
+                self.assertEqual(local.dst(), expected.dst())
+
+    def test_jalali_datetime(self):
+        summer = jdatetime.datetime(1400, 5, 1, 12, 0, tzinfo=TEHRAN)
+        self.assertEqual(summer.utcoffset(), datetime.timedelta(hours=4, minutes=30))
+        self.assertEqual(summer.dst(), datetime.timedelta(hours=1))
+        self.assertEqual(TEHRAN.utcoffset(summer), summer.utcoffset())
+        winter = jdatetime.datetime(1402, 5, 1, 12, 0, tzinfo=TEHRAN)
+        self.assertEqual(winter.utcoffset(), datetime.timedelta(hours=3, minutes=30))
+        self.assertEqual(winter.tzname(), '+0330')
+
+    def test_astimezone_keeps_locale(self):
+        dt = jdatetime.datetime(1401, 1, 1, 20, 30, tzinfo=UTC, locale='fa_IR')
+        local = dt.astimezone(TEHRAN)
+        self.assertEqual(local.locale, 'fa_IR')
+        # DST started at midnight
+        self.assertEqual((local.month, local.day, local.hour, local.minute), (1, 2, 1, 0))
+        self.assertEqual(local.astimezone(UTC), dt)
+
+    def test_repeated_hour_keeps_fold(self):
+        # 1401-06-30 23:00 happened twice, at 1663785000 and 1663788600
+        for epoch, fold in ((1663785000, 0), (1663787700, 0), (1663788600, 1), (1663791299, 1)):
+            from_timestamp = jdatetime.datetime.fromtimestamp(epoch, TEHRAN)
+            converted = jdatetime.datetime.fromtimestamp(epoch, UTC).astimezone(TEHRAN)
+            for dt in (from_timestamp, converted):
+                self.assertEqual((dt.hour, dt.fold), (23, fold))
+                self.assertEqual(dt.timestamp(), epoch)
+                self.assertEqual(dt.astimezone(UTC), jdatetime.datetime.fromtimestamp(epoch, UTC))
+            self.assertEqual(list(fromepochs([epoch])[1]), [fold])
+
+    def test_pickle(self):
+        self.assertIs(pickle.loads(pickle.dumps(TEHRAN)), TEHRAN)
+        dt = jdatetime.datetime(1402, 1, 1, tzinfo=TEHRAN)
+        self.assertEqual(pickle.loads(pickle.dumps(dt)), dt)
+
+
+class TestEpochArrays(TestCase):
+    def setUp(self):
+        self.zoneinfo = TEHRAN_ZONEINFO
+        self.epochs = [t + delta for t in _UTC_TRANSITIONS for delta in range(-5400, 5400, 599)]
+
+    @requires_zoneinfo
+    def test_fromepochs_matches_zoneinfo(self):
+        local, folds = fromepochs(self.epochs)
+        self.assertIsInstance(local, JDatetimeArray)
+        for epoch, value, fold in zip(self.epochs, local, folds):
+            expected = datetime.datetime.fromtimestamp(epoch, self.zoneinfo)
+            self.assertEqual(value.togregorian(), expected.replace(tzinfo=None))
+            self.assertEqual(fold, expected.fold)
+        self.assertEqual(fromepochs(self.epochs, tz=self.zoneinfo), (local, folds))
+
+    def test_round_trip(self):
+        local, folds = fromepochs(self.epochs)
+        self.assertEqual(toepochs(local, fold=folds), (array('q', self.epochs), array('q')))
+
+    @requires_zoneinfo
+    def test_toepochs_reports_nonexistent(self):
+        # Clocks went from 1401-01-02 00:00 to 01:00
+        values = ['1401-01-01T23:59:59', '1401-01-02T00:30:00', '1401-01-02T01:00:00']
+        epochs, nonexistent = toepochs(values)
+        self.assertEqual(list(nonexistent), [1])
+        for fold in (0, 1):
+            gregorian = jdatetime.datetime(1401, 1, 2, 0, 30).togregorian()
+            expected = gregorian.replace(tzinfo=self.zoneinfo, fold=fold).timestamp()
+            self.assertEqual(toepochs(values, fold=fold)[0][1], expected)
+        self.assertEqual(toepochs(values, tz=self.zoneinfo), (epochs, nonexistent))
+
+    def test_units_and_fixed_offset(self):
+        tz = datetime.timezone(datetime.timedelta(hours=3, minutes=30))
+        local, folds = fromepochs([1700000000123], tz=tz, unit='ms')
+        self.assertEqual(list(local), [jdatetime.datetime(1402, 8, 24, 1, 43, 20, 123000)])
+        self.assertEqual(list(folds), [0])
+        self.assertEqual(list(toepochs(local, tz=tz, unit='ms')[0]), [1700000000123])
+        self.assertEqual(list(toepochs(local, tz=tz, unit='s')[0]), [1700000000])
+        with self.assertRaises(ValueError):
+            fromepochs([0], unit='ns')
+
+    @requires_zoneinfo
+    def test_float_epochs(self):
+        epochs = [1700000000.5, 1663785000.25, -1.000001, 1700000000.0000005]
+        local, folds = fromepochs(epochs)
+        for epoch, value in zip(epochs, local):
+            expected = datetime.datetime.fromtimestamp(epoch, self.zoneinfo).replace(tzinfo=None)
+            self.assertEqual(value.togregorian(), expected)
+        self.assertEqual(fromepochs(epochs, tz=self.zoneinfo), (local, folds))
+        local, _ = fromepochs([1700000000123.5], tz=datetime.timezone.utc, unit='ms')
+        self.assertEqual(local[0].togregorian(), datetime.datetime(2023, 11, 14, 22, 13, 20, 123500))
+
+    def test_fold_length(self):
+        with self.assertRaises(ValueError):
+            toepochs(['1402-01-01T00:00:00'], fold=[0, 1])